@@ -1,9 +1,11 @@
 """
 GA4 데이터 동기화 API 라우터
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from services.ga4_service import GA4Service
+from services.job_service import sync_job_service
 from utils.logger import api_logger
+import json
 import traceback
 
 ga4_bp = Blueprint('ga4', __name__, url_prefix='/api/ga4')
@@ -12,59 +14,177 @@ ga4_service = GA4Service()
 @ga4_bp.route("/sync/<int:user_id>", methods=["POST"])
 def sync_user_data(user_id):
     """
-    사용자의 GA4 데이터 전체 동기화
+    사용자의 GA4 데이터 전체 동기화 (백그라운드 작업 등록)
 
     Request:
     {
-        "days": 30  // 선택적, 기본값 30일
+        "days": 30,        // 선택적, 기본값 30일 (sections 지정 시 무시하고 저장된 스냅샷 기간)
+        "compare": true,   // 선택적, 직전 같은 기간 비교 데이터 포함 (추가 API 호출 없음,
+                           //   sections 지정 시 무시하고 저장된 스냅샷 기준)
+        "sections": ["traffic_sources"]  // 선택적, 이 섹션만 다시 받아 최근 스냅샷에 합침
     }
 
-    Response:
+    Response (202):
     {
         "success": true,
-        "data_id": 123,
-        "property_id": "488770841",
-        "date_range": "2024-12-01 ~ 2025-01-01",
-        "summary": {...},
-        "api_calls": 15
+        "job_id": 42,
+        "status": "queued",
+        "deduplicated": false  // 이미 진행 중인 작업이 있으면 true (그 작업의 job_id 반환)
     }
+
+    결과는 GET /api/ga4/jobs/<job_id>의 result
+    (data_id, property_id, date_range, summary, comparison_summary, api_calls)
     """
     try:
         data = request.json or {}
-        days = data.get("days")
+        sections, error = _requested_sections(data)
+        if error:
+            return error
 
-        result = ga4_service.sync_user_data(user_id, days)
-        status_code = 200 if result.get("success") else 400
-
-        return jsonify(result), status_code
+        params = {"days": data.get("days"), "compare": data.get("compare"), "sections": sections}
+        return _enqueue_response(user_id, "full", params)
 
     except Exception as e:
         api_logger.error(f"Sync user data error: {traceback.format_exc()}")
         return jsonify({"success": False, "message": str(e)}), 500
 
+@ga4_bp.route("/sync/<int:user_id>/stream", methods=["POST"])
+def sync_user_data_stream(user_id):
+    """
+    사용자의 GA4 데이터 전체 동기화 (진행 상황 스트리밍)
+
+    Request: /sync/<user_id>와 동일
+
+    Response (application/x-ndjson, 한 줄에 이벤트 하나):
+    {"event": "start", "property_id": "488770841", "date_range": "..."}
+    {"event": "section", "section": "summary", "completed": 1, "saved": true}
+    ...
+    {"event": "done", "success": true, "data_id": 123, ...}  // 실패 시 "error"
+
+    같은 사용자·같은 인자의 동기화가 이미 진행 중이면 (작업 큐 포함)
+    새로 추출하지 않고 그 동기화가 끝난 뒤 마지막 이벤트(done/error)만 반환
+    """
+    data = request.json or {}
+    days = data.get("days")
+    compare = data.get("compare")
+    sections, error = _requested_sections(data)
+    if error:
+        return error
+
+    def generate():
+        for event in ga4_service.stream_user_data(user_id, days, compare, sections):
+            yield json.dumps(event, ensure_ascii=False, default=str) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
 @ga4_bp.route("/sync/<int:user_id>/incremental", methods=["POST"])
 def sync_incremental(user_id):
     """
-    증분 데이터 동기화 (이전 날짜 이후 데이터만)
+    증분 데이터 동기화 (이전 날짜 이후 데이터만, 백그라운드 작업 등록)
+
+    Response (202): /sync/<user_id>와 동일
+
+    결과는 GET /api/ga4/jobs/<job_id>의 result
+    (days_added, date_range, api_calls, message)
+    """
+    try:
+        return _enqueue_response(user_id, "incremental")
+
+    except Exception as e:
+        api_logger.error(f"Incremental sync error: {traceback.format_exc()}")
+        return jsonify({"success": False, "message": str(e)}), 500
+
+@ga4_bp.route("/backfill/<int:user_id>", methods=["POST"])
+def backfill(user_id):
+    """
+    과거 데이터 백필 (일자별 팩트, 백그라운드 작업 등록)
+
+    Request:
+    {
+        "days": 365    // 선택적, 어제부터 거슬러 올라갈 일수 (기본값 365일)
+    }
+
+    Response (202): /sync/<user_id>와 동일
+
+    결과는 GET /api/ga4/jobs/<job_id>의 result
+    (chunks, skipped, completed, failed, days_added, api_calls, date_range)
+    중단되거나 실패한 구간이 있으면 다시 호출해 남은 구간만 추출
+    """
+    try:
+        data = request.json or {}
+        days = data.get("days") or 365
+        if not isinstance(days, int) or days <= 0:
+            return jsonify({"success": False, "message": "days는 양의 정수여야 합니다"}), 400
+
+        return _enqueue_response(user_id, "backfill", {"days": days})
+
+    except Exception as e:
+        api_logger.error(f"Backfill error: {traceback.format_exc()}")
+        return jsonify({"success": False, "message": str(e)}), 500
+
+@ga4_bp.route("/jobs/<int:job_id>", methods=["GET"])
+def get_job(job_id):
+    """
+    동기화 작업 상태 조회
 
     Response:
     {
         "success": true,
-        "days_added": 3,
-        "data_id": 124,
-        "message": "3일간의 데이터 추가됨"
+        "data": {
+            "id": 42,
+            "user_id": 1,
+            "kind": "full",
+            "status": "running",    // queued / running / succeeded / failed
+            "progress": {"completed": 5, "section": "devices"},
+            "result": null,         // 끝나면 동기화 결과
+            "error": null,
+            "created_at": "...", "started_at": "...", "finished_at": null
+        }
     }
     """
     try:
-        result = ga4_service.sync_incremental(user_id)
-        status_code = 200 if result.get("success") else 400
+        job = sync_job_service.get_job(job_id)
 
-        return jsonify(result), status_code
+        if job:
+            return jsonify({"success": True, "data": job})
+        else:
+            return jsonify({"success": False, "message": "작업을 찾을 수 없습니다"}), 404
 
     except Exception as e:
-        api_logger.error(f"Incremental sync error: {traceback.format_exc()}")
+        api_logger.error(f"Get job error: {traceback.format_exc()}")
         return jsonify({"success": False, "message": str(e)}), 500
 
+def _requested_sections(data):
+    """
+    요청의 sections 검증
+
+    Returns:
+        (섹션 리스트 또는 None, 오류 응답 또는 None)
+    """
+    sections = data.get("sections")
+    if sections is None:
+        return None, None
+    if not isinstance(sections, list) or not sections:
+        return None, (jsonify({"success": False, "message": "sections는 섹션 이름 배열이어야 합니다"}), 400)
+
+    unknown = ga4_service.unknown_sections(sections)
+    if unknown:
+        return None, (jsonify({"success": False, "message": f"알 수 없는 섹션: {', '.join(unknown)}"}), 400)
+    return sections, None
+
+def _enqueue_response(user_id, kind, params=None):
+    """동기화 작업 등록 후 202 응답 (진행 중인 같은 작업이 있으면 그 작업 반환)"""
+    job, deduplicated = sync_job_service.enqueue(user_id, kind, params)
+    if not job:
+        return jsonify({"success": False, "message": "동기화 작업 등록 실패"}), 500
+
+    return jsonify({
+        "success": True,
+        "job_id": job["id"],
+        "status": job["status"],
+        "deduplicated": deduplicated
+    }), 202
+
 @ga4_bp.route("/summary/<int:user_id>", methods=["GET"])
 def get_summary(user_id):
     """
@@ -74,6 +194,7 @@ def get_summary(user_id):
     {
         "date_range": {...},
         "summary": {...},
+        "approximate": ["activeUsers"],  // 근사치 지표 (일자별 롤업으로 갱신된 요약은 사용자 수가 합산값)
         "top_pages": [...],
         "traffic_sources": [...],
         "last_updated": "2025-01-01T00:00:00"
@@ -19,6 +19,7 @@ from api.chat import chat_bp
 
 # 서비스
 from services.scheduler_service import scheduler_service
+from services.job_service import sync_job_service
 
 # 설정 초기화
 config = get_config()
@@ -45,8 +46,12 @@ app.register_blueprint(chat_bp)
 # 스케줄러 시작
 scheduler_service.start()
 
-# 애플리케이션 종료 시 스케줄러 중지
+# 동기화 작업 큐 시작
+sync_job_service.start()
+
+# 애플리케이션 종료 시 스케줄러 / 작업 큐 중지
 atexit.register(scheduler_service.stop)
+atexit.register(sync_job_service.stop)
 
 @app.route("/")
 def home():
@@ -29,6 +29,7 @@ class Config:
     GA4_DEFAULT_PROPERTY_ID = os.getenv("GA4_DEFAULT_PROPERTY_ID")
     GA4_CREDENTIALS_PATH = os.getenv("GA4_CREDENTIALS_PATH", "credentials/ga4-credentials.json")
     GA4_DEFAULT_DAYS = int(os.getenv("GA4_DEFAULT_DAYS", 30))
+    GA4_STREAM_SAVE_INTERVAL = float(os.getenv("GA4_STREAM_SAVE_INTERVAL", 5))  # 스트리밍 동기화 부분 저장 간격 (초)
 
     # Telegram 설정
     TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
@@ -41,6 +42,15 @@ class Config:
     # 스케줄러 설정
     SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "True") == "True"
     DAILY_SYNC_TIME = os.getenv("DAILY_SYNC_TIME", "03:00")  # 새벽 3시
+    RETENTION_TIME = os.getenv("RETENTION_TIME", "04:30")  # ga4_data 정리 시각
+
+    # ga4_data 보존 정책 (사용자별 최신 스냅샷은 항상 원본 유지)
+    GA4_RETENTION_FULL_DAYS = int(os.getenv("GA4_RETENTION_FULL_DAYS", 7))  # 이 기간은 원본 유지
+    GA4_RETENTION_WEEKLY_DAYS = int(os.getenv("GA4_RETENTION_WEEKLY_DAYS", 90))  # 이 기간은 주당 1개 요약본, 이후 삭제
+
+    # 동기화 작업 큐 설정
+    SYNC_JOB_WORKERS = int(os.getenv("SYNC_JOB_WORKERS", 2))  # 동시에 실행할 동기화 작업 수
+    SYNC_JOB_LEASE = int(os.getenv("SYNC_JOB_LEASE", 600))  # 작업 임대 시간(초) - 이 시간 동안 하트비트가 없으면 실패 처리
 
     # 로깅 설정
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
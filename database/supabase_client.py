@@ -4,6 +4,7 @@ Supabase 데이터베이스 클라이언트
 """
 from supabase import create_client, Client
 from typing import Optional, Dict, List, Any
+from datetime import datetime, timedelta
 from config.settings import get_config
 from utils.logger import app_logger, error_logger
 
@@ -161,11 +162,360 @@ class SupabaseClient:
                 }).execute()
                 app_logger.info(f"GA4 data saved: user_id={user_id}, date={date}")
 
+            # 요약 API / 챗봇용 요약 행 갱신 (섹션이 덜 채워진 중간 저장은 제외)
+            if not raw_data.get("info", {}).get("partial"):
+                SupabaseClient.save_ga4_summary(user_id, date, raw_data)
+
             return result.data[0] if result.data else None
         except Exception as e:
             error_logger.error(f"Error saving GA4 data: {e}")
             return None
 
+    @staticmethod
+    def get_ga4_data_index(page_size: int = 1000) -> List[Dict]:
+        """
+        ga4_data 전체 행 목록 (raw_data 제외)
+
+        Returns:
+            [{"id", "user_id", "date", "created_at", "compacted"}]
+        """
+        try:
+            rows = []
+            while True:
+                result = supabase.table("ga4_data")\
+                    .select("id, user_id, date, created_at, compacted:raw_data->info->compacted")\
+                    .order("id")\
+                    .range(len(rows), len(rows) + page_size - 1)\
+                    .execute()
+                rows.extend(result.data or [])
+                if len(result.data or []) < page_size:
+                    return rows
+        except Exception as e:
+            error_logger.error(f"Error fetching GA4 data index: {e}")
+            return []
+
+    @staticmethod
+    def compact_ga4_data(data_id: int) -> bool:
+        """ga4_data 행의 raw_data를 요약본으로 교체 (info.compacted=True)"""
+        try:
+            result = supabase.table("ga4_data")\
+                .select("raw_data")\
+                .eq("id", data_id)\
+                .limit(1)\
+                .execute()
+            if not result.data:
+                return False
+
+            raw_data = result.data[0]["raw_data"]
+            info = raw_data.get("info", {})
+            record = SupabaseClient.summary_record(raw_data)
+            compacted = {
+                "info": {
+                    "property_id": info.get("property_id"),
+                    "date_range": info.get("date_range"),
+                    "extracted_at": info.get("extracted_at"),
+                    "compacted": True
+                },
+                "summary": record["summary"],
+                "pages": record["top_pages"],
+                "traffic_sources": record["traffic_sources"],
+                **({"comparison": record["comparison"]} if record["comparison"] else {})
+            }
+            supabase.table("ga4_data")\
+                .update({"raw_data": compacted})\
+                .eq("id", data_id)\
+                .execute()
+            return True
+        except Exception as e:
+            error_logger.error(f"Error compacting GA4 data {data_id}: {e}")
+            return False
+
+    @staticmethod
+    def delete_ga4_data(data_ids: List[int], batch_size: int = 200) -> int:
+        """ga4_data 행 삭제 → 삭제한 행 수"""
+        deleted = 0
+        try:
+            for i in range(0, len(data_ids), batch_size):
+                batch = data_ids[i:i + batch_size]
+                supabase.table("ga4_data")\
+                    .delete()\
+                    .in_("id", batch)\
+                    .execute()
+                deleted += len(batch)
+        except Exception as e:
+            error_logger.error(f"Error deleting GA4 data: {e}")
+        return deleted
+
+    @staticmethod
+    def summary_record(raw_data: Dict, top: int = 5) -> Dict:
+        """raw_data에서 요약 행에 저장할 필드만 추출"""
+        comparison = raw_data.get("comparison")
+        return {
+            "date_range": raw_data["info"]["date_range"],
+            "summary": raw_data.get("summary", {}),
+            "comparison": {
+                "date_range": comparison.get("date_range"),
+                "summary": comparison.get("summary", {})
+            } if comparison else None,
+            "top_pages": raw_data.get("pages", [])[:top],
+            "traffic_sources": raw_data.get("traffic_sources", [])[:top],
+            "approximate": raw_data["info"].get("approximate", [])
+        }
+
+    @staticmethod
+    def save_ga4_summary(user_id: int, date: str, raw_data: Dict, windows: Dict = None) -> bool:
+        """
+        사용자별 GA4 요약 저장 (user_id 기준 upsert)
+
+        windows를 주면 기간별 롤업 요약도 저장 (없으면 기존 값 유지)
+        """
+        try:
+            row = {
+                "user_id": user_id,
+                "date": date,
+                **SupabaseClient.summary_record(raw_data),
+                "updated_at": datetime.now().isoformat()
+            }
+            if windows is not None:
+                row["windows"] = windows
+            supabase.table("ga4_summaries").upsert(row, on_conflict="user_id").execute()
+            return True
+        except Exception as e:
+            error_logger.error(f"Error saving GA4 summary for user {user_id}: {e}")
+            return False
+
+    @staticmethod
+    def save_ga4_summary_windows(user_id: int, windows: Dict) -> bool:
+        """요약 행의 기간별 롤업 요약만 갱신 (요약 행이 있을 때만)"""
+        try:
+            supabase.table("ga4_summaries")\
+                .update({"windows": windows})\
+                .eq("user_id", user_id)\
+                .execute()
+            return True
+        except Exception as e:
+            error_logger.error(f"Error saving GA4 summary windows for user {user_id}: {e}")
+            return False
+
+    @staticmethod
+    def get_ga4_summary(user_id: int) -> Optional[Dict]:
+        """사용자별 GA4 요약 조회 (raw_data는 읽지 않음)"""
+        try:
+            result = supabase.table("ga4_summaries")\
+                .select("*")\
+                .eq("user_id", user_id)\
+                .limit(1)\
+                .execute()
+            return result.data[0] if result.data else None
+        except Exception as e:
+            error_logger.error(f"Error fetching GA4 summary for user {user_id}: {e}")
+            return None
+
+    @staticmethod
+    def get_daily_fact_dates(property_id: str, start_date: str, end_date: str) -> set:
+        """기간 내 일자별 팩트가 저장된 날짜 집합 (YYYY-MM-DD)"""
+        try:
+            result = supabase.table("ga4_daily_facts")\
+                .select("date")\
+                .eq("property_id", property_id)\
+                .eq("section", "summary")\
+                .gte("date", start_date)\
+                .lte("date", end_date)\
+                .execute()
+            return {row["date"] for row in result.data or []}
+        except Exception as e:
+            error_logger.error(f"Error fetching daily fact dates for property {property_id}: {e}")
+            return set()
+
+    @staticmethod
+    def get_daily_facts(property_id: str, start_date: str, end_date: str) -> Dict[str, Dict]:
+        """기간 내 일자별 팩트 조회 → {날짜: {섹션: 데이터}}"""
+        try:
+            result = supabase.table("ga4_daily_facts")\
+                .select("date, section, data")\
+                .eq("property_id", property_id)\
+                .gte("date", start_date)\
+                .lte("date", end_date)\
+                .order("date")\
+                .execute()
+            facts = {}
+            for row in result.data or []:
+                facts.setdefault(row["date"], {})[row["section"]] = row["data"]
+            return facts
+        except Exception as e:
+            error_logger.error(f"Error fetching daily facts for property {property_id}: {e}")
+            return {}
+
+    @staticmethod
+    def save_daily_facts(property_id: str, facts: Dict[str, Dict]) -> int:
+        """
+        일자별 팩트 저장 (property_id, date, section 기준 upsert)
+
+        Args:
+            facts: {날짜: {섹션: 데이터}}
+
+        Returns:
+            저장된 날짜 수 (실패 시 0)
+        """
+        if not facts:
+            return 0
+        try:
+            rows = [
+                {"property_id": property_id, "date": date, "section": section, "data": data}
+                for date, sections in facts.items()
+                for section, data in sections.items()
+            ]
+            supabase.table("ga4_daily_facts")\
+                .upsert(rows, on_conflict="property_id,date,section")\
+                .execute()
+            app_logger.info(f"Daily facts saved: property_id={property_id}, days={len(facts)}")
+            return len(facts)
+        except Exception as e:
+            error_logger.error(f"Error saving daily facts for property {property_id}: {e}")
+            return 0
+
+    @staticmethod
+    def get_backfill_chunks(property_id: str, start_date: str, end_date: str) -> List[Dict]:
+        """기간과 겹치는 백필 구간 체크포인트 조회"""
+        try:
+            result = supabase.table("ga4_backfill_chunks")\
+                .select("start_date, end_date, status, days_added, api_calls")\
+                .eq("property_id", property_id)\
+                .lte("start_date", end_date)\
+                .gte("end_date", start_date)\
+                .execute()
+            return result.data or []
+        except Exception as e:
+            error_logger.error(f"Error fetching backfill chunks for property {property_id}: {e}")
+            return []
+
+    @staticmethod
+    def save_backfill_chunk(property_id: str, start_date: str, end_date: str, fields: Dict) -> bool:
+        """백필 구간 체크포인트 저장 (property_id, start_date, end_date 기준 upsert)"""
+        try:
+            supabase.table("ga4_backfill_chunks").upsert({
+                "property_id": property_id,
+                "start_date": start_date,
+                "end_date": end_date,
+                **fields,
+                "updated_at": datetime.now().isoformat()
+            }, on_conflict="property_id,start_date,end_date").execute()
+            return True
+        except Exception as e:
+            error_logger.error(f"Error saving backfill chunk for property {property_id}: {e}")
+            return False
+
+    @staticmethod
+    def create_sync_job(user_id: int, kind: str, params: Dict = None,
+                        dedup_key: str = None, worker: str = None) -> Optional[Dict]:
+        """
+        동기화 작업 생성 (queued)
+
+        같은 dedup_key의 queued / running 작업이 있으면 유니크 인덱스로 실패 → None
+        """
+        try:
+            result = supabase.table("ga4_sync_jobs").insert({
+                "user_id": user_id,
+                "kind": kind,
+                "status": "queued",
+                "params": params or {},
+                "dedup_key": dedup_key,
+                "worker": worker,
+                "updated_at": datetime.now().isoformat()
+            }).execute()
+            return result.data[0] if result.data else None
+        except Exception as e:
+            error_logger.error(f"Error creating sync job for user {user_id}: {e}")
+            return None
+
+    @staticmethod
+    def get_active_sync_job(dedup_key: str, lease: int) -> Optional[Dict]:
+        """
+        같은 dedup_key의 queued / running 작업 조회
+
+        updated_at이 lease초보다 오래된 작업은 실행하던 프로세스가 사라진 것이므로
+        failed로 바꾸고 없는 것으로 처리 (유니크 인덱스에 막혀 다시 등록하지 못하는 일이 없도록)
+        """
+        try:
+            SupabaseClient.expire_sync_jobs(lease, dedup_key)
+            result = supabase.table("ga4_sync_jobs")\
+                .select("*")\
+                .eq("dedup_key", dedup_key)\
+                .in_("status", ["queued", "running"])\
+                .limit(1)\
+                .execute()
+            return result.data[0] if result.data else None
+        except Exception as e:
+            error_logger.error(f"Error fetching active sync job: {e}")
+            return None
+
+    @staticmethod
+    def update_sync_job(job_id: int, fields: Dict) -> bool:
+        """동기화 작업 상태/진행 상황 갱신 (updated_at도 갱신)"""
+        try:
+            supabase.table("ga4_sync_jobs")\
+                .update({**fields, "updated_at": datetime.now().isoformat()})\
+                .eq("id", job_id)\
+                .execute()
+            return True
+        except Exception as e:
+            error_logger.error(f"Error updating sync job {job_id}: {e}")
+            return False
+
+    @staticmethod
+    def get_sync_job(job_id: int) -> Optional[Dict]:
+        """동기화 작업 조회"""
+        try:
+            result = supabase.table("ga4_sync_jobs")\
+                .select("*")\
+                .eq("id", job_id)\
+                .limit(1)\
+                .execute()
+            return result.data[0] if result.data else None
+        except Exception as e:
+            error_logger.error(f"Error fetching sync job {job_id}: {e}")
+            return None
+
+    @staticmethod
+    def touch_sync_jobs(job_ids: List[int]) -> bool:
+        """대기/실행 중인 작업의 updated_at 갱신 (하트비트)"""
+        try:
+            supabase.table("ga4_sync_jobs")\
+                .update({"updated_at": datetime.now().isoformat()})\
+                .in_("id", job_ids)\
+                .in_("status", ["queued", "running"])\
+                .execute()
+            return True
+        except Exception as e:
+            error_logger.error(f"Error touching sync jobs: {e}")
+            return False
+
+    @staticmethod
+    def expire_sync_jobs(lease: int, dedup_key: str = None) -> int:
+        """
+        updated_at이 lease초 넘게 갱신되지 않은 queued / running 작업을 failed로 변경
+
+        dedup_key를 주면 그 키의 작업만
+        """
+        try:
+            now = datetime.now()
+            query = supabase.table("ga4_sync_jobs")\
+                .update({
+                    "status": "failed",
+                    "error": "작업 임대 만료 (실행하던 프로세스 중단)",
+                    "finished_at": now.isoformat(),
+                    "updated_at": now.isoformat()
+                })\
+                .in_("status", ["queued", "running"])\
+                .lt("updated_at", (now - timedelta(seconds=lease)).isoformat())
+            if dedup_key is not None:
+                query = query.eq("dedup_key", dedup_key)
+            result = query.execute()
+            return len(result.data or [])
+        except Exception as e:
+            error_logger.error(f"Error expiring sync jobs: {e}")
+            return 0
+
     @staticmethod
     def save_chat_history(user_id: int, question: str, answer: str, tokens_used: int) -> Optional[Dict]:
         """챗봇 대화 기록 저장"""
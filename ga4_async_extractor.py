@@ -0,0 +1,404 @@
+"""
+GA4 비동기 데이터 추출기
+BetaAnalyticsDataAsyncClient 기반 - 하나의 이벤트 루프에서 여러 Property 동시 동기화
+"""
+from google.analytics.data_v1beta import BetaAnalyticsDataAsyncClient
+from google.analytics.data_v1beta.types import GetMetadataRequest
+from datetime import datetime
+import asyncio
+import weakref
+
+from ga4_extractor_template import GA4TemplateExtractor, _RangeSplit
+from ga4_client_pool import get_async_client
+from ga4_metadata_cache import metadata_cache
+from ga4_rate_limiter import rate_limiter, is_quota_error
+from ga4_retry import classify_error, backoff_delay, circuit_breakers, RETRYABLE
+from ga4_config import API_STRATEGY
+
+# 이벤트 루프별 → Property별 세마포어 (같은 Property 동시 요청 수 제한)
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def _property_semaphore(property_id):
+    """현재 이벤트 루프에서 property_id 전용 세마포어 반환"""
+    loop = asyncio.get_running_loop()
+    per_loop = _semaphores.setdefault(loop, {})
+    if property_id not in per_loop:
+        per_loop[property_id] = asyncio.Semaphore(
+            API_STRATEGY.get("async_concurrency_per_property", 5)
+        )
+    return per_loop[property_id]
+
+
+class AsyncGA4Extractor(GA4TemplateExtractor):
+    """
+    GA4 비동기 추출기
+
+    리포트 계획(_plan_*)과 파싱(_build_*)은 GA4TemplateExtractor와 공유하고
+    API 호출만 asyncio로 수행. extract_data()는 동일한 구조의 dict 반환
+
+    사용:
+        extractor = AsyncGA4Extractor(property_id, credentials_path)
+        data = await extractor.extract_data(days=30)
+    """
+
+    def _create_client(self):
+        """
+        GA4 Data API 비동기 클라이언트
+
+        이벤트 루프 안에서 생성되면 루프별 풀에서 재사용,
+        루프 밖에서 생성되면 전용 클라이언트 생성
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return BetaAnalyticsDataAsyncClient.from_service_account_json(
+                self.credentials_path
+            )
+        return get_async_client(self.credentials_path)
+
+    async def _call_api(self, name, method, request, retry=True, record_error=True, reports=0,
+                        failures=None):
+        """
+        재시도 포함 비동기 API 호출
+
+        재시도 정책(에러 분류, 백오프, 서킷 브레이커, 데드라인)은 동기 버전과 동일하며
+        대기는 asyncio.sleep으로 수행해 이벤트 루프를 막지 않음
+        """
+        breaker = circuit_breakers.get(self.property_id)
+
+        for attempt in range(API_STRATEGY["retry_count"]):
+            state = breaker.allow()
+            if not state:
+                return self._fail(f"{name}: 서킷 오픈 - 호출 생략", record_error)
+
+            try:
+                if reports:
+                    wait = rate_limiter.reserve(self.property_id, self.credentials_path, reports)
+                    if wait > 0:
+                        print(f"   ⏳ 쿼터 대기 {wait:.1f}초 (property {self.property_id})")
+                        await asyncio.sleep(min(wait, API_STRATEGY.get("max_quota_wait", 300)))
+
+                async with _property_semaphore(self.property_id):
+                    response = await method(request=request, timeout=API_STRATEGY["timeout"])
+                if reports:
+                    self._record_quota(response)
+
+                breaker.record_success()
+                return response
+
+            except Exception as e:
+                error_msg = f"{name}: {str(e)[:150]}"
+                kind = classify_error(e)
+                if is_quota_error(e):
+                    rate_limiter.exhausted(self.property_id, self.credentials_path)
+
+                # half-open 탐색 호출은 재시도 없이 바로 기록 (실패하면 서킷이 다시 열림)
+                if kind == RETRYABLE and attempt < API_STRATEGY["retry_count"] - 1 and retry \
+                        and state != "half-open":
+                    delay = backoff_delay(attempt)
+                    print(f"   ⚠️  {error_msg}")
+                    print(f"   🔄 재시도 {attempt + 1}/{API_STRATEGY['retry_count']} ({delay:.1f}초 후)")
+                    await asyncio.sleep(delay)
+                else:
+                    breaker.record_failure(kind)
+                    if failures is not None:
+                        failures.append(kind)
+                    return self._fail(error_msg, record_error)
+
+    async def _load_metadata(self):
+        """Property 메타데이터 로드 (캐시 우선, 비동기)"""
+        self._metadata = metadata_cache.lookup(self.property_id)
+        if self._metadata is None:
+            self._count_call()
+            metadata = await self._call_api(
+                "메타데이터",
+                self.client.get_metadata,
+                GetMetadataRequest(name=f"properties/{self.property_id}/metadata"),
+                record_error=False
+            )
+            if metadata is not None:
+                self._metadata = metadata_cache.store(self.property_id, metadata)
+        return self._metadata
+
+    async def run_report(self, name, dimensions, metrics, date_range, limit=None,
+                         order_by=None, filters=None, offset=None, metric_aggregations=None,
+                         retry=True):
+        """비동기 run_report (인자는 GA4TemplateExtractor.run_report와 동일)"""
+        request = self._build_request(
+            dimensions, metrics, date_range, limit, order_by, filters, offset,
+            metric_aggregations
+        )
+        cached = self._cache_lookup(request)
+        if cached is not None:
+            print(f"   💾 {name}: {len(cached.rows)}행 (캐시)")
+            return cached
+
+        self._count_call()
+        response = await self._call_api(
+            name, self.client.run_report, request, retry, reports=1
+        )
+        if response is not None:
+            self._cache_store(request, response)
+            print(f"   ✅ {name}: {len(response.rows)}행")
+        return response
+
+    async def iter_report(self, name, dimensions, metrics, date_range, limit=None,
+                          order_by=None, filters=None, offset=0, metric_aggregations=None,
+                          retry=True):
+        """
+        비동기 iter_report (async for로 순회, 인자는 GA4TemplateExtractor.iter_report와 동일)
+
+        한 번에 한 페이지만 메모리에 유지하며 파싱된 행(dict)을 순서대로 반환
+        """
+        page_size = limit or API_STRATEGY["page_size"]
+        max_rows = API_STRATEGY["max_report_rows"]
+
+        while offset < max_rows:
+            response = await self.run_report(
+                f"{name} [{offset}~]" if offset else name,
+                dimensions, metrics, date_range,
+                min(page_size, max_rows - offset), order_by, filters, offset or None,
+                metric_aggregations, retry
+            )
+            if not response or not response.rows:
+                return
+
+            for row in self._iter_rows(response):
+                yield row
+            offset += len(response.rows)
+            if offset >= response.row_count:
+                return
+
+    def _stream_rows(self, spec, response, date_range):
+        """동기 페이지 순회는 지원하지 않음 (나머지 페이지는 _section_input이 await로 받음)"""
+        raise TypeError("AsyncGA4Extractor는 동기 페이지 순회를 지원하지 않습니다 (iter_report를 async for로 사용)")
+
+    def _map(self, func, items):
+        """동기 스레드 풀 실행은 지원하지 않음 (asyncio.gather 사용)"""
+        raise TypeError("AsyncGA4Extractor는 스레드 풀 실행을 지원하지 않습니다 (asyncio.gather 사용)")
+
+    async def run_batch(self, specs, date_range, retry=True):
+        """비동기 batchRunReports (캐시 미스만 호출, 잘못된 요청으로 실패 시 개별 run_report로 전환)"""
+        cached, pending = self._batch_cache_lookup(specs, date_range)
+        if not pending:
+            return cached
+
+        reports = await self._fetch_batch(pending, date_range, retry)
+        return self._merge_cached(cached, reports)
+
+    async def _fetch_batch(self, specs, date_range, retry=True):
+        names = ", ".join(spec["name"] for spec in specs)
+        self._count_call()
+
+        request = self._build_batch_request(specs, date_range)
+        failures = []
+        response = await self._call_api(
+            f"배치({names})",
+            self.client.batch_run_reports,
+            request,
+            retry,
+            record_error=False,
+            reports=len(specs),
+            failures=failures
+        )
+
+        if response is None:
+            if self._isolate_batch(names, failures):
+                return await asyncio.gather(*[
+                    self._run_spec(spec, date_range) for spec in specs
+                ])
+            return [None] * len(specs)
+
+        reports = list(response.reports)
+        for spec, report in zip(specs, reports):
+            self._cache_store(self._spec_request(spec, date_range), report)
+            print(f"   ✅ {spec['name']}: {len(report.rows)}행")
+        return reports
+
+    async def extract_data(self, days=None, compare=None, sections=None):
+        """
+        설정 기반 비동기 데이터 추출
+
+        모든 배치(또는 섹션)를 asyncio로 동시에 실행
+        같은 Property에 대한 동시 요청 수는
+        API_STRATEGY["async_concurrency_per_property"]로 제한
+        """
+        result = {}
+        async for key, data in self.extract_data_iter(days, compare, sections):
+            result[key] = data
+        return self._ordered_result(result)
+
+    async def extract_data_iter(self, days=None, compare=None, sections=None):
+        """
+        섹션이 끝나는 대로 (결과 키, 데이터)를 반환하는 비동기 이터레이터
+
+        반환 순서와 형식은 GA4TemplateExtractor.extract_data_iter와 동일
+        """
+        sections = self._enabled_sections(sections)
+        date_range = self.get_date_range(days, compare)
+        result = self._start_extract(date_range, sections)
+        yield "info", result["info"]
+
+        await self._load_metadata()
+
+        if API_STRATEGY.get("batch_reports"):
+            completed = self._iter_batched(sections, date_range)
+        else:
+            completed = self._iter_sections(sections, date_range)
+
+        async for key, data in completed:
+            result[key] = data
+            yield key, data
+
+        for item in self._finish_items(self._finish_extract(result)):
+            yield item
+
+    async def _iter_sections(self, sections, date_range):
+        """섹션별 개별 호출 모드: 섹션이 끝나는 대로 (결과 키, 데이터) 반환"""
+        async def extract(key, name):
+            return key, await self._extract_section(key, name, date_range)
+
+        for done in asyncio.as_completed([
+            extract(key, name) for key, _, _, name in sections
+        ]):
+            yield await done
+
+    async def _iter_batched(self, sections, date_range):
+        """
+        배치 모드: 배치가 끝날 때마다 입력이 모두 모인 섹션을 바로 파싱해 반환
+        (동작은 GA4TemplateExtractor._iter_batched와 동일)
+        """
+        waiting = self._plan_sections(sections)
+        responses = {}
+        requested = set()
+        running = {}
+
+        def submit(plans):
+            for group in self._group_batches(plans, requested):
+                requested.update(spec_key for spec_key, _ in group)
+                task = asyncio.ensure_future(
+                    self.run_batch([spec for _, spec in group], date_range)
+                )
+                running[task] = group
+
+        try:
+            submit(waiting.values())
+            while waiting:
+                ready = self._take_ready(waiting, responses)
+                for key, label, name, inputs, followed in ready:
+                    if not followed and self._start_followup(waiting, key, label, name, inputs):
+                        submit([waiting[key]])
+                        continue
+                    print(f"\n{label}")
+                    yield key, self._build_section(key, name, inputs)
+
+                if ready:
+                    # 바로 입력이 모인 2단계가 있을 수 있으므로 다시 확인
+                    continue
+                if not running:
+                    break
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    for (spec_key, spec), report in zip(running.pop(task), task.result()):
+                        responses[spec_key] = await self._section_input(spec, report, date_range)
+        finally:
+            for task in running:
+                task.cancel()
+
+    async def extract_daily(self, start_date, end_date):
+        """비동기 일자별 팩트 추출 (반환값은 GA4TemplateExtractor.extract_daily와 동일)"""
+        start = datetime.strptime(start_date, "%Y-%m-%d")
+        days = (datetime.strptime(end_date, "%Y-%m-%d") - start).days + 1
+        date_range = {"start": start_date, "end": end_date, "days": days}
+
+        self._reset_counters()
+        print(f"\n📅 일자별 팩트 추출: {start_date} ~ {end_date} ({days}일)")
+
+        specs = self._plan_daily_facts()
+        if API_STRATEGY.get("batch_reports"):
+            reports = await self.run_batch(specs, date_range)
+        else:
+            reports = await asyncio.gather(*[
+                self._run_spec(spec, date_range) for spec in specs
+            ])
+
+        inputs = await asyncio.gather(*[
+            self._section_input(spec, report, date_range)
+            for spec, report in zip(specs, reports)
+        ])
+        return self._build_daily_facts(start, days, inputs)
+
+    async def _extract_section(self, key, name, date_range):
+        """섹션 하나를 비동기 run_report 호출로 추출"""
+        async def run(planned):
+            return list(await asyncio.gather(*[
+                self._run_section_input(spec, date_range) if runnable
+                else self._skipped_input_async(spec)
+                for spec, runnable in planned
+            ]))
+
+        inputs = await run(self._plan_section(name))
+        inputs += await run(self._plan_followup(name, inputs))
+        return self._build_section(key, name, inputs)
+
+    async def _run_section_input(self, spec, date_range):
+        response = await self._run_shared(spec, date_range)
+        return await self._section_input(spec, response, date_range)
+
+    def _run_shared(self, spec, date_range):
+        """
+        리포트 명세 호출 (awaitable 반환)
+
+        같은 리포트를 여러 섹션이 계획하면 첫 호출의 Task를 함께 await
+        """
+        if spec.get("paginate"):
+            return self._run_spec(spec, date_range)
+
+        key = self._spec_key(spec)
+        if key not in self._shared:
+            self._shared[key] = asyncio.ensure_future(self._run_spec(spec, date_range))
+        return self._shared[key]
+
+    async def _skipped_input_async(self, spec):
+        return self._skipped_input(spec)
+
+    async def _section_input(self, spec, response, date_range):
+        """
+        _build_*()에 넘길 입력
+
+        paginate 명세는 나머지 페이지를 비동기로 모두 받은 뒤 행 스트림으로 전달
+        비교 모드의 행 수 제한 리포트는 기간별로 나누고 모자란 기간만 다시 요청
+        """
+        if not spec.get("paginate"):
+            views, short = self._split_limited(spec, response, date_range)
+            if views is None:
+                return response
+            refetched = await asyncio.gather(*[
+                self._run_spec(
+                    spec, self._single_range(date_range, name), name=f"{spec['name']} ({name})"
+                )
+                for name in short
+            ])
+            for name, report in zip(short, refetched):
+                if report is not None:
+                    views[name] = report
+            return _RangeSplit(views, response.row_count)
+
+        pages = [response] if response is not None else []
+        offset = len(response.rows) if response is not None else 0
+        total = min(response.row_count, API_STRATEGY["max_report_rows"]) if response is not None else 0
+
+        while offset and offset < total:
+            page = await self._run_spec(
+                spec, date_range,
+                name=f"{spec['name']} [{offset}~]",
+                limit=min(spec["limit"], total - offset),
+                offset=offset
+            )
+            if not page or not page.rows:
+                break
+            pages.append(page)
+            offset += len(page.rows)
+
+        return (row for page in pages for row in self._iter_rows(page))
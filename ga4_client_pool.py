@@ -0,0 +1,101 @@
+"""
+GA4 Data API 클라이언트 풀
+인증 파일(credentials)별로 클라이언트와 gRPC 채널을 프로세스 전체에서 재사용
+"""
+from google.analytics.data_v1beta import (
+    BetaAnalyticsDataClient, BetaAnalyticsDataAsyncClient
+)
+from collections import OrderedDict
+import asyncio
+import os
+import threading
+import weakref
+
+from ga4_config import API_STRATEGY
+
+
+class GA4ClientPool:
+    """
+    인증 파일 경로 → 클라이언트 LRU 레지스트리
+
+    - 키: (절대 경로, 파일 수정 시각) → 키 파일을 교체하면 새 클라이언트 생성
+    - 최대 API_STRATEGY["client_pool_size"]개 유지, 초과 시 가장 오래 안 쓴 항목 제거
+    - 제거된 클라이언트는 명시적으로 닫지 않음 (사용 중인 추출기가 있을 수 있으므로
+      참조가 사라질 때 채널이 정리됨)
+    """
+
+    def __init__(self, factory, max_size=None):
+        self.factory = factory
+        self.max_size = max_size or API_STRATEGY.get("client_pool_size", 32)
+        self._clients = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(credentials_path):
+        path = os.path.abspath(credentials_path)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            mtime = None
+        return path, mtime
+
+    def get(self, credentials_path):
+        """credentials_path에 해당하는 클라이언트 반환 (없으면 생성)"""
+        key = self._key(credentials_path)
+
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._clients.move_to_end(key)
+                self.hits += 1
+                return client
+
+            client = self.factory(credentials_path)
+            self._clients[key] = client
+            self.misses += 1
+
+            while len(self._clients) > self.max_size:
+                self._clients.popitem(last=False)
+
+            return client
+
+    def clear(self):
+        """모든 클라이언트 제거"""
+        with self._lock:
+            self._clients.clear()
+
+    def stats(self):
+        """풀 상태"""
+        with self._lock:
+            return {
+                "size": len(self._clients),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# 동기 클라이언트 풀 (프로세스 전역)
+client_pool = GA4ClientPool(BetaAnalyticsDataClient.from_service_account_json)
+
+# 비동기 클라이언트는 이벤트 루프에 묶이므로 루프별로 풀 유지
+_async_pools = weakref.WeakKeyDictionary()
+_async_lock = threading.Lock()
+
+
+def get_client(credentials_path):
+    """동기 GA4 클라이언트 (풀에서 재사용)"""
+    return client_pool.get(credentials_path)
+
+
+def get_async_client(credentials_path):
+    """현재 이벤트 루프용 비동기 GA4 클라이언트 (풀에서 재사용)"""
+    loop = asyncio.get_running_loop()
+    with _async_lock:
+        pool = _async_pools.get(loop)
+        if pool is None:
+            pool = GA4ClientPool(BetaAnalyticsDataAsyncClient.from_service_account_json)
+            _async_pools[loop] = pool
+    return pool.get(credentials_path)
@@ -0,0 +1,155 @@
+"""
+GA4 리포트 열 단위 표현
+응답 행을 dict로 하나씩 만들지 않고 측정기준/측정항목 열로 한 번에 변환
+"""
+from array import array
+from collections.abc import Mapping, Sequence
+
+
+def _metric_column(values):
+    """
+    측정항목 값 리스트 → array('d')
+
+    숫자가 아닌 값이 섞여 있으면 기존 파싱과 같이 값별로 float 또는 문자열 리스트
+    """
+    try:
+        return array("d", map(float, values))
+    except (TypeError, ValueError):
+        column = []
+        for value in values:
+            try:
+                column.append(float(value))
+            except (TypeError, ValueError):
+                column.append(value)
+        return column
+
+
+class _RowView(Mapping):
+    """ColumnarReport의 한 행을 dict처럼 보여주는 뷰 (값은 접근할 때 열에서 읽음)"""
+    __slots__ = ("_report", "_index")
+
+    def __init__(self, report, index):
+        self._report = report
+        self._index = index
+
+    def __getitem__(self, name):
+        return self._report._columns[name][self._index]
+
+    def __iter__(self):
+        return iter(self._report.names)
+
+    def __len__(self):
+        return len(self._report.names)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class ColumnarReport(Sequence):
+    """
+    열 단위 리포트
+
+    - 측정기준 열: 문자열 리스트
+    - 측정항목 열: array('d') (숫자가 아닌 값이 있으면 리스트)
+    - report[i]는 행 뷰(_RowView), records()는 기존 형식의 dict 리스트
+    - 행 뷰는 몇 개 열만 읽는 임의 접근용 (행 전체를 읽으면 dict와 비용이 같음)
+
+    사용:
+        report = ColumnarReport.from_response(response)
+        report.column("pagePath")           # 열 하나
+        report.group_sum(keys, metrics)     # 키별 합계
+        report.records()                    # [{차원: 값, 측정항목: 값}] (raw_data 저장용)
+    """
+
+    def __init__(self, dimensions, metrics, columns):
+        self.dimensions = list(dimensions)
+        self.metrics = list(metrics)
+        self.names = self.dimensions + self.metrics
+        self._columns = columns
+        self._length = len(columns[self.names[0]]) if self.names else 0
+
+    @classmethod
+    def from_response(cls, response):
+        """
+        RunReportResponse(또는 rows / dimension_headers / metric_headers가 같은 형태의 뷰)로 생성
+
+        응답이 없으면 빈 리포트
+        """
+        if response is None:
+            return cls([], [], {})
+
+        dimensions = [header.name for header in response.dimension_headers]
+        metrics = [header.name for header in response.metric_headers]
+
+        # 행마다 값 리스트만 뽑은 뒤 zip으로 전치
+        rows = response.rows
+        dimension_values = zip(*[[v.value for v in row.dimension_values] for row in rows])
+        metric_values = zip(*[[v.value for v in row.metric_values] for row in rows])
+
+        columns = {name: list(values) for name, values in zip(dimensions, dimension_values)}
+        columns.update(
+            (name, _metric_column(values)) for name, values in zip(metrics, metric_values)
+        )
+        # 행이 없으면 zip 결과가 비므로 빈 열로 채움
+        for name in dimensions:
+            columns.setdefault(name, [])
+        for name in metrics:
+            columns.setdefault(name, array("d"))
+        return cls(dimensions, metrics, columns)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ColumnarReport(
+                self.dimensions, self.metrics,
+                {name: column[index] for name, column in self._columns.items()}
+            )
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(index)
+        return _RowView(self, index)
+
+    def column(self, name):
+        """열 하나 (없는 열은 KeyError)"""
+        return self._columns[name]
+
+    def records(self):
+        """기존 파싱 결과와 같은 dict 리스트"""
+        return list(self.iter_records())
+
+    def iter_records(self):
+        """행을 하나씩 dict로 반환 (제너레이터)"""
+        names = self.names
+        for values in zip(*[self._columns[name] for name in names]):
+            yield dict(zip(names, values))
+
+    def group_sum(self, keys, metrics):
+        """
+        keys(행과 같은 길이의 그룹 키) 기준으로 metrics 합산
+
+        Args:
+            keys: 그룹 키 시퀀스 (None이면 전체를 None 키 하나로 합산)
+            metrics: 합산할 측정항목 (리포트에 없는 항목은 0)
+
+        Returns:
+            {키: {측정항목: 합계}} (행이 없으면 빈 dict)
+        """
+        if not self._length:
+            return {}
+        if keys is None:
+            return {None: {
+                metric: float(sum(self._columns[metric])) if metric in self._columns else 0.0
+                for metric in metrics
+            }}
+
+        groups = {key: {metric: 0.0 for metric in metrics} for key in keys}
+        for metric in metrics:
+            column = self._columns.get(metric)
+            if column is None:
+                continue
+            for key, value in zip(keys, column):
+                groups[key][metric] += value
+        return groups
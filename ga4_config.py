@@ -9,6 +9,7 @@ GA4 데이터 추출 설정 파일
 PROPERTY_ID = "488770841"
 CREDENTIALS_PATH = "credentials/service-account.json"  # ← 경로 수정
 DEFAULT_DAYS = 30
+COMPARE_PREVIOUS = False  # 이전 기간(같은 길이) 비교 데이터를 같은 호출로 함께 수집
 
 # ============================================================
 # 데이터 수집 범위 (True/False로 on/off)
@@ -83,6 +84,19 @@ DEFAULT_METRICS = {
     "transactions": "transactions",
 }
 
+# 날짜/시간 단위로 더해도 값이 맞는 측정항목
+# (activeUsers, bounceRate 등 비율/고유 수 지표는 더할 수 없음)
+ADDITIVE_METRICS = [
+    "sessions",
+    "screenPageViews",
+    "keyEvents",
+    "purchaseRevenue",
+    "transactions",
+    "newUsers",
+    "eventCount",
+    "userEngagementDuration",
+]
+
 # ============================================================
 # 맞춤 측정기준 (추가/수정 가능)
 # ============================================================
@@ -129,12 +143,53 @@ KEY_EVENTS = [
     "view_item",             # 상품 조회
 ]
 
+KEY_EVENT_PAGES = 50         # 주요 이벤트별 상위 페이지 수
+KEY_EVENT_SCAN_FACTOR = 2    # 전체 주요 이벤트 리포트 행 수 = 이 값 × 이벤트 수 × KEY_EVENT_PAGES
+
+# ============================================================
+# 일자별 팩트 저장 (증분 동기화 / 롤업)
+# ============================================================
+DAILY_FACTS = {
+    "windows": [7, 30, 90],       # 롤업 기간 (일) - 가장 긴 기간만큼 저장 유지
+    "pages_per_day": 100,         # 일자별 저장할 상위 페이지 수
+    "sources_per_day": 100,       # 일자별 저장할 상위 유입경로 수
+    "backfill_chunk_days": 14,    # 백필 구간 크기 (일) - 구간마다 체크포인트 저장
+    "backfill_workers": 4,        # 백필 구간 동시 추출 수 (쿼터는 공유 속도 제한기로 조절)
+}
+
 # ============================================================
 # API 호출 전략
 # ============================================================
 API_STRATEGY = {
     "retry_count": 3,           # 에러 시 재시도 횟수
-    "retry_delay": 2,           # 재시도 대기 시간 (초)
-    "timeout": 30,              # 타임아웃 (초)
+    "retry_delay": 2,           # 재시도 기본 대기 시간 (초, 지수 백오프 기준값)
+    "retry_max_delay": 30,      # 재시도 최대 대기 시간 (초)
+    "timeout": 30,              # 호출당 타임아웃 (초)
+    "circuit_failures": 5,      # 연속 실패 시 Property 서킷 오픈
+    "circuit_cooldown": 300,    # 서킷 오픈 유지 시간 (초)
     "batch_size": 100,          # 배치 크기
+    "batch_reports": True,      # batchRunReports로 리포트 묶어서 호출
+    "batch_report_size": 5,     # 배치당 리포트 수 (GA4 최대 5)
+    "max_workers": 4,           # 동시 실행 스레드 수 (1이면 순차 실행)
+    "async_concurrency_per_property": 5,  # 비동기 추출 시 Property당 동시 요청 수
+    "page_size": 10000,         # 페이지네이션 리포트의 페이지 크기
+    "max_report_rows": 250000,  # 페이지네이션 리포트 최대 행 수 (안전장치)
+    "client_pool_size": 32,     # 재사용할 GA4 클라이언트 수 (인증 파일 기준)
+    "metadata_ttl": 21600,      # Property 메타데이터 캐시 유지 시간 (초)
+    "max_quota_wait": 300,      # 쿼터 대기 최대 시간 (초)
+    "exact_users": True,        # False면 시간대/요일별 사용자 수를 날짜×시간 리포트 합산값(근사치)으로 대체해 호출 절약
+    "report_cache": True,       # 리포트 결과 디스크 캐시 사용
+    "report_cache_dir": ".cache/ga4_reports",  # 캐시 디렉터리
+    "report_cache_ttl": 900,    # 오늘이 포함된 기간의 캐시 유지 시간 (초, 지난 기간은 영구)
+    "report_cache_max_mb": 512, # 캐시 최대 크기 (초과 시 오래 안 쓴 항목부터 삭제)
+}
+
+# ============================================================
+# GA4 쿼터 (표준 Property 기준, 360은 상향)
+# ============================================================
+QUOTA_LIMITS = {
+    "tokens_per_hour": 40000,             # Property당 시간당 토큰
+    "tokens_per_project_per_hour": 14000, # 프로젝트(인증)×Property당 시간당 토큰
+    "concurrent_requests": 10,            # Property당 동시 요청 수
+    "default_report_cost": 10,            # 리포트 1건 예상 토큰 (응답으로 보정)
 }
\ No newline at end of file
@@ -1,14 +1,90 @@
-from google.analytics.data_v1beta import BetaAnalyticsDataClient
 from google.analytics.data_v1beta.types import (
-    DateRange, Dimension, Metric, RunReportRequest, OrderBy
+    DateRange, Dimension, Metric, RunReportRequest, OrderBy,
+    BatchRunReportsRequest, Filter, FilterExpression, FilterExpressionList,
+    GetMetadataRequest, MetricAggregation
 )
 import json
+from collections import Counter
 from datetime import datetime, timedelta
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+import threading
 import time
 
 # 설정 파일 import
 from ga4_config import *
+from ga4_client_pool import get_client
+from ga4_metadata_cache import metadata_cache, missing_fields
+from ga4_rate_limiter import rate_limiter, is_quota_error
+from ga4_retry import (
+    classify_error, backoff_delay, circuit_breakers, RETRYABLE, FATAL
+)
+from ga4_report_cache import report_cache
+from ga4_columnar import ColumnarReport
+from ga4_join import hash_join, Join
+
+# batchRunReports 한 번에 담을 수 있는 최대 리포트 수 (GA4 제한)
+MAX_BATCH_REPORTS = 5
+
+# 비교 기간 추출 시 date_ranges 이름 (응답의 dateRange 측정기준 값)
+CURRENT_RANGE = "current"
+PREVIOUS_RANGE = "previous"
+
+
+class _RangeRow:
+    """dateRange 측정기준 값을 뺀 행"""
+    __slots__ = ("dimension_values", "metric_values")
+    
+    def __init__(self, row, index):
+        self.dimension_values = [v for i, v in enumerate(row.dimension_values) if i != index]
+        self.metric_values = row.metric_values
+
+
+class _RangeView:
+    """
+    여러 기간을 함께 요청한 응답에서 한 기간의 행만 보여주는 뷰
+    
+    rows / dimension_headers / metric_headers / totals / row_count를 응답과 같은 형태로 제공해
+    _iter_rows(), _parse_single(), _parse_totals()에 그대로 넘길 수 있음
+    """
+    
+    def __init__(self, response, name, position, limit=None):
+        names = [header.name for header in response.dimension_headers]
+        index = names.index("dateRange")
+        
+        self.dimension_headers = [h for h in response.dimension_headers if h.name != "dateRange"]
+        self.metric_headers = response.metric_headers
+        self.rows = [
+            _RangeRow(row, index) for row in response.rows
+            if row.dimension_values[index].value == name
+        ][:limit]
+        self.row_count = len(self.rows)
+        
+        # 합계 행은 기간마다 하나 (dateRange 값이 없으면 요청 순서로 대응)
+        totals = [row for row in response.totals
+                  if len(row.dimension_values) > index
+                  and row.dimension_values[index].value == name]
+        if not totals and len(response.totals) > position:
+            totals = [response.totals[position]]
+        self.totals = [_RangeRow(row, index) for row in totals]
+
+class _RangeSplit:
+    """
+    비교 모드에서 행 수 제한(limit)이 있는 리포트를 기간별로 나눈 입력
+    
+    views: {기간 이름: _RangeView 또는 그 기간만 요청한 응답}
+    rows / dimension_headers / metric_headers는 두 기간의 행을 합친 형태
+    (2단계 계획(_followup_*)이 두 기간의 키를 모두 보도록)
+    row_count는 원래 응답의 전체 행 수 (행 제한에 걸렸는지 판단용)
+    """
+    
+    def __init__(self, views, row_count=None):
+        self.views = views
+        current = views[CURRENT_RANGE]
+        self.dimension_headers = current.dimension_headers
+        self.metric_headers = current.metric_headers
+        self.rows = [row for view in views.values() for row in view.rows]
+        self.totals = []
+        self.row_count = len(self.rows) if row_count is None else row_count
 
 class GA4TemplateExtractor:
     """
@@ -17,100 +93,634 @@ class GA4TemplateExtractor:
     ga4_config.py에서 설정 변경
     """
     
+    # 섹션 정의: (결과 키, EXTRACT_CONFIG 키, 출력 라벨, 섹션 이름)
+    # 섹션 이름 → _plan_<이름>() 으로 리포트 계획, _build_<이름>() 으로 파싱
+    SECTIONS = [
+        ("summary", "summary", "📊 1. 전체 요약", "summary"),
+        ("pages", "pages", "📄 2. 페이지 데이터", "pages"),
+        ("events", "events", "🎯 3. 이벤트 데이터", "events"),
+        ("key_events", "events", "🎯 3-1. 주요 이벤트", "key_events"),
+        ("transactions", "transactions", "💳 4. 거래 데이터", "transactions"),
+        ("traffic_sources", "traffic_sources", "🚪 5. 유입경로", "sources"),
+        ("campaigns", "campaigns", "📣 6. 캠페인", "campaigns"),
+        ("devices", "devices", "💻 7. 기기", "devices"),
+        ("locations", "locations", "🌍 8. 위치", "locations"),
+        ("content_groups", "content", "📝 9. 콘텐츠", "content"),
+        ("daily_trend", "daily_trend", "📈 10. 일별 트렌드", "daily"),
+        ("hourly_traffic", "hourly_traffic", "⏰ 11. 시간대별", "hourly"),
+        ("day_of_week", "day_of_week", "📅 12. 요일별", "day_of_week"),
+        ("new_vs_returning", "new_vs_returning", "👤 13. 신규/재방문", "new_vs_returning"),
+        ("user_segments", "user_segments", "🎯 14. 사용자 세그먼트", "user_segments"),
+        ("search_terms", "search_terms", "🔍 15. 검색어", "search_terms"),
+        ("scroll_depth", "scroll_depth", "📜 16. 스크롤", "scroll"),
+        ("engagement", "engagement", "💪 17. 참여도", "engagement"),
+    ]
+    
     def __init__(self, property_id=None, credentials_path=None):
         self.property_id = property_id or PROPERTY_ID
         self.credentials_path = credentials_path or CREDENTIALS_PATH
-        self.client = BetaAnalyticsDataClient.from_service_account_json(
-            self.credentials_path
-        )
-        self.errors = []
-        self.api_calls = 0
+        self.client = self._create_client()
+        self._reset_counters()
+        self._metadata = None
+        # 동시 실행 모드에서 api_calls / errors 보호
+        self._lock = threading.Lock()
     
-    def get_date_range(self, days=None):
-        """날짜 범위 생성"""
+    def _create_client(self):
+        """GA4 Data API 클라이언트 (인증 파일별로 프로세스 전역 풀에서 재사용)"""
+        return get_client(self.credentials_path)
+    
+    def get_date_range(self, days=None, compare=None):
+        """
+        날짜 범위 생성
+        
+        compare=True 이면 바로 앞의 같은 길이 기간을 "compare"에 포함
+        (기본값: COMPARE_PREVIOUS)
+        """
         days = days or DEFAULT_DAYS
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days-1)
-        return {
+        date_range = {
             "start": start_date.strftime("%Y-%m-%d"),
             "end": end_date.strftime("%Y-%m-%d"),
             "days": days
         }
+        
+        if COMPARE_PREVIOUS if compare is None else compare:
+            compare_end = start_date - timedelta(days=1)
+            date_range["compare"] = {
+                "start": (compare_end - timedelta(days=days-1)).strftime("%Y-%m-%d"),
+                "end": compare_end.strftime("%Y-%m-%d"),
+                "days": days
+            }
+        return date_range
     
-    def run_report(self, name, dimensions, metrics, date_range, 
-                   limit=None, order_by=None, retry=True):
+    def _date_ranges(self, date_range):
         """
-        안전한 API 호출
+        요청에 넣을 DateRange 리스트
+        
+        비교 기간이 있으면 두 기간을 한 요청에 담고
+        응답 행은 dateRange 측정기준(current / previous)으로 구분됨
+        """
+        if "compare" not in date_range:
+            return [DateRange(start_date=date_range["start"], end_date=date_range["end"])]
+        
+        compare = date_range["compare"]
+        return [
+            DateRange(start_date=date_range["start"], end_date=date_range["end"], name=CURRENT_RANGE),
+            DateRange(start_date=compare["start"], end_date=compare["end"], name=PREVIOUS_RANGE),
+        ]
+    
+    def _build_request(self, dimensions, metrics, date_range, limit=None,
+                       order_by=None, filters=None, offset=None, metric_aggregations=None):
+        """RunReportRequest 생성"""
+        # 정렬 설정
+        order_bys = []
+        if order_by:
+            orders = order_by if isinstance(order_by, list) else [order_by]
+            for order in orders:
+                if "dimension" in order:
+                    order_bys.append(OrderBy(
+                        dimension=OrderBy.DimensionOrderBy(dimension_name=order["dimension"]),
+                        desc=order.get("desc", False)
+                    ))
+                else:
+                    order_bys.append(OrderBy(
+                        metric=OrderBy.MetricOrderBy(metric_name=order["metric"]),
+                        desc=order.get("desc", True)
+                    ))
+        
+        # 기간별 행이 따로 오므로 행 수 제한도 기간 수만큼 늘림
+        date_ranges = self._date_ranges(date_range)
+        if limit and len(date_ranges) > 1:
+            limit *= len(date_ranges)
+        
+        return RunReportRequest(
+            property=f"properties/{self.property_id}",
+            dimensions=[Dimension(name=d) for d in dimensions],
+            metrics=[Metric(name=m) for m in metrics],
+            date_ranges=date_ranges,
+            limit=limit,
+            offset=offset,
+            order_bys=order_bys if order_bys else None,
+            dimension_filter=self._build_filter(filters),
+            metric_aggregations=[
+                getattr(MetricAggregation, agg) for agg in metric_aggregations or []
+            ] or None,
+            return_property_quota=True
+        )
+    
+    def _build_filter(self, filters):
+        """
+        차원 필터 생성
         
         Args:
-            name: 리포트 이름
-            dimensions: 차원 리스트
-            metrics: 측정항목 리스트
-            date_range: 날짜 범위
-            limit: 최대 행 수
-            order_by: 정렬 (dict or list)
+            filters: {차원 이름: [허용 값 리스트]} - 여러 차원은 AND 조건
+        """
+        if not filters:
+            return None
+        
+        expressions = [
+            FilterExpression(filter=Filter(
+                field_name=field,
+                in_list_filter=Filter.InListFilter(values=list(values))
+            ))
+            for field, values in filters.items()
+        ]
+        if len(expressions) == 1:
+            return expressions[0]
+        return FilterExpression(and_group=FilterExpressionList(expressions=expressions))
+    
+    def _spec_request(self, spec, date_range):
+        """리포트 명세로 RunReportRequest 생성"""
+        params = {k: v for k, v in spec.items() if k not in ("name", "paginate")}
+        return self._build_request(date_range=date_range, **params)
+    
+    def _run_spec(self, spec, date_range, **kwargs):
+        """리포트 명세로 run_report 호출"""
+        params = {k: v for k, v in spec.items() if k != "paginate"}
+        params.update(kwargs)
+        return self.run_report(date_range=date_range, **params)
+    
+    def _load_metadata(self):
+        """
+        Property 메타데이터 로드 (캐시 우선)
+        
+        실패하면 None → 사전 검증 없이 기존처럼 호출
+        """
+        self._metadata = metadata_cache.lookup(self.property_id)
+        if self._metadata is None:
+            self._count_call()
+            metadata = self._call_api(
+                "메타데이터",
+                self.client.get_metadata,
+                GetMetadataRequest(name=f"properties/{self.property_id}/metadata"),
+                record_error=False
+            )
+            if metadata is not None:
+                self._metadata = metadata_cache.store(self.property_id, metadata)
+        return self._metadata
+    
+    def _missing_fields(self, spec):
+        """명세에서 Property에 없는 측정기준/측정항목 (필터 필드 포함)"""
+        dimensions = list(spec["dimensions"]) + list((spec.get("filters") or {}).keys())
+        return missing_fields(self._metadata, dimensions, spec["metrics"])
+    
+    def _plan_section(self, name):
+        """
+        섹션 리포트 계획 + 메타데이터 검증
+        
+        Returns:
+            [(리포트 명세, 호출 여부)] - 없는 항목이 있는 리포트는 호출하지 않음
+        """
+        return self._check_specs(getattr(self, f"_plan_{name}")())
+    
+    def _plan_followup(self, name, inputs):
+        """
+        2단계 리포트 계획 (_followup_<이름>()이 있는 섹션만)
+        
+        1단계 입력(_plan_*() 리포트 결과)을 보고 다음 리포트를 결정
+        예: 기본 리포트의 상위 페이지만 필터로 넣은 교차 리포트
+        2단계 입력은 1단계 입력 뒤에 이어서 _build_*()로 전달
+        
+        Returns:
+            [(리포트 명세, 호출 여부)] (2단계가 없는 섹션은 빈 리스트)
+        """
+        followup = getattr(self, f"_followup_{name}", None)
+        return self._check_specs(followup(*inputs)) if followup else []
+    
+    def _check_specs(self, specs):
+        """메타데이터에 없는 항목이 있는 리포트는 호출하지 않도록 표시"""
+        planned = []
+        for spec in specs:
+            missing = self._missing_fields(spec)
+            if missing:
+                note = f"{spec['name']}: 속성에 없는 항목 {', '.join(missing)}"
+                self.skipped.append(note)
+                print(f"   ⏭️  {note} → 건너뜀")
+            planned.append((spec, not missing))
+        return planned
+    
+    def _skipped_input(self, spec):
+        """건너뛴 리포트 대신 _build_*()에 넘길 빈 입력"""
+        return iter(()) if spec.get("paginate") else None
+    
+    def _build_batch_request(self, specs, date_range):
+        """리포트 명세 리스트로 BatchRunReportsRequest 생성"""
+        return BatchRunReportsRequest(
+            property=f"properties/{self.property_id}",
+            requests=[self._spec_request(spec, date_range) for spec in specs]
+        )
+    
+    def _call_api(self, name, method, request, retry=True, record_error=True, reports=0,
+                  failures=None):
+        """
+        재시도 포함 API 호출
+        
+        - 호출마다 API_STRATEGY["timeout"] 데드라인 적용
+        - 재시도 가능한 오류(5xx, 429, 타임아웃 등)만 지수 백오프(지터) 후 재시도
+        - 잘못된 요청/권한 오류는 즉시 포기
+        - Property 서킷이 열려 있으면 호출 없이 즉시 실패
+        
+        Args:
+            name: 로그용 이름
+            method: 클라이언트 메서드 (예: self.client.run_report)
+            request: 요청 객체
             retry: 재시도 여부
+            record_error: 최종 실패 시 self.errors 기록 여부
+            reports: 쿼터를 쓰는 리포트 수 (0이면 속도 제한 없음)
+            failures: 최종 실패 시 오류 분류(classify_error)를 추가할 리스트
         """
-        self.api_calls += 1
+        breaker = circuit_breakers.get(self.property_id)
         
         for attempt in range(API_STRATEGY["retry_count"]):
+            state = breaker.allow()
+            if not state:
+                return self._fail(f"{name}: 서킷 오픈 - 호출 생략", record_error)
+            
             try:
-                # 정렬 설정
-                order_bys = []
-                if order_by:
-                    orders = order_by if isinstance(order_by, list) else [order_by]
-                    for order in orders:
-                        order_bys.append(OrderBy(
-                            metric=OrderBy.MetricOrderBy(metric_name=order["metric"]),
-                            desc=order.get("desc", True)
-                        ))
-                
-                request = RunReportRequest(
-                    property=f"properties/{self.property_id}",
-                    dimensions=[Dimension(name=d) for d in dimensions],
-                    metrics=[Metric(name=m) for m in metrics],
-                    date_ranges=[DateRange(
-                        start_date=date_range["start"],
-                        end_date=date_range["end"]
-                    )],
-                    limit=limit,
-                    order_bys=order_bys if order_bys else None
-                )
+                if reports:
+                    with rate_limiter.acquire(self.property_id, self.credentials_path, reports):
+                        response = method(request=request, timeout=API_STRATEGY["timeout"])
+                    self._record_quota(response)
+                else:
+                    response = method(request=request, timeout=API_STRATEGY["timeout"])
                 
-                response = self.client.run_report(request)
-                rows = len(response.rows) if response else 0
-                print(f"   ✅ {name}: {rows}행")
+                breaker.record_success()
                 return response
-                
+            
             except Exception as e:
                 error_msg = f"{name}: {str(e)[:150]}"
+                kind = classify_error(e)
+                if is_quota_error(e):
+                    rate_limiter.exhausted(self.property_id, self.credentials_path)
                 
-                if attempt < API_STRATEGY["retry_count"] - 1 and retry:
+                # half-open 탐색 호출은 재시도 없이 바로 기록 (실패하면 서킷이 다시 열림)
+                if kind == RETRYABLE and attempt < API_STRATEGY["retry_count"] - 1 and retry \
+                        and state != "half-open":
+                    delay = backoff_delay(attempt)
                     print(f"   ⚠️  {error_msg}")
-                    print(f"   🔄 재시도 {attempt + 1}/{API_STRATEGY['retry_count']}")
-                    time.sleep(API_STRATEGY["retry_delay"])
+                    print(f"   🔄 재시도 {attempt + 1}/{API_STRATEGY['retry_count']} ({delay:.1f}초 후)")
+                    time.sleep(delay)
                 else:
-                    self.errors.append(error_msg)
-                    print(f"   ❌ {error_msg}")
-                    return None
+                    breaker.record_failure(kind)
+                    if failures is not None:
+                        failures.append(kind)
+                    return self._fail(error_msg, record_error)
+    
+    def _fail(self, error_msg, record_error=True):
+        """최종 실패 처리 (항상 None 반환)"""
+        if record_error:
+            self._add_error(error_msg)
+        print(f"   ❌ {error_msg}")
+        return None
+    
+    def _record_quota(self, response):
+        """응답(또는 배치 응답의 각 리포트)의 PropertyQuota를 속도 제한기에 반영"""
+        for report in getattr(response, "reports", None) or [response]:
+            rate_limiter.record(
+                self.property_id, self.credentials_path,
+                getattr(report, "property_quota", None)
+            )
+    
+    def run_report(self, name, dimensions, metrics, date_range, limit=None,
+                   order_by=None, filters=None, offset=None, metric_aggregations=None,
+                   retry=True):
+        """
+        안전한 API 호출
+        
+        Args:
+            name: 리포트 이름
+            dimensions: 차원 리스트
+            metrics: 측정항목 리스트
+            date_range: 날짜 범위
+            limit: 최대 행 수
+            order_by: 정렬 (dict or list) - {"metric": 이름, "desc": True} 또는 {"dimension": 이름}
+            filters: 차원 필터 {차원: [값, ...]}
+            offset: 시작 행 (페이지네이션)
+            metric_aggregations: 합계 행 종류 (예: ["TOTAL"])
+            retry: 재시도 여부
+        """
+        request = self._build_request(
+            dimensions, metrics, date_range, limit, order_by, filters, offset,
+            metric_aggregations
+        )
+        cached = self._cache_lookup(request)
+        if cached is not None:
+            print(f"   💾 {name}: {len(cached.rows)}행 (캐시)")
+            return cached
+        
+        self._count_call()
+        response = self._call_api(
+            name, self.client.run_report, request, retry, reports=1
+        )
+        if response is not None:
+            self._cache_store(request, response)
+            print(f"   ✅ {name}: {len(response.rows)}행")
+        return response
+    
+    def run_batch(self, specs, date_range, retry=True):
+        """
+        batchRunReports로 최대 5개 리포트를 한 번에 호출
+        
+        Args:
+            specs: _report()로 만든 리포트 명세 리스트
+            date_range: 날짜 범위
+            retry: 재시도 여부
+        
+        Returns:
+            specs와 같은 순서의 응답 리스트 (실패 시 None)
+            캐시에 있는 리포트는 배치에서 빼고, 나머지만 호출
+            배치가 잘못된 요청(FATAL)으로 실패하면 그룹 내 리포트를 개별 run_report로 다시 호출
+            그 외 실패(쿼터, 재시도 소진, 서킷 오픈)는 그룹 전체가 None
+        """
+        cached, pending = self._batch_cache_lookup(specs, date_range)
+        if not pending:
+            return cached
+        
+        reports = self._fetch_batch(pending, date_range, retry)
+        return self._merge_cached(cached, reports)
+    
+    def _fetch_batch(self, specs, date_range, retry=True):
+        """캐시를 거치지 않는 batchRunReports 호출 (run_batch 참고)"""
+        names = ", ".join(spec["name"] for spec in specs)
+        self._count_call()
+        
+        request = self._build_batch_request(specs, date_range)
+        failures = []
+        response = self._call_api(
+            f"배치({names})",
+            self.client.batch_run_reports,
+            request,
+            retry,
+            record_error=False,
+            reports=len(specs),
+            failures=failures
+        )
+        
+        if response is None:
+            if self._isolate_batch(names, failures):
+                return [self._run_spec(spec, date_range) for spec in specs]
+            return [None] * len(specs)
+        
+        reports = list(response.reports)
+        for spec, report in zip(specs, reports):
+            self._cache_store(self._spec_request(spec, date_range), report)
+            print(f"   ✅ {spec['name']}: {len(report.rows)}행")
+        return reports
+    
+    def _isolate_batch(self, names, failures):
+        """
+        배치 실패 후 개별 호출로 다시 시도할지 결정
+        
+        잘못된 요청(FATAL)은 리포트 하나가 배치 전체를 실패시킨 것이므로 개별 호출로 격리
+        쿼터/재시도 소진/서킷 오픈은 개별 호출도 같은 이유로 실패하므로 그룹 전체를 실패 처리
+        """
+        if failures and failures[-1] == FATAL:
+            print(f"   ↪️  개별 호출로 전환: {names}")
+            return True
+        self._add_error(f"배치({names}): 실패 - 개별 호출 생략")
+        return False
+    
+    def _cache_lookup(self, request):
+        """리포트 캐시 조회 (API_STRATEGY["report_cache"]가 꺼져 있으면 항상 None)"""
+        if not API_STRATEGY.get("report_cache"):
+            return None
+        
+        response = report_cache.lookup(request)
+        with self._lock:
+            if response is None:
+                self.cache_misses += 1
+            else:
+                self.cache_hits += 1
+        return response
+    
+    def _cache_store(self, request, response):
+        if API_STRATEGY.get("report_cache"):
+            report_cache.store(request, response)
+    
+    def _batch_cache_lookup(self, specs, date_range):
+        """
+        배치 명세별 캐시 조회
+        
+        Returns:
+            (cached, pending)
+            cached: specs와 같은 순서의 캐시 응답 (미스는 None)
+            pending: 호출이 필요한 명세 리스트
+        """
+        cached = [self._cache_lookup(self._spec_request(spec, date_range)) for spec in specs]
+        pending = []
+        for spec, response in zip(specs, cached):
+            if response is None:
+                pending.append(spec)
+            else:
+                print(f"   💾 {spec['name']}: {len(response.rows)}행 (캐시)")
+        return cached, pending
+    
+    def _merge_cached(self, cached, reports):
+        """캐시 미스(None) 자리에 새로 받은 응답을 순서대로 채움"""
+        fetched = iter(reports)
+        return [next(fetched) if response is None else response for response in cached]
     
-    def extract_data(self, days=None):
+    def iter_report(self, name, dimensions, metrics, date_range, limit=None,
+                    order_by=None, filters=None, offset=0, metric_aggregations=None,
+                    retry=True):
+        """
+        offset/limit 페이지 단위로 리포트 전체 행을 순회 (제너레이터)
+        
+        한 번에 한 페이지만 메모리에 유지하며 파싱된 행(dict)을 순서대로 반환
+        
+        Args:
+            limit: 페이지 크기 (기본값: API_STRATEGY["page_size"])
+            offset: 시작 행
+            나머지는 run_report와 동일
+        """
+        page_size = limit or API_STRATEGY["page_size"]
+        max_rows = API_STRATEGY["max_report_rows"]
+        
+        while offset < max_rows:
+            response = self.run_report(
+                f"{name} [{offset}~]" if offset else name,
+                dimensions, metrics, date_range,
+                min(page_size, max_rows - offset), order_by, filters, offset or None,
+                metric_aggregations, retry
+            )
+            if not response or not response.rows:
+                return
+            
+            yield from self._iter_rows(response)
+            offset += len(response.rows)
+            if offset >= response.row_count:
+                return
+    
+    def _section_input(self, spec, response, date_range):
+        """
+        _build_*()에 넘길 입력
+        
+        paginate 명세는 첫 페이지 행 + 나머지 페이지 스트림, 그 외는 응답 그대로
+        (비교 모드의 행 수 제한 리포트는 _split_limited() 참고)
+        """
+        if not spec.get("paginate"):
+            views, short = self._split_limited(spec, response, date_range)
+            if views is None:
+                return response
+            for name in short:
+                refetched = self._run_spec(
+                    spec, self._single_range(date_range, name), name=f"{spec['name']} ({name})"
+                )
+                if refetched is not None:
+                    views[name] = refetched
+            return _RangeSplit(views, response.row_count)
+        return self._stream_rows(spec, response, date_range)
+    
+    def _split_limited(self, spec, response, date_range):
+        """
+        비교 모드에서 limit이 있는 리포트 응답을 기간별로 나눔
+        
+        두 기간을 합친 요청은 limit × 2행을 함께 나눠 받으므로
+        기간마다 원래 limit까지만 남기고, 행이 모자란 기간은 그 기간만 다시 요청해야 함
+        (현재 기간 결과가 비교 여부와 관계없이 같도록)
+        
+        Returns:
+            (views, short) - views: {기간 이름: _RangeView}, short: 다시 요청할 기간 이름 리스트
+            나눌 필요가 없으면 (None, [])
+        """
+        limit = spec.get("limit")
+        if "compare" not in date_range or not limit or response is None:
+            return None, []
+        
+        views = {
+            name: _RangeView(response, name, position, limit)
+            for position, name in enumerate((CURRENT_RANGE, PREVIOUS_RANGE))
+        }
+        # 응답에 모든 행이 왔으면 모자란 기간도 실제로 행이 그만큼뿐
+        truncated = response.row_count > len(response.rows)
+        short = [name for name, view in views.items() if truncated and len(view.rows) < limit]
+        return views, short
+    
+    def _single_range(self, date_range, name):
+        """비교 모드 날짜 범위에서 한 기간만 남긴 날짜 범위"""
+        if name == PREVIOUS_RANGE:
+            return dict(date_range["compare"])
+        return {k: v for k, v in date_range.items() if k != "compare"}
+    
+    def _stream_rows(self, spec, response, date_range):
+        """첫 페이지 응답에 이어 나머지 페이지를 순회"""
+        if response is None:
+            return
+        
+        yield from self._iter_rows(response)
+        fetched = len(response.rows)
+        if fetched and fetched < response.row_count:
+            params = {k: v for k, v in spec.items() if k != "paginate"}
+            yield from self.iter_report(date_range=date_range, offset=fetched, **params)
+    
+    def extract_data(self, days=None, compare=None, sections=None):
         """
         설정 기반 데이터 추출
         
         ga4_config.py의 EXTRACT_CONFIG에서 on/off
+        API_STRATEGY["batch_reports"]가 켜져 있으면
+        모든 섹션의 리포트를 먼저 계획한 뒤 batchRunReports로 묶어서 호출
+        API_STRATEGY["max_workers"] > 1 이면 배치(또는 섹션)를 스레드 풀에서 동시 실행
+        compare=True 이면 같은 호출에 이전 기간을 함께 요청해 result["comparison"]에 저장
+        sections=[결과 키, ...] 이면 EXTRACT_CONFIG 대신 그 섹션만 추출 (부분 갱신용)
         """
-        date_range = self.get_date_range(days)
-        self.errors = []
-        self.api_calls = 0
+        return self._ordered_result(dict(self.extract_data_iter(days, compare, sections)))
+    
+    def extract_data_iter(self, days=None, compare=None, sections=None):
+        """
+        섹션이 끝나는 대로 (결과 키, 데이터)를 반환하는 제너레이터
+        
+        - 처음: ("info", 시작 정보)
+        - 섹션마다: (결과 키, 섹션 데이터) - 완료 순서
+        - 끝: conversion_funnel / comparison (설정 시), ("info", 최종 정보)
+        
+        인자는 extract_data와 동일
+        """
+        sections = self._enabled_sections(sections)
+        date_range = self.get_date_range(days, compare)
+        result = self._start_extract(date_range, sections)
+        yield "info", result["info"]
+        
+        self._load_metadata()
+        
+        if API_STRATEGY.get("batch_reports"):
+            completed = self._iter_batched(sections, date_range)
+        else:
+            completed = self._iter_sections(sections, date_range)
+        
+        for key, data in completed:
+            result[key] = data
+            yield key, data
+        
+        yield from self._finish_items(self._finish_extract(result))
+    
+    def _finish_items(self, result):
+        """_finish_extract()가 추가한 항목과 최종 info"""
+        for key in ("conversion_funnel", "comparison"):
+            if key in result:
+                yield key, result[key]
+        yield "info", result["info"]
+    
+    def _ordered_result(self, result):
+        """결과 dict를 info → SECTIONS 순서 → 나머지 순으로 정렬"""
+        order = ["info"] + [key for key, _, _, _ in self.SECTIONS]
+        ordered = {key: result[key] for key in order if key in result}
+        ordered.update(result)
+        return ordered
+    
+    def _iter_sections(self, sections, date_range):
+        """섹션별 개별 호출 모드: 섹션이 끝나는 대로 (결과 키, 데이터) 반환"""
+        # 섹션끼리는 서로 독립 (퍼널만 결과에 의존)
+        def extract(section):
+            print(f"\n{section[2]}")
+            return self._extract_section(section[0], section[3], date_range)
+        
+        workers = min(API_STRATEGY.get("max_workers", 1), len(sections))
+        if workers <= 1:
+            for section in sections:
+                yield section[0], extract(section)
+            return
+        
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(extract, section): section[0] for section in sections}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+    
+    def _enabled_sections(self, selected=None):
+        """
+        추출할 섹션 목록
+        
+        selected가 없으면 EXTRACT_CONFIG에서 켜진 섹션,
+        있으면 결과 키가 selected에 포함된 섹션 (없는 키는 ValueError)
+        """
+        if selected is None:
+            return [s for s in self.SECTIONS if EXTRACT_CONFIG[s[1]]]
+        
+        unknown = set(selected) - {s[0] for s in self.SECTIONS}
+        if unknown:
+            raise ValueError(f"알 수 없는 섹션: {', '.join(sorted(unknown))}")
+        return [s for s in self.SECTIONS if s[0] in selected]
+    
+    def _start_extract(self, date_range, sections=None):
+        """
+        추출 시작: 카운터 초기화 및 결과 뼈대 생성
+        
+        sections가 EXTRACT_CONFIG와 다르게 지정된 부분 추출이면 info["sections"]에 결과 키 기록
+        """
+        self._reset_counters()
+        self._compare = "compare" in date_range
+        self._selected = None if sections is None else [key for key, _, _, _ in sections]
         
         print(f"\n{'='*70}")
         print(f"🚀 GA4 데이터 추출 (템플릿)")
         print(f"{'='*70}")
         print(f"📅 {date_range['start']} ~ {date_range['end']} ({date_range['days']}일)")
+        if self._compare:
+            print(f"🔁 비교: {date_range['compare']['start']} ~ {date_range['compare']['end']}")
         print(f"\n{'='*70}\n")
         
-        result = {
+        return {
             "info": {
                 "property_id": self.property_id,
                 "date_range": date_range,
@@ -118,247 +728,639 @@ class GA4TemplateExtractor:
                 "version": "9.0-template",
                 "config": EXTRACT_CONFIG,
                 "api_calls": 0,
-                "errors": []
+                "cache": {"hits": 0, "misses": 0},
+                "errors": [],
+                "skipped": [],
+                **({"sections": self._selected} if self._selected is not None else {})
             }
         }
-        
-        # ========== 1. 전체 요약 ==========
-        if EXTRACT_CONFIG["summary"]:
-            print("📊 1. 전체 요약")
-            result["summary"] = self._extract_summary(date_range)
-        
-        # ========== 2. 페이지 데이터 ==========
-        if EXTRACT_CONFIG["pages"]:
-            print("\n📄 2. 페이지 데이터")
-            result["pages"] = self._extract_pages(date_range)
-        
-        # ========== 3. 이벤트 데이터 ==========
-        if EXTRACT_CONFIG["events"]:
-            print("\n🎯 3. 이벤트 데이터")
-            result["events"] = self._extract_events(date_range)
-            result["key_events"] = self._extract_key_events(date_range)
-        
-        # ========== 4. 거래 데이터 ==========
-        if EXTRACT_CONFIG["transactions"]:
-            print("\n💳 4. 거래 데이터")
-            result["transactions"] = self._extract_transactions(date_range)
-        
-        # ========== 5. 유입경로 ==========
-        if EXTRACT_CONFIG["traffic_sources"]:
-            print("\n🚪 5. 유입경로")
-            result["traffic_sources"] = self._extract_sources(date_range)
-        
-        # ========== 6. 캠페인 ==========
-        if EXTRACT_CONFIG["campaigns"]:
-            print("\n📣 6. 캠페인")
-            result["campaigns"] = self._extract_campaigns(date_range)
-        
-        # ========== 7. 기기 ==========
-        if EXTRACT_CONFIG["devices"]:
-            print("\n💻 7. 기기")
-            result["devices"] = self._extract_devices(date_range)
-        
-        # ========== 8. 위치 ==========
-        if EXTRACT_CONFIG["locations"]:
-            print("\n🌍 8. 위치")
-            result["locations"] = self._extract_locations(date_range)
-        
-        # ========== 9. 콘텐츠 ==========
-        if EXTRACT_CONFIG["content"]:
-            print("\n📝 9. 콘텐츠")
-            result["content_groups"] = self._extract_content(date_range)
-        
-        # ========== 10. 시간 분석 ==========
-        if EXTRACT_CONFIG["daily_trend"]:
-            print("\n📈 10. 일별 트렌드")
-            result["daily_trend"] = self._extract_daily(date_range)
-        
-        if EXTRACT_CONFIG["hourly_traffic"]:
-            print("\n⏰ 11. 시간대별")
-            result["hourly_traffic"] = self._extract_hourly(date_range)
-        
-        if EXTRACT_CONFIG["day_of_week"]:
-            print("\n📅 12. 요일별")
-            result["day_of_week"] = self._extract_day_of_week(date_range)
-        
-        # ========== 13. 사용자 분석 ==========
-        if EXTRACT_CONFIG["new_vs_returning"]:
-            print("\n👤 13. 신규/재방문")
-            result["new_vs_returning"] = self._extract_new_vs_returning(date_range)
-        
-        if EXTRACT_CONFIG["user_segments"]:
-            print("\n🎯 14. 사용자 세그먼트")
-            result["user_segments"] = self._extract_user_segments(date_range)
-        
-        # ========== 15. 행동 분석 ==========
-        if EXTRACT_CONFIG["search_terms"]:
-            print("\n🔍 15. 검색어")
-            result["search_terms"] = self._extract_search_terms(date_range)
-        
-        if EXTRACT_CONFIG["scroll_depth"]:
-            print("\n📜 16. 스크롤")
-            result["scroll_depth"] = self._extract_scroll(date_range)
-        
-        if EXTRACT_CONFIG["engagement"]:
-            print("\n💪 17. 참여도")
-            result["engagement"] = self._extract_engagement(date_range)
-        
+    
+    def _finish_extract(self, result):
+        """추출 종료: 퍼널 계산 및 info 갱신"""
         # ========== 18. 전환 퍼널 ==========
-        if EXTRACT_CONFIG["conversion_funnel"]:
+        # 부분 추출은 이벤트 섹션을 다시 받은 경우에만 계산
+        funnel = EXTRACT_CONFIG["conversion_funnel"] and (
+            self._selected is None or "events" in self._selected
+        )
+        if funnel:
             print("\n🛒 18. 전환 퍼널")
             result["conversion_funnel"] = self._calculate_funnel(result)
         
+        # 비교 기간 (같은 호출의 previous 행으로 만든 섹션)
+        if self._compare:
+            comparison = {"date_range": result["info"]["date_range"]["compare"], **self._comparison}
+            if funnel:
+                comparison["conversion_funnel"] = self._calculate_funnel(comparison)
+            result["comparison"] = comparison
+        
         # 최종 정보 업데이트
         result["info"]["api_calls"] = self.api_calls
+        result["info"]["cache"] = {"hits": self.cache_hits, "misses": self.cache_misses}
         result["info"]["errors"] = self.errors
+        result["info"]["skipped"] = self.skipped
+        result["info"]["quota"] = rate_limiter.remaining(self.property_id)
+        result["info"]["circuit"] = circuit_breakers.get(self.property_id).state
         
         print(f"\n✅ 추출 완료!")
         print(f"📞 총 API 호출: {self.api_calls}회")
+        if self.cache_hits:
+            print(f"💾 캐시 적중: {self.cache_hits}건 (미스 {self.cache_misses}건)")
         print(f"⚠️  에러: {len(self.errors)}건")
+        if self.skipped:
+            print(f"⏭️  건너뜀: {len(self.skipped)}건")
         
         return result
     
-    # ========== 개별 추출 메서드 ==========
+    def _extract_section(self, key, name, date_range):
+        """섹션 하나를 개별 run_report 호출로 추출"""
+        def run(planned):
+            return [
+                self._section_input(spec, self._run_shared(spec, date_range), date_range)
+                if runnable else self._skipped_input(spec)
+                for spec, runnable in planned
+            ]
+        
+        inputs = run(self._plan_section(name))
+        inputs += run(self._plan_followup(name, inputs))
+        return self._build_section(key, name, inputs)
     
-    def _extract_summary(self, date_range):
-        """전체 요약"""
-        response = self.run_report(
-            "전체 요약",
-            [],
-            [
-                DEFAULT_METRICS["users"],
-                DEFAULT_METRICS["sessions"],
-                DEFAULT_METRICS["pageviews"],
-                DEFAULT_METRICS["events"],
-                DEFAULT_METRICS["revenue"],
-                DEFAULT_METRICS["transactions"],
-                "newUsers",
-                "averageSessionDuration",
-                DEFAULT_METRICS["bounceRate"],
-            ],
-            date_range
-        )
-        return self._parse_single(response)
-    
-    def _extract_pages(self, date_range):
-        """페이지 데이터"""
-        # 기본 지표
-        metrics = self.run_report(
-            "페이지 기본",
-            [DEFAULT_DIMENSIONS["page"]],
-            [
-                DEFAULT_METRICS["pageviews"],
-                DEFAULT_METRICS["users"],
-                "newUsers",
-                "averageSessionDuration",
-                DEFAULT_METRICS["bounceRate"],
-                "engagementRate",
-                DEFAULT_METRICS["events"],
-            ],
-            date_range,
-            LIMITS["pages"],
-            {"metric": DEFAULT_METRICS["pageviews"], "desc": True}
-        )
+    def _build_section(self, key, name, inputs):
+        """
+        입력을 섹션의 _build_*()에 전달
         
-        # 페이지별 이벤트
-        events = self.run_report(
-            "페이지별 이벤트",
-            [DEFAULT_DIMENSIONS["page"], DEFAULT_DIMENSIONS["event"]],
-            ["eventCount"],
-            date_range,
-            LIMITS["pages"] * 5
-        )
+        비교 기간이 있으면 기간별로 나눠 두 번 파싱하고
+        이전 기간 결과는 self._comparison[key]에 보관 (반환값은 현재 기간)
+        """
+        build = getattr(self, f"_build_{name}")
+        if not self._compare:
+            return build(*inputs)
         
-        # 페이지별 유입경로
-        sources = self.run_report(
-            "페이지별 유입",
-            [DEFAULT_DIMENSIONS["page"], DEFAULT_DIMENSIONS["source"], DEFAULT_DIMENSIONS["medium"]],
-            [DEFAULT_METRICS["users"], DEFAULT_METRICS["sessions"]],
-            date_range,
-            LIMITS["pages"] * 5
-        )
+        # 행 스트림은 한 번만 읽을 수 있으므로 먼저 리스트로 받아둠
+        inputs = [x if x is None or hasattr(x, "rows") else list(x) for x in inputs]
+        self._comparison[key] = build(*[self._range_input(x, PREVIOUS_RANGE, 1) for x in inputs])
+        return build(*[self._range_input(x, CURRENT_RANGE, 0) for x in inputs])
+    
+    def _range_input(self, value, name, position):
+        """_build_*() 입력 중 한 기간 부분만 반환 (응답은 _RangeView, 행 리스트는 필터링)"""
+        if value is None:
+            return None
+        if isinstance(value, _RangeSplit):
+            return value.views[name]
+        if hasattr(value, "rows"):
+            return _RangeView(value, name, position)
+        return iter([
+            {k: v for k, v in row.items() if k != "dateRange"}
+            for row in value if row.get("dateRange") == name
+        ])
+    
+    def _iter_batched(self, sections, date_range):
+        """
+        배치 모드: 배치가 끝날 때마다 입력이 모두 모인 섹션을 바로 파싱해 반환
         
-        # 페이지별 기기
-        devices = self.run_report(
-            "페이지별 기기",
-            [DEFAULT_DIMENSIONS["page"], DEFAULT_DIMENSIONS["device"]],
-            [DEFAULT_METRICS["users"]],
-            date_range,
-            LIMITS["pages"] * 3
+        2단계 리포트(_followup_*)가 있는 섹션은 1단계 입력이 모이면
+        2단계 배치를 이어서 호출하고, 2단계까지 끝나면 반환
+        """
+        waiting = self._plan_sections(sections)
+        responses = {}
+        requested = set()
+        
+        workers = max(1, API_STRATEGY.get("max_workers", 1))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            running = {}
+            
+            def submit(plans):
+                for group in self._group_batches(plans, requested):
+                    requested.update(spec_key for spec_key, _ in group)
+                    future = pool.submit(self.run_batch, [spec for _, spec in group], date_range)
+                    running[future] = group
+            
+            submit(waiting.values())
+            while waiting:
+                ready = self._take_ready(waiting, responses)
+                for key, label, name, inputs, followed in ready:
+                    if not followed and self._start_followup(waiting, key, label, name, inputs):
+                        submit([waiting[key]])
+                        continue
+                    print(f"\n{label}")
+                    yield key, self._build_section(key, name, inputs)
+                
+                if ready:
+                    # 바로 입력이 모인 2단계가 있을 수 있으므로 다시 확인
+                    continue
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for (spec_key, spec), report in zip(running.pop(future), future.result()):
+                        responses[spec_key] = self._section_input(spec, report, date_range)
+    
+    def _plan_sections(self, sections):
+        """
+        섹션별 1단계 리포트 계획
+        
+        Returns:
+            {결과 키: (결과 키, 라벨, 섹션 이름, [(리포트 명세, 호출 여부)], 이전 단계 입력)}
+        """
+        return {
+            key: (key, label, name, self._plan_section(name), None)
+            for key, _, label, name in sections
+        }
+    
+    def _take_ready(self, waiting, responses):
+        """
+        현재 단계 입력이 모두 도착한 섹션을 waiting에서 꺼냄
+        
+        Returns:
+            [(결과 키, 라벨, 섹션 이름, 지금까지의 입력 리스트, 2단계 완료 여부)]
+        """
+        ready = []
+        for key, (_, label, name, planned, previous) in list(waiting.items()):
+            if all(self._spec_key(spec) in responses for spec, runnable in planned if runnable):
+                del waiting[key]
+                inputs = [
+                    responses[self._spec_key(spec)] if runnable else self._skipped_input(spec)
+                    for spec, runnable in planned
+                ]
+                ready.append((key, label, name, (previous or []) + inputs, previous is not None))
+        return ready
+    
+    def _start_followup(self, waiting, key, label, name, inputs):
+        """
+        1단계가 끝난 섹션의 2단계 계획을 waiting에 등록
+        
+        Returns:
+            2단계가 있으면 True
+        """
+        planned = self._plan_followup(name, inputs)
+        if not planned:
+            return False
+        waiting[key] = (key, label, name, planned, inputs)
+        return True
+    
+    def _group_batches(self, plans, exclude=()):
+        """
+        호출할 리포트를 배치 그룹으로 분할
+        
+        Args:
+            plans: _plan_sections() 값 형식의 계획 리스트
+            exclude: 이미 요청한 명세 키 (다시 호출하지 않음)
+        
+        Returns:
+            groups: [[(명세 키, 리포트 명세)]] (그룹당 최대 5개, 호출할 리포트만)
+            여러 섹션이 같은 리포트를 계획하면 한 번만 호출
+        """
+        queue = {}
+        for _, _, _, planned, _ in plans:
+            for spec, runnable in planned:
+                spec_key = self._spec_key(spec)
+                if runnable and spec_key not in exclude:
+                    queue.setdefault(spec_key, spec)
+        queue = list(queue.items())
+        size = min(API_STRATEGY.get("batch_report_size", MAX_BATCH_REPORTS), MAX_BATCH_REPORTS)
+        
+        groups = [queue[i:i + size] for i in range(0, len(queue), size)]
+        if groups:
+            print(f"\n📦 배치 {len(groups)}개 ({len(queue)}개 리포트)")
+        return groups
+    
+    def _spec_key(self, spec):
+        """
+        같은 리포트인지 판단하는 키 (이름 제외)
+        
+        paginate 명세는 행 스트림을 한 번만 소비할 수 있으므로 공유하지 않음
+        """
+        if spec.get("paginate"):
+            return ("paginate", id(spec))
+        return json.dumps({k: v for k, v in spec.items() if k != "name"}, sort_keys=True)
+    
+    def _run_shared(self, spec, date_range):
+        """
+        리포트 명세 호출 (추출 한 번 안에서 같은 리포트는 한 번만 호출)
+        
+        여러 섹션이 동시에 요청해도 첫 호출 결과를 함께 사용
+        """
+        if spec.get("paginate"):
+            return self._run_spec(spec, date_range)
+        
+        with self._lock:
+            entry = self._shared.setdefault(self._spec_key(spec), {"lock": threading.Lock()})
+        with entry["lock"]:
+            if "response" not in entry:
+                entry["response"] = self._run_spec(spec, date_range)
+        return entry["response"]
+    
+    def _map(self, func, items):
+        """
+        items에 func 적용 (입력 순서 유지)
+        
+        API_STRATEGY["max_workers"] > 1 이면 제한된 스레드 풀에서 동시 실행
+        """
+        items = list(items)
+        workers = min(API_STRATEGY.get("max_workers", 1), len(items))
+        if workers <= 1:
+            return [func(item) for item in items]
+        
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(func, items))
+    
+    def _reset_counters(self):
+        """호출/캐시/에러 카운터 및 공유 리포트 초기화"""
+        self.errors = []
+        self.skipped = []
+        self.api_calls = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._shared = {}
+        self._compare = False
+        self._comparison = {}
+        self._selected = None
+    
+    def _count_call(self):
+        with self._lock:
+            self.api_calls += 1
+    
+    def _add_error(self, error_msg):
+        with self._lock:
+            self.errors.append(error_msg)
+    
+    def _report(self, name, dimensions, metrics, limit=None, order_by=None,
+                filters=None, paginate=False, metric_aggregations=None):
+        """
+        리포트 명세 (run_report 인자와 동일한 키)
+        
+        paginate=True 이면 limit은 페이지 크기가 되고,
+        _build_*()에는 응답 대신 전체 페이지의 행 스트림이 전달됨
+        (offset 페이지가 겹치거나 빠지지 않도록 order_by 뒤에 모든 측정기준 정렬을 덧붙임)
+        metric_aggregations=["TOTAL"] 이면 응답에 전체 기간 합계 행(totals) 포함
+        """
+        if paginate:
+            if limit is None:
+                limit = API_STRATEGY["page_size"]
+            order_by = self._total_order(order_by, dimensions)
+        
+        return {
+            "name": name,
+            "dimensions": dimensions,
+            "metrics": metrics,
+            "limit": limit,
+            "order_by": order_by,
+            "filters": filters,
+            "paginate": paginate,
+            "metric_aggregations": metric_aggregations,
+        }
+    
+    def _total_order(self, order_by, dimensions):
+        """
+        order_by 뒤에 아직 정렬 기준이 아닌 측정기준을 오름차순으로 덧붙인 정렬 리스트
+        
+        측정항목 값이 같은 행도 순서가 고정되어 offset 페이지 사이에서 행이 겹치거나 빠지지 않음
+        """
+        orders = list(order_by if isinstance(order_by, list) else [order_by] if order_by else [])
+        ordered = {order["dimension"] for order in orders if "dimension" in order}
+        return orders + [{"dimension": d} for d in dimensions if d not in ordered]
+    
+    # ========== 일자별 팩트 (증분 동기화용) ==========
+    
+    # 일자별로 저장하는 섹션 (결과 키, 일자별 보관 행 수 설정 키)
+    DAILY_FACT_SECTIONS = [
+        ("summary", None),
+        ("pages", "pages_per_day"),
+        ("traffic_sources", "sources_per_day"),
+    ]
+    
+    def extract_daily(self, start_date, end_date):
+        """
+        일자별 팩트 추출 (모든 리포트에 date 측정기준 포함)
+        
+        GA4에서 지난 날짜의 데이터는 바뀌지 않으므로
+        한 번 저장한 날짜는 다시 받을 필요 없이 롤업에 재사용
+        
+        Args:
+            start_date: 시작일 ("YYYY-MM-DD")
+            end_date: 종료일 ("YYYY-MM-DD")
+        
+        Returns:
+            {"YYYY-MM-DD": {"summary": {...}, "pages": [...], "traffic_sources": [...]}}
+            데이터가 없는 날짜도 빈 팩트로 포함, 리포트 실패 시 None
+        """
+        start = datetime.strptime(start_date, "%Y-%m-%d")
+        end = datetime.strptime(end_date, "%Y-%m-%d")
+        days = (end - start).days + 1
+        date_range = {"start": start_date, "end": end_date, "days": days}
+        
+        self._reset_counters()
+        print(f"\n📅 일자별 팩트 추출: {start_date} ~ {end_date} ({days}일)")
+        
+        specs = self._plan_daily_facts()
+        if API_STRATEGY.get("batch_reports"):
+            reports = self.run_batch(specs, date_range)
+        else:
+            reports = self._map(lambda spec: self._run_spec(spec, date_range), specs)
+        
+        inputs = [self._section_input(spec, report, date_range)
+                  for spec, report in zip(specs, reports)]
+        return self._build_daily_facts(start, days, inputs)
+    
+    def _build_daily_facts(self, start, days, inputs):
+        """리포트 입력(응답 또는 행 스트림)을 날짜별 팩트로 분배"""
+        facts = {
+            (start + timedelta(days=i)).strftime("%Y-%m-%d"): {
+                key: {} if key == "summary" else []
+                for key, _ in self.DAILY_FACT_SECTIONS
+            }
+            for i in range(days)
+        }
+        
+        for (key, limit_key), rows in zip(self.DAILY_FACT_SECTIONS, inputs):
+            if rows is None or hasattr(rows, "rows"):
+                rows = self._iter_rows(rows)
+            for row in rows:
+                day = self._fact_date(row.pop(DEFAULT_DIMENSIONS["date"]))
+                if day not in facts:
+                    continue
+                if key == "summary":
+                    facts[day][key] = row
+                elif len(facts[day][key]) < DAILY_FACTS[limit_key]:
+                    facts[day][key].append(row)
+        
+        if self.errors:
+            print(f"   ❌ 일자별 팩트 추출 실패: {len(self.errors)}건")
+            return None
+        
+        print(f"   ✅ {days}일 팩트 (API 호출 {self.api_calls}회)")
+        return facts
+    
+    def _plan_daily_facts(self):
+        """DAILY_FACT_SECTIONS 순서대로 date 측정기준을 붙인 리포트 계획"""
+        date = DEFAULT_DIMENSIONS["date"]
+        pageviews = DEFAULT_METRICS["pageviews"]
+        return [
+            self._report(
+                "일자별 요약",
+                [date],
+                self._summary_metrics()
+            ),
+            # 날짜 × 페이지 (조회수 순으로 전체 순회 후 일자별 상위만 보관)
+            self._report(
+                "일자별 페이지",
+                [date, DEFAULT_DIMENSIONS["page"]],
+                [pageviews, DEFAULT_METRICS["users"]],
+                order_by={"metric": pageviews, "desc": True},
+                paginate=True
+            ),
+            self._report(
+                "일자별 유입경로",
+                [date, DEFAULT_DIMENSIONS["source"], DEFAULT_DIMENSIONS["medium"]],
+                self._plan_sources()[0]["metrics"],
+                order_by={"metric": DEFAULT_METRICS["users"], "desc": True},
+                paginate=True
+            ),
+        ]
+    
+    def _fact_date(self, value):
+        """GA4 date 값(YYYYMMDD) → YYYY-MM-DD"""
+        return f"{value[:4]}-{value[4:6]}-{value[6:8]}"
+    
+    # ========== 섹션별 리포트 계획 / 파싱 ==========
+    
+    def _summary_metrics(self):
+        """전체 요약 측정항목"""
+        return [
+            DEFAULT_METRICS["users"],
+            DEFAULT_METRICS["sessions"],
+            DEFAULT_METRICS["pageviews"],
+            DEFAULT_METRICS["events"],
+            DEFAULT_METRICS["revenue"],
+            DEFAULT_METRICS["transactions"],
+            "newUsers",
+            "averageSessionDuration",
+            DEFAULT_METRICS["bounceRate"],
+        ]
+    
+    def _time_grain(self):
+        """
+        전체 요약 / 일별 / 요일별 (+ 시간대별)이 함께 쓰는 날짜 단위 리포트
+        
+        - 합산 가능한 지표(ADDITIVE_METRICS)는 이 리포트 행을 로컬에서 집계
+        - 비율/고유 수 지표의 기간 전체 값은 같은 응답의 합계 행(TOTAL)에서 가져옴
+          (전체 요약과 참여도는 별도 호출 없이 합계 행으로 채움)
+        - exact_users=False 이면 날짜×시간 단위로 받아 시간대별도 여기서 계산
+          (시간대/요일별 activeUsers는 합산 근사치)
+        
+        여러 섹션이 같은 명세를 계획하므로 추출 한 번에 한 번만 호출됨
+        """
+        dimensions = [DEFAULT_DIMENSIONS["date"]]
+        if not API_STRATEGY.get("exact_users", True):
+            dimensions.append(DEFAULT_DIMENSIONS["hour"])
+        
+        # 참여도용 userEngagementDuration 포함 10개 (GA4 요청당 최대 10개)
+        return self._report(
+            "날짜별 기준",
+            dimensions,
+            self._summary_metrics() + ["userEngagementDuration"],
+            API_STRATEGY["max_report_rows"],
+            metric_aggregations=["TOTAL"]
         )
+    
+    def _plan_summary(self):
+        """전체 요약 (날짜별 기준 리포트에서 계산)"""
+        return [self._time_grain()]
+    
+    def _build_summary(self, grain):
+        rows = self._columnar(grain)
+        totals = self._parse_totals(grain)
+        if not rows and not totals:
+            return {}
         
-        return self._unify_pages(metrics, events, sources, devices)
+        summed = self._rollup(rows, None, ADDITIVE_METRICS).get(None, {})
+        return {
+            metric: summed.get(metric, 0.0) if metric in ADDITIVE_METRICS else totals.get(metric, 0.0)
+            for metric in self._summary_metrics()
+        }
     
-    def _extract_events(self, date_range):
+    def _plan_pages(self):
+        """페이지 데이터 (1단계: 상위 페이지 선정)"""
+        return [
+            # 기본 지표
+            self._report(
+                "페이지 기본",
+                [DEFAULT_DIMENSIONS["page"]],
+                [
+                    DEFAULT_METRICS["pageviews"],
+                    DEFAULT_METRICS["users"],
+                    "newUsers",
+                    "averageSessionDuration",
+                    DEFAULT_METRICS["bounceRate"],
+                    "engagementRate",
+                    DEFAULT_METRICS["events"],
+                ],
+                LIMITS["pages"],
+                {"metric": DEFAULT_METRICS["pageviews"], "desc": True}
+            ),
+        ]
+    
+    def _followup_pages(self, metrics):
+        """
+        페이지 교차 리포트 (2단계)
+        
+        기본 리포트에서 고른 상위 페이지만 pagePath 필터로 요청해
+        상위 페이지 밖의 행은 받지 않음 (기본 리포트가 실패했거나 비었으면 교차 리포트 없음)
+        페이지 순회 정렬은 _report()가 모든 측정기준으로 고정하고,
+        전체 행 수는 iter_report가 API_STRATEGY["max_report_rows"]에서 자름
+        """
+        page = DEFAULT_DIMENSIONS["page"]
+        base = self._columnar(metrics)
+        if not base:
+            return []
+        filters = {page: list(base.column(page))}
+        
+        def cross_report(name, dimensions, metrics):
+            return self._report(
+                name,
+                [page] + dimensions,
+                metrics,
+                filters=filters,
+                paginate=True
+            )
+        
+        return [
+            # 페이지별 이벤트
+            cross_report(
+                "페이지별 이벤트",
+                [DEFAULT_DIMENSIONS["event"]],
+                ["eventCount"]
+            ),
+            # 페이지별 유입경로
+            cross_report(
+                "페이지별 유입",
+                [DEFAULT_DIMENSIONS["source"], DEFAULT_DIMENSIONS["medium"]],
+                [DEFAULT_METRICS["users"], DEFAULT_METRICS["sessions"]]
+            ),
+            # 페이지별 기기
+            cross_report(
+                "페이지별 기기",
+                [DEFAULT_DIMENSIONS["device"]],
+                [DEFAULT_METRICS["users"]]
+            ),
+        ]
+    
+    def _build_pages(self, metrics, events=(), sources=(), devices=()):
+        return self._unify_pages(self._iter_rows(metrics), events, sources, devices)
+    
+    def _plan_events(self):
         """전체 이벤트"""
-        response = self.run_report(
+        return [self._report(
             "전체 이벤트",
             [DEFAULT_DIMENSIONS["event"]],
             ["eventCount", DEFAULT_METRICS["users"]],
-            date_range,
             LIMITS["events"],
             {"metric": "eventCount", "desc": True}
-        )
+        )]
+    
+    def _build_events(self, response):
         return self._parse_multi(response)
     
-    def _extract_key_events(self, date_range):
+    def _plan_key_events(self):
         """주요 이벤트 상세"""
-        key_events = {}
+        # 주요 이벤트 × 페이지를 한 번에 조회 (eventName in KEY_EVENTS)
+        # 행 수는 이벤트 수 × KEY_EVENT_PAGES의 KEY_EVENT_SCAN_FACTOR배로 제한하고
+        # 조회수가 많은 이벤트에 밀려 덜 채워진 이벤트는 2단계에서 따로 조회
+        return [self._report(
+            "주요 이벤트 상세",
+            [DEFAULT_DIMENSIONS["event"], CUSTOM_DIMENSIONS["page_location"]],
+            ["eventCount"],
+            KEY_EVENT_SCAN_FACTOR * len(KEY_EVENTS) * KEY_EVENT_PAGES,
+            {"metric": "eventCount", "desc": True},
+            filters={DEFAULT_DIMENSIONS["event"]: KEY_EVENTS}
+        )]
+    
+    def _followup_key_events(self, scan):
+        """
+        덜 채워진 주요 이벤트 리포트 (2단계)
         
-        for event in KEY_EVENTS:
-            # 이벤트별 페이지
-            response = self.run_report(
-                f"{event} 상세",
-                [CUSTOM_DIMENSIONS["page_location"]],
+        1단계 리포트가 행 제한에 걸렸을 때만, 페이지가 KEY_EVENT_PAGES개 미만인 이벤트마다
+        그 이벤트만 필터로 넣은 상위 KEY_EVENT_PAGES개 리포트 (행 제한에 안 걸렸으면 이미 전부)
+        """
+        if scan is None or scan.row_count <= len(scan.rows):
+            return []
+        
+        counts = Counter(self._columnar(scan).column(DEFAULT_DIMENSIONS["event"]))
+        return [
+            self._report(
+                f"주요 이벤트 상세 ({event})",
+                [DEFAULT_DIMENSIONS["event"], CUSTOM_DIMENSIONS["page_location"]],
                 ["eventCount"],
-                date_range,
-                50
+                KEY_EVENT_PAGES,
+                {"metric": "eventCount", "desc": True},
+                filters={DEFAULT_DIMENSIONS["event"]: [event]}
             )
-            key_events[event] = self._parse_multi(response)
-        
-        return key_events
+            for event in KEY_EVENTS if counts[event] < KEY_EVENT_PAGES
+        ]
     
-    def _extract_transactions(self, date_range):
-        """거래 데이터"""
-        # 거래 기본
-        basic = self.run_report(
-            "거래 기본",
-            [CUSTOM_DIMENSIONS["transaction_id"]],
-            [DEFAULT_METRICS["revenue"], "eventCount"],
-            date_range,
-            LIMITS["transactions"]
-        )
+    def _build_key_events(self, scan, *followups):
+        # 이벤트별로 분리 (이벤트당 상위 KEY_EVENT_PAGES개 페이지)
+        # 2단계 리포트를 받은 이벤트는 그 결과를 사용
+        event_dim = DEFAULT_DIMENSIONS["event"]
+        refetched = {}
+        for response in followups:
+            for row in self._parse_multi(response):
+                refetched.setdefault(row.pop(event_dim), []).append(row)
         
-        # 거래 맞춤 정보
-        custom = self.run_report(
-            "거래 맞춤",
-            [
-                CUSTOM_DIMENSIONS["transaction_id"],
-                CUSTOM_DIMENSIONS["payment_type"],
-            ],
-            [DEFAULT_METRICS["revenue"]],
-            date_range,
-            LIMITS["transactions"]
-        )
+        key_events = {event: [] for event in KEY_EVENTS}
+        for row in self._parse_multi(scan):
+            event = row.pop(event_dim)
+            if event in key_events and event not in refetched \
+                    and len(key_events[event]) < KEY_EVENT_PAGES:
+                key_events[event].append(row)
         
-        # 거래별 유입경로
-        sources = self.run_report(
-            "거래 유입",
-            [
-                CUSTOM_DIMENSIONS["transaction_id"],
-                DEFAULT_DIMENSIONS["source"],
-                DEFAULT_DIMENSIONS["medium"]
-            ],
-            [DEFAULT_METRICS["revenue"]],
-            date_range,
-            LIMITS["transactions"]
-        )
+        for event, rows in refetched.items():
+            if event in key_events:
+                key_events[event] = rows[:KEY_EVENT_PAGES]
         
+        return key_events
+    
+    def _plan_transactions(self):
+        """거래 데이터 (LIMITS["transactions"] 단위 페이지로 전체 거래 조회)"""
+        return [
+            # 거래 기본
+            self._report(
+                "거래 기본",
+                [CUSTOM_DIMENSIONS["transaction_id"]],
+                [DEFAULT_METRICS["revenue"], "eventCount"],
+                LIMITS["transactions"],
+                paginate=True
+            ),
+            # 거래 맞춤 정보
+            self._report(
+                "거래 맞춤",
+                [
+                    CUSTOM_DIMENSIONS["transaction_id"],
+                    CUSTOM_DIMENSIONS["payment_type"],
+                ],
+                [DEFAULT_METRICS["revenue"]],
+                LIMITS["transactions"],
+                paginate=True
+            ),
+            # 거래별 유입경로
+            self._report(
+                "거래 유입",
+                [
+                    CUSTOM_DIMENSIONS["transaction_id"],
+                    DEFAULT_DIMENSIONS["source"],
+                    DEFAULT_DIMENSIONS["medium"]
+                ],
+                [DEFAULT_METRICS["revenue"]],
+                LIMITS["transactions"],
+                paginate=True
+            ),
+        ]
+    
+    def _build_transactions(self, basic, custom, sources):
         return self._merge_transactions(basic, custom, sources)
     
-    def _extract_sources(self, date_range):
+    def _plan_sources(self):
         """유입경로"""
-        response = self.run_report(
+        return [self._report(
             "유입경로",
             [DEFAULT_DIMENSIONS["source"], DEFAULT_DIMENSIONS["medium"]],
             [
@@ -368,15 +1370,16 @@ class GA4TemplateExtractor:
                 DEFAULT_METRICS["revenue"],
                 DEFAULT_METRICS["transactions"],
             ],
-            date_range,
             LIMITS["sources"],
             {"metric": DEFAULT_METRICS["users"], "desc": True}
-        )
+        )]
+    
+    def _build_sources(self, response):
         return self._parse_multi(response)
     
-    def _extract_campaigns(self, date_range):
+    def _plan_campaigns(self):
         """캠페인"""
-        response = self.run_report(
+        return [self._report(
             "캠페인",
             [
                 CUSTOM_DIMENSIONS["campaign"],
@@ -388,14 +1391,15 @@ class GA4TemplateExtractor:
                 DEFAULT_METRICS["events"],
                 DEFAULT_METRICS["revenue"]
             ],
-            date_range,
             LIMITS["campaigns"]
-        )
+        )]
+    
+    def _build_campaigns(self, response):
         return self._parse_multi(response)
     
-    def _extract_devices(self, date_range):
+    def _plan_devices(self):
         """기기"""
-        response = self.run_report(
+        return [self._report(
             "기기",
             [DEFAULT_DIMENSIONS["device"], "operatingSystem", "browser"],
             [
@@ -404,72 +1408,118 @@ class GA4TemplateExtractor:
                 DEFAULT_METRICS["events"],
                 DEFAULT_METRICS["transactions"]
             ],
-            date_range,
             LIMITS["devices"]
-        )
+        )]
+    
+    def _build_devices(self, response):
         return self._parse_multi(response)
     
-    def _extract_locations(self, date_range):
+    def _plan_locations(self):
         """위치"""
-        response = self.run_report(
+        return [self._report(
             "위치",
             ["country", DEFAULT_DIMENSIONS["city"]],
             [DEFAULT_METRICS["users"], DEFAULT_METRICS["sessions"]],
-            date_range,
             LIMITS["locations"]
-        )
+        )]
+    
+    def _build_locations(self, response):
         return self._parse_multi(response)
     
-    def _extract_content(self, date_range):
+    def _plan_content(self):
         """콘텐츠 그룹"""
-        response = self.run_report(
+        return [self._report(
             "콘텐츠 그룹",
             [CUSTOM_DIMENSIONS["content_group"]],
             [DEFAULT_METRICS["pageviews"], DEFAULT_METRICS["users"]],
-            date_range,
             100
-        )
-        return self._parse_multi(response)
+        )]
     
-    def _extract_daily(self, date_range):
-        """일별 트렌드"""
-        response = self.run_report(
-            "일별",
-            [DEFAULT_DIMENSIONS["date"]],
-            [
-                DEFAULT_METRICS["users"],
-                DEFAULT_METRICS["sessions"],
-                DEFAULT_METRICS["events"],
-                DEFAULT_METRICS["revenue"],
-                DEFAULT_METRICS["transactions"]
-            ],
-            date_range
-        )
+    def _build_content(self, response):
         return self._parse_multi(response)
     
-    def _extract_hourly(self, date_range):
-        """시간대별"""
-        response = self.run_report(
+    def _plan_daily(self):
+        """일별 트렌드 (날짜별 기준 리포트에서 계산)"""
+        return [self._time_grain()]
+    
+    def _build_daily(self, grain):
+        date = DEFAULT_DIMENSIONS["date"]
+        metrics = [
+            DEFAULT_METRICS["users"],
+            DEFAULT_METRICS["sessions"],
+            DEFAULT_METRICS["events"],
+            DEFAULT_METRICS["revenue"],
+            DEFAULT_METRICS["transactions"]
+        ]
+        rows = self._columnar(grain)
+        daily = self._rollup(rows, rows.column(date) if rows else None, metrics)
+        return [{date: day, **values} for day, values in sorted(daily.items())]
+    
+    def _plan_hourly(self):
+        """시간대별 (exact_users=False 이면 날짜×시간 기준 리포트에서 계산)"""
+        if not API_STRATEGY.get("exact_users", True):
+            return [self._time_grain()]
+        
+        return [self._report(
             "시간대별",
             [DEFAULT_DIMENSIONS["hour"]],
-            [DEFAULT_METRICS["users"], DEFAULT_METRICS["sessions"]],
-            date_range
+            [DEFAULT_METRICS["users"], DEFAULT_METRICS["sessions"]]
+        )]
+    
+    def _build_hourly(self, response):
+        if API_STRATEGY.get("exact_users", True):
+            return self._parse_multi(response)
+        
+        hour = DEFAULT_DIMENSIONS["hour"]
+        rows = self._columnar(response)
+        hourly = self._rollup(
+            rows, rows.column(hour) if rows else None,
+            [DEFAULT_METRICS["users"], DEFAULT_METRICS["sessions"]]
         )
-        return self._parse_multi(response)
+        return [{hour: h, **values} for h, values in sorted(hourly.items())]
     
-    def _extract_day_of_week(self, date_range):
-        """요일별"""
-        response = self.run_report(
-            "요일별",
-            ["dayOfWeek"],
-            [DEFAULT_METRICS["users"], DEFAULT_METRICS["sessions"]],
-            date_range
+    def _plan_day_of_week(self):
+        """
+        요일별
+        
+        세션은 날짜별 기준 리포트에서 계산하고,
+        exact_users=True 이면 요일별 사용자 수만 따로 호출
+        """
+        plan = [self._time_grain()]
+        if API_STRATEGY.get("exact_users", True):
+            plan.append(self._report(
+                "요일별 사용자",
+                ["dayOfWeek"],
+                [DEFAULT_METRICS["users"]]
+            ))
+        return plan
+    
+    def _build_day_of_week(self, grain, users=None):
+        date = DEFAULT_DIMENSIONS["date"]
+        users_key = DEFAULT_METRICS["users"]
+        metrics = [users_key, DEFAULT_METRICS["sessions"]]
+        
+        # GA4 dayOfWeek: 0=일요일 ~ 6=토요일 (날짜별로 한 번만 계산)
+        rows = self._columnar(grain)
+        weekdays = {}
+        if rows:
+            for day in rows.column(date):
+                if day not in weekdays:
+                    weekdays[day] = str((datetime.strptime(day, "%Y%m%d").weekday() + 1) % 7)
+        weekly = self._rollup(
+            rows, [weekdays[day] for day in rows.column(date)] if rows else None, metrics
         )
-        return self._parse_multi(response)
+        if API_STRATEGY.get("exact_users", True):
+            exact = self._columnar(users)
+            exact = dict(zip(exact.column("dayOfWeek"), exact.column(users_key))) if exact else {}
+            for day, values in weekly.items():
+                values[users_key] = exact.get(day, 0.0)
+        
+        return [{"dayOfWeek": day, **values} for day, values in sorted(weekly.items())]
     
-    def _extract_new_vs_returning(self, date_range):
+    def _plan_new_vs_returning(self):
         """신규/재방문"""
-        response = self.run_report(
+        return [self._report(
             "신규/재방문",
             ["newVsReturning"],
             [
@@ -477,17 +1527,18 @@ class GA4TemplateExtractor:
                 DEFAULT_METRICS["sessions"],
                 DEFAULT_METRICS["events"],
                 DEFAULT_METRICS["transactions"]
-            ],
-            date_range
-        )
+            ]
+        )]
+    
+    def _build_new_vs_returning(self, response):
         return self._parse_multi(response)
     
-    def _extract_user_segments(self, date_range):
+    def _plan_user_segments(self):
         """사용자 세그먼트"""
         if "user_type" not in CUSTOM_DIMENSIONS:
             return []
         
-        response = self.run_report(
+        return [self._report(
             "사용자 세그먼트",
             [CUSTOM_DIMENSIONS["user_type"]],
             [
@@ -495,140 +1546,116 @@ class GA4TemplateExtractor:
                 DEFAULT_METRICS["sessions"],
                 DEFAULT_METRICS["revenue"]
             ],
-            date_range,
             50
-        )
+        )]
+    
+    def _build_user_segments(self, response=None):
         return self._parse_multi(response)
     
-    def _extract_search_terms(self, date_range):
+    def _plan_search_terms(self):
         """검색어"""
-        response = self.run_report(
+        return [self._report(
             "검색어",
             [CUSTOM_DIMENSIONS["search_term"]],
             ["eventCount"],
-            date_range,
             LIMITS["search_terms"]
-        )
+        )]
+    
+    def _build_search_terms(self, response):
         return self._parse_multi(response)
     
-    def _extract_scroll(self, date_range):
+    def _plan_scroll(self):
         """스크롤 깊이"""
-        response = self.run_report(
+        return [self._report(
             "스크롤",
             [CUSTOM_DIMENSIONS["scroll_depth"]],
             ["eventCount"],
-            date_range,
             50
-        )
+        )]
+    
+    def _build_scroll(self, response):
         return self._parse_multi(response)
     
-    def _extract_engagement(self, date_range):
-        """참여도"""
-        response = self.run_report(
-            "참여도",
-            [],
-            [
-                "engagementRate",
-                "userEngagementDuration",
-                "averageSessionDuration",
-                "sessionsPerUser"
-            ],
-            date_range
-        )
-        return self._parse_single(response)
+    def _plan_engagement(self):
+        """참여도 (날짜별 기준 리포트의 합계 행에서 계산)"""
+        return [self._time_grain()]
+    
+    def _build_engagement(self, grain):
+        """
+        GA4 정의에 따라 합계 행에서 계산
+        
+        - engagementRate = 1 - bounceRate
+        - sessionsPerUser = sessions / activeUsers
+        """
+        totals = self._parse_totals(grain)
+        if not totals:
+            return {}
+        
+        users = totals.get(DEFAULT_METRICS["users"], 0.0)
+        sessions = totals.get(DEFAULT_METRICS["sessions"], 0.0)
+        return {
+            "engagementRate": 1.0 - totals.get(DEFAULT_METRICS["bounceRate"], 0.0) if sessions else 0.0,
+            "userEngagementDuration": totals.get("userEngagementDuration", 0.0),
+            "averageSessionDuration": totals.get("averageSessionDuration", 0.0),
+            "sessionsPerUser": sessions / users if users else 0.0,
+        }
     
     # ========== 유틸리티 메서드 ==========
     
     def _unify_pages(self, metrics, events, sources, devices):
-        """페이지 통합"""
-        pages_dict = defaultdict(lambda: {
-            "metrics": {},
-            "events": {},
-            "traffic_sources": {},
-            "devices": {}
-        })
-        
-        # 기본 지표
-        if metrics:
-            for row in metrics.rows:
-                page = row.dimension_values[0].value
-                pages_dict[page]["metrics"] = {
-                    "pageViews": float(row.metric_values[0].value),
-                    "activeUsers": float(row.metric_values[1].value),
-                    "newUsers": float(row.metric_values[2].value),
-                    "avgSessionDuration": float(row.metric_values[3].value),
-                    "bounceRate": float(row.metric_values[4].value),
-                    "engagementRate": float(row.metric_values[5].value),
-                    "keyEvents": float(row.metric_values[6].value)
-                }
-        
-        # 이벤트
-        if events:
-            for row in events.rows:
-                page = row.dimension_values[0].value
-                event = row.dimension_values[1].value
-                count = float(row.metric_values[0].value)
-                pages_dict[page]["events"][event] = count
-        
-        # 유입경로
-        if sources:
-            for row in sources.rows:
-                page = row.dimension_values[0].value
-                source = row.dimension_values[1].value
-                medium = row.dimension_values[2].value
-                users = float(row.metric_values[0].value)
-                sessions = float(row.metric_values[1].value)
-                key = f"{source}/{medium}"
-                pages_dict[page]["traffic_sources"][key] = {
-                    "users": users,
-                    "sessions": sessions
-                }
-        
-        # 기기
-        if devices:
-            for row in devices.rows:
-                page = row.dimension_values[0].value
-                device = row.dimension_values[1].value
-                users = float(row.metric_values[0].value)
-                pages_dict[page]["devices"][device] = users
-        
-        result = []
-        for page_path, data in pages_dict.items():
-            result.append({"pagePath": page_path, **data})
-        
-        result.sort(key=lambda x: x.get("metrics", {}).get("pageViews", 0), reverse=True)
-        return result
+        """
+        페이지 통합 (pagePath 기준 해시 조인)
+        
+        각 인자는 파싱된 행(dict) 이터러블이며 한 행씩 소비
+        교차 리포트는 기본 지표에 포함된 페이지만 반영하고 결과는 상위 LIMITS["pages"]개
+        """
+        page_dim = DEFAULT_DIMENSIONS["page"]
+        users = DEFAULT_METRICS["users"]
+        
+        return hash_join(
+            metrics, page_dim, "pagePath",
+            select=lambda row: {"metrics": {
+                "pageViews": row[DEFAULT_METRICS["pageviews"]],
+                "activeUsers": row[users],
+                "newUsers": row["newUsers"],
+                "avgSessionDuration": row["averageSessionDuration"],
+                "bounceRate": row[DEFAULT_METRICS["bounceRate"]],
+                "engagementRate": row["engagementRate"],
+                "keyEvents": row[DEFAULT_METRICS["events"]]
+            }},
+            joins=[
+                Join(events, page_dim, "events", "eventCount",
+                     group_by=DEFAULT_DIMENSIONS["event"]),
+                Join(sources, page_dim, "traffic_sources",
+                     lambda row: {"users": row[users], "sessions": row[DEFAULT_METRICS["sessions"]]},
+                     group_by=lambda row: f"{row[DEFAULT_DIMENSIONS['source']]}/{row[DEFAULT_DIMENSIONS['medium']]}"),
+                Join(devices, page_dim, "devices", users,
+                     group_by=DEFAULT_DIMENSIONS["device"]),
+            ],
+            sort=lambda entry: entry["metrics"].get("pageViews", 0),
+            top=LIMITS["pages"]
+        )
     
     def _merge_transactions(self, basic, custom, sources):
-        """거래 통합"""
-        merged = {}
-        
-        if basic:
-            for row in basic.rows:
-                tid = row.dimension_values[0].value
-                merged[tid] = {
-                    "transaction_id": tid,
-                    "revenue": float(row.metric_values[0].value),
-                    "count": float(row.metric_values[1].value)
-                }
-        
-        if custom:
-            for row in custom.rows:
-                tid = row.dimension_values[0].value
-                if tid in merged:
-                    merged[tid]["payment_type"] = row.dimension_values[1].value
-        
-        if sources:
-            for row in sources.rows:
-                tid = row.dimension_values[0].value
-                if tid in merged:
-                    source = row.dimension_values[1].value
-                    medium = row.dimension_values[2].value
-                    merged[tid]["traffic_source"] = f"{source}/{medium}"
-        
-        result = list(merged.values())
-        result.sort(key=lambda x: x.get("revenue", 0), reverse=True)
-        return result
+        """
+        거래 통합 (transactionId 기준 해시 조인)
+        
+        각 인자는 파싱된 행(dict) 이터러블 (페이지 스트림)
+        """
+        tid_dim = CUSTOM_DIMENSIONS["transaction_id"]
+        return hash_join(
+            basic, tid_dim, "transaction_id",
+            select=lambda row: {
+                "revenue": row[DEFAULT_METRICS["revenue"]],
+                "count": row["eventCount"]
+            },
+            joins=[
+                Join(custom, tid_dim, "payment_type", CUSTOM_DIMENSIONS["payment_type"]),
+                Join(sources, tid_dim, "traffic_source",
+                     lambda row: f"{row[DEFAULT_DIMENSIONS['source']]}/{row[DEFAULT_DIMENSIONS['medium']]}"),
+            ],
+            sort=lambda entry: entry.get("revenue", 0)
+        )
     
     def _calculate_funnel(self, data):
         """퍼널 계산"""
@@ -673,23 +1700,48 @@ class GA4TemplateExtractor:
         return result
     
     def _parse_multi(self, response):
-        """여러 행 파싱"""
-        if not response or not response.rows:
-            return []
+        """
+        여러 행 파싱 (raw_data에 저장하는 dict 리스트)
         
-        results = []
-        for row in response.rows:
-            item = {}
-            for i, dim in enumerate(response.dimension_headers):
-                item[dim.name] = row.dimension_values[i].value
-            for i, metric in enumerate(response.metric_headers):
-                try:
-                    item[metric.name] = float(row.metric_values[i].value)
-                except:
-                    item[metric.name] = row.metric_values[i].value
-            results.append(item)
-        
-        return results
+        결과를 그대로 JSON으로 저장하므로 행 뷰가 아닌 dict로 만듦
+        읽기만 하는 입력(조인, 페이지 스트림)은 _iter_rows()로 한 행씩 소비
+        """
+        return self._columnar(response).records()
+    
+    def _parse_totals(self, response):
+        """합계 행(metric_aggregations=TOTAL) 파싱 (없으면 빈 dict)"""
+        if not response or not response.totals:
+            return {}
+        
+        row = response.totals[0]
+        result = {}
+        for i, metric in enumerate(response.metric_headers):
+            try:
+                result[metric.name] = float(row.metric_values[i].value)
+            except:
+                result[metric.name] = row.metric_values[i].value
+        return result
+    
+    def _rollup(self, rows, keys, metrics):
+        """
+        열 단위 리포트를 keys 기준으로 묶어 metrics 합산
+        
+        Args:
+            rows: ColumnarReport
+            keys: 행과 같은 길이의 그룹 키 (None이면 전체 합계 하나)
+        
+        Returns:
+            {키: {측정항목: 합계}}
+        """
+        return rows.group_sum(keys, metrics)
+    
+    def _columnar(self, response):
+        """응답을 열 단위 리포트로 변환 (응답이 없으면 빈 리포트)"""
+        return ColumnarReport.from_response(response)
+    
+    def _iter_rows(self, response):
+        """응답 행을 하나씩 dict로 반환 (열 단위로 한 번에 파싱, 리스트는 만들지 않음)"""
+        return self._columnar(response).iter_records()
     
     def print_validation(self, data):
         """검증 출력"""
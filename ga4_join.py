@@ -0,0 +1,114 @@
+"""
+GA4 리포트 해시 조인
+여러 리포트의 파싱된 행을 키 측정기준으로 합쳐 섹션 결과(dict 리스트)를 만듦
+"""
+
+JOIN_TYPES = ("inner", "left", "outer")
+
+
+def _key_getter(on):
+    """키 측정기준(이름 하나 또는 여러 개) → 행에서 키를 꺼내는 함수"""
+    if isinstance(on, str):
+        return lambda row: row[on]
+    columns = tuple(on)
+    return lambda row: tuple(row[column] for column in columns)
+
+
+def _value_getter(value):
+    """열 이름 또는 함수 → 행에서 값을 꺼내는 함수"""
+    if value is None or callable(value):
+        return value
+    return lambda row: row[value]
+
+
+class Join:
+    """
+    기준 리포트에 붙일 리포트 하나
+
+    Args:
+        rows: 파싱된 행(dict 또는 행 뷰) 이터러블 - 한 번만 순회
+        on: 키 측정기준 (이름 또는 이름 리스트)
+        into: 결과 항목에 넣을 필드 이름
+        value: 넣을 값 (열 이름 또는 row → 값 함수)
+        group_by: 지정하면 into는 {하위 키: 값} dict (키당 여러 행)
+                  (열 이름 또는 row → 하위 키 함수, 매칭 행이 없어도 빈 dict)
+                  없으면 into는 값 하나 (여러 행이면 마지막 행, 매칭 행이 없으면 필드 없음)
+    """
+    __slots__ = ("rows", "key", "into", "value", "group_by")
+
+    def __init__(self, rows, on, into, value, group_by=None):
+        self.rows = rows
+        self.key = _key_getter(on)
+        self.into = into
+        self.value = _value_getter(value)
+        self.group_by = _value_getter(group_by)
+
+
+def hash_join(base, on, key_name, select, joins, how="left", sort=None, top=None, empty=None):
+    """
+    기준 리포트에 여러 리포트를 키로 조인
+
+    기준 행을 키 → 결과 항목 해시로 만든 뒤 각 조인 리포트를 한 행씩 소비
+    top이 있으면 조인 전에 기준 항목을 상위 top개로 줄여 나머지 키의 행은 만들지 않음
+
+    Args:
+        base: 기준 리포트 행 이터러블
+        on: 기준 리포트의 키 측정기준 (이름 또는 이름 리스트)
+        key_name: 결과 항목에 키를 넣을 필드 이름 (항목의 첫 필드)
+        select: 기준 행 → 결과 항목 필드 dict 함수
+        joins: Join 리스트
+        how: "inner" (모든 조인에 매칭된 키만) / "left" (기준 키 전부)
+             / "outer" (조인 리포트에만 있는 키도 추가, 기준 필드는 empty())
+        sort: 결과 항목 → 정렬 키 함수 (내림차순)
+        top: 결과 최대 항목 수
+        empty: outer 조인에서 기준 행이 없는 키의 기준 필드 (dict 반환 함수)
+
+    Returns:
+        [{key_name: 키, **기준 필드, **조인 필드}]
+    """
+    if how not in JOIN_TYPES:
+        raise ValueError(f"알 수 없는 조인 방식: {how}")
+
+    key = _key_getter(on)
+    entries = {}
+    for row in base:
+        entries[key(row)] = {key_name: key(row), **select(row)}
+
+    # 조인 전 상위 N개만 남김 (정렬 기준은 기준 필드)
+    if top is not None and sort is not None and len(entries) > top:
+        kept = sorted(entries.values(), key=sort, reverse=True)[:top]
+        entries = {entry[key_name]: entry for entry in kept}
+
+    for join in joins:
+        if join.group_by is not None:
+            for entry in entries.values():
+                entry[join.into] = {}
+
+    matched = [set() for _ in joins]
+    for join, hits in zip(joins, matched):
+        for row in join.rows:
+            row_key = join.key(row)
+            entry = entries.get(row_key)
+            if entry is None:
+                if how != "outer":
+                    continue
+                entry = entries[row_key] = {key_name: row_key, **(empty() if empty else {})}
+                for other in joins:
+                    if other.group_by is not None:
+                        entry[other.into] = {}
+
+            if join.group_by is None:
+                entry[join.into] = join.value(row)
+            else:
+                entry[join.into][join.group_by(row)] = join.value(row)
+            hits.add(row_key)
+
+    result = list(entries.values())
+    if how == "inner":
+        result = [entry for entry in result
+                  if all(entry[key_name] in hits for hits in matched)]
+    if sort is not None:
+        result.sort(key=sort, reverse=True)
+    if top is not None:
+        result = result[:top]
+    return result
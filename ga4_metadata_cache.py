@@ -0,0 +1,67 @@
+"""
+GA4 Property 메타데이터 캐시
+Property별로 사용 가능한 측정기준/측정항목 목록을 TTL 동안 보관
+"""
+import threading
+import time
+
+from ga4_config import API_STRATEGY
+
+
+class GA4MetadataCache:
+    """
+    property_id → {"dimensions": set, "metrics": set} 캐시
+
+    맞춤 측정기준(customEvent:*)은 Property마다 다르므로
+    리포트 호출 전에 존재 여부를 확인하는 데 사용
+    """
+
+    def __init__(self, ttl=None):
+        self.ttl = ttl or API_STRATEGY.get("metadata_ttl", 6 * 3600)
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, property_id):
+        """캐시된 메타데이터 (없거나 만료되면 None)"""
+        with self._lock:
+            entry = self._entries.get(str(property_id))
+            if entry and time.time() - entry["fetched_at"] < self.ttl:
+                return entry
+            return None
+
+    def store(self, property_id, metadata):
+        """
+        GetMetadata 응답 저장
+
+        Args:
+            metadata: google.analytics.data_v1beta.types.Metadata
+        """
+        entry = {
+            "dimensions": {d.api_name for d in metadata.dimensions},
+            "metrics": {m.api_name for m in metadata.metrics},
+            "fetched_at": time.time(),
+        }
+        with self._lock:
+            self._entries[str(property_id)] = entry
+        return entry
+
+    def invalidate(self, property_id=None):
+        """캐시 삭제 (property_id 없으면 전체)"""
+        with self._lock:
+            if property_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(property_id), None)
+
+
+def missing_fields(metadata, dimensions, metrics):
+    """메타데이터에 없는 측정기준/측정항목 이름 리스트"""
+    if not metadata:
+        return []
+    missing = [d for d in dimensions if d not in metadata["dimensions"]]
+    missing += [m for m in metrics if m not in metadata["metrics"]]
+    return missing
+
+
+# 전역 캐시 인스턴스
+metadata_cache = GA4MetadataCache()
@@ -0,0 +1,165 @@
+"""
+GA4 쿼터 기반 호출 속도 제한
+응답의 propertyQuota(returnPropertyQuota)로 토큰 버킷을 보정해
+Property별 / 인증(프로젝트)×Property별로 호출 속도를 조절
+"""
+from contextlib import contextmanager
+import threading
+import time
+
+from ga4_config import API_STRATEGY, QUOTA_LIMITS
+
+
+class TokenBucket:
+    """
+    시간당 토큰 버킷
+
+    - 일정 속도로 채워지고, 호출 전에 예상 비용만큼 예약
+    - 토큰이 모자라면 음수까지 예약하고 그만큼 대기 시간 반환
+    - 서버가 알려준 잔여 토큰(remaining)으로 주기적으로 보정
+    """
+
+    def __init__(self, capacity, period=3600):
+        self.capacity = float(capacity)
+        self.rate = self.capacity / period
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, cost):
+        """cost만큼 예약하고 대기해야 할 시간(초) 반환"""
+        self._refill()
+        self.tokens -= cost
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def sync(self, remaining):
+        """서버 기준 잔여 토큰으로 보정 (더 적은 쪽을 신뢰)"""
+        self._refill()
+        self.tokens = min(self.tokens, float(remaining))
+
+    def drain(self):
+        """쿼터 초과 응답을 받으면 버킷을 비워 다음 호출을 늦춤"""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0)
+
+
+class GA4RateLimiter:
+    """
+    프로세스 전역 GA4 호출 속도 제한기
+
+    모든 추출기가 공유하며,
+    - Property 버킷: tokensPerHour
+    - 인증(프로젝트)×Property 버킷: tokensPerProjectPerHour
+    - Property 동시 요청 수: concurrentRequests
+    를 기준으로 호출 전에 대기
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._property_buckets = {}
+        self._project_buckets = {}
+        self._concurrency = {}
+        self._cost = {}
+        self._quota = {}
+
+    def _buckets(self, property_id, credentials):
+        property_id = str(property_id)
+        if property_id not in self._property_buckets:
+            self._property_buckets[property_id] = TokenBucket(QUOTA_LIMITS["tokens_per_hour"])
+            self._concurrency[property_id] = threading.BoundedSemaphore(
+                QUOTA_LIMITS["concurrent_requests"]
+            )
+        project_key = (credentials, property_id)
+        if project_key not in self._project_buckets:
+            self._project_buckets[project_key] = TokenBucket(
+                QUOTA_LIMITS["tokens_per_project_per_hour"]
+            )
+        return self._property_buckets[property_id], self._project_buckets[project_key]
+
+    def estimated_cost(self, property_id, reports=1):
+        """리포트 reports개 호출의 예상 토큰 비용 (최근 소모량 이동 평균 기준)"""
+        per_report = self._cost.get(str(property_id), QUOTA_LIMITS["default_report_cost"])
+        return per_report * reports
+
+    def reserve(self, property_id, credentials, reports=1):
+        """
+        토큰 예약 후 대기 시간(초) 반환 (대기는 호출자가 수행)
+
+        비동기 추출기는 asyncio.sleep으로 대기
+        """
+        cost = self.estimated_cost(property_id, reports)
+        with self._lock:
+            property_bucket, project_bucket = self._buckets(property_id, credentials)
+            return max(property_bucket.reserve(cost), project_bucket.reserve(cost))
+
+    @contextmanager
+    def acquire(self, property_id, credentials, reports=1):
+        """동기 호출용: 토큰이 찰 때까지 대기 + Property 동시 요청 수 제한"""
+        wait = self.reserve(property_id, credentials, reports)
+        if wait > 0:
+            print(f"   ⏳ 쿼터 대기 {wait:.1f}초 (property {property_id})")
+            time.sleep(min(wait, API_STRATEGY.get("max_quota_wait", 300)))
+
+        with self._lock:
+            semaphore = self._concurrency[str(property_id)]
+        with semaphore:
+            yield
+
+    def record(self, property_id, credentials, quota):
+        """
+        응답의 PropertyQuota 반영
+
+        - consumed: 이번 요청이 쓴 토큰 → 예상 비용 이동 평균 갱신
+        - remaining: 남은 토큰 → 버킷 보정
+        """
+        if not quota:
+            return
+
+        property_id = str(property_id)
+        hourly = quota.tokens_per_hour
+        project = quota.tokens_per_project_per_hour
+
+        with self._lock:
+            property_bucket, project_bucket = self._buckets(property_id, credentials)
+
+            if hourly.consumed:
+                previous = self._cost.get(property_id, float(hourly.consumed))
+                self._cost[property_id] = previous * 0.8 + hourly.consumed * 0.2
+            if hourly.consumed or hourly.remaining:
+                property_bucket.sync(hourly.remaining)
+            if project.consumed or project.remaining:
+                project_bucket.sync(project.remaining)
+
+            self._quota[property_id] = {
+                "tokens_per_day": quota.tokens_per_day.remaining,
+                "tokens_per_hour": hourly.remaining,
+                "tokens_per_project_per_hour": project.remaining,
+                "concurrent_requests": quota.concurrent_requests.remaining,
+                "server_errors_per_project_per_hour": quota.server_errors_per_project_per_hour.remaining,
+                "updated_at": time.time(),
+            }
+
+    def exhausted(self, property_id, credentials):
+        """RESOURCE_EXHAUSTED 응답 시 버킷 비우기"""
+        with self._lock:
+            for bucket in self._buckets(property_id, credentials):
+                bucket.drain()
+
+    def remaining(self, property_id):
+        """마지막 응답 기준 남은 쿼터 (없으면 빈 dict)"""
+        with self._lock:
+            return dict(self._quota.get(str(property_id), {}))
+
+
+def is_quota_error(error):
+    """쿼터 초과 에러 여부"""
+    text = str(error)
+    return "RESOURCE_EXHAUSTED" in text or text.startswith("429")
+
+
+# 전역 인스턴스 (모든 추출기 공유)
+rate_limiter = GA4RateLimiter()
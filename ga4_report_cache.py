@@ -0,0 +1,142 @@
+"""
+GA4 리포트 결과 캐시
+같은 Property / 쿼리 / 기간의 run_report 응답을 디스크에 저장해 재사용
+"""
+from google.analytics.data_v1beta.types import RunReportRequest, RunReportResponse
+from datetime import datetime
+import hashlib
+import os
+import struct
+import tempfile
+import threading
+import time
+
+from ga4_config import API_STRATEGY
+
+# 파일 헤더: 만료 시각 (epoch 초, 0이면 영구)
+_HEADER = struct.Struct(">d")
+
+
+class GA4ReportCache:
+    """
+    디스크 기반 리포트 캐시
+
+    - 키: RunReportRequest 직렬화 값의 해시
+      (property, 측정기준, 측정항목, 필터, 기간, limit, offset, 정렬이 모두 포함됨)
+    - TTL: 기간이 모두 과거면 영구 (GA4에서 지난 날짜는 바뀌지 않음),
+      오늘을 포함하면 API_STRATEGY["report_cache_ttl"]초
+    - 전체 크기가 API_STRATEGY["report_cache_max_mb"]를 넘으면 오래 안 쓴 파일부터 삭제
+    """
+
+    def __init__(self, directory=None, max_bytes=None, ttl=None):
+        self.directory = directory or API_STRATEGY.get("report_cache_dir", ".cache/ga4_reports")
+        self.max_bytes = max_bytes or API_STRATEGY.get("report_cache_max_mb", 512) * 1024 * 1024
+        self.ttl = ttl or API_STRATEGY.get("report_cache_ttl", 900)
+        self._size = None
+        self._lock = threading.Lock()
+
+    def _path(self, request):
+        digest = hashlib.sha256(RunReportRequest.serialize(request)).hexdigest()
+        return os.path.join(self.directory, digest[:2], f"{digest}.bin")
+
+    def _expires_at(self, request):
+        """기간 종료일이 오늘 이전이면 영구(0), 아니면 지금 + TTL"""
+        today = datetime.now().strftime("%Y-%m-%d")
+        if all(r.end_date < today for r in request.date_ranges):
+            return 0.0
+        return time.time() + self.ttl
+
+    def lookup(self, request):
+        """캐시된 응답 (없거나 만료되면 None)"""
+        path = self._path(request)
+        try:
+            with open(path, "rb") as f:
+                expires_at, = _HEADER.unpack(f.read(_HEADER.size))
+                if expires_at and expires_at < time.time():
+                    self._remove(path)
+                    return None
+                response = RunReportResponse.deserialize(f.read())
+            # 최근 사용 시각 갱신 (크기 초과 시 삭제 순서 기준)
+            os.utime(path)
+            return response
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # 손상된 파일은 지우고 미스 처리
+            self._remove(path)
+            return None
+
+    def store(self, request, response):
+        """응답 저장 (임시 파일에 쓴 뒤 교체)"""
+        path = self._path(request)
+        payload = _HEADER.pack(self._expires_at(request)) + RunReportResponse.serialize(response)
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            # 같은 디렉터리의 고유 임시 파일 (여러 프로세스/스레드가 같은 키를 써도 충돌 없음)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(path), prefix=f"{os.path.basename(path)}.", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp_path, path)
+            except OSError:
+                self._remove(tmp_path)
+                raise
+        except OSError as e:
+            print(f"   ⚠️  리포트 캐시 저장 실패: {e}")
+            return
+
+        with self._lock:
+            if self._size is None:
+                # 첫 저장 시 디렉터리 전체 크기 계산 (방금 쓴 파일 포함)
+                self._size = sum(size for _, size, _ in self._entries())
+            else:
+                self._size += len(payload) - previous
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def clear(self):
+        """캐시 파일 전체 삭제"""
+        with self._lock:
+            for path, _, _ in self._entries():
+                self._remove(path)
+            self._size = 0
+
+    def _entries(self):
+        """(경로, 크기, 최근 사용 시각) 목록"""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".bin"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict(self):
+        """최대 크기의 90%까지 오래 안 쓴 파일부터 삭제"""
+        target = self.max_bytes * 0.9
+        for path, size, _ in sorted(self._entries(), key=lambda entry: entry[2]):
+            if self._size <= target:
+                break
+            if self._remove(path):
+                self._size -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+
+# 전역 캐시 인스턴스
+report_cache = GA4ReportCache()
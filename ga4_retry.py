@@ -0,0 +1,145 @@
+"""
+GA4 API 재시도 정책
+에러 분류(재시도 가능/불가), 지수 백오프(지터), Property별 서킷 브레이커
+"""
+import random
+import threading
+import time
+
+from ga4_config import API_STRATEGY
+
+try:
+    from google.api_core import exceptions as gexc
+except ImportError:  # google-api-core 없이 import 되는 경우 (메시지로만 분류)
+    gexc = None
+
+# 에러 분류
+RETRYABLE = "retryable"     # 일시적 오류 → 백오프 후 재시도
+FATAL = "fatal"             # 요청 자체가 잘못됨 → 즉시 포기 (리포트 단위)
+PROPERTY_FATAL = "property_fatal"  # 권한/인증 문제 → Property 전체 차단
+
+_FATAL_CODES = ("400", "404", "409", "412")
+_PROPERTY_FATAL_CODES = ("401", "403")
+
+
+def classify_error(error):
+    """예외를 RETRYABLE / FATAL / PROPERTY_FATAL 중 하나로 분류"""
+    if gexc is not None:
+        if isinstance(error, (gexc.PermissionDenied, gexc.Unauthenticated)):
+            return PROPERTY_FATAL
+        if isinstance(error, (gexc.InvalidArgument, gexc.NotFound,
+                              gexc.FailedPrecondition, gexc.AlreadyExists)):
+            return FATAL
+        if isinstance(error, gexc.GoogleAPICallError):
+            return RETRYABLE
+
+    text = str(error)
+    if text.startswith(_PROPERTY_FATAL_CODES):
+        return PROPERTY_FATAL
+    if text.startswith(_FATAL_CODES):
+        return FATAL
+    # 네트워크 오류, 타임아웃, 5xx, 429 등
+    return RETRYABLE
+
+
+def backoff_delay(attempt):
+    """
+    지수 백오프 + Full Jitter
+
+    attempt번째 재시도 대기 시간: 0 ~ min(최대값, 기본값 × 2^attempt) 사이 난수
+    """
+    base = API_STRATEGY["retry_delay"]
+    cap = API_STRATEGY.get("retry_max_delay", 30)
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    Property별 서킷 브레이커
+
+    - closed: 정상 호출
+    - open: 연속 실패가 임계치를 넘으면 쿨다운 동안 호출하지 않고 즉시 실패
+    - half-open: 쿨다운 후 탐색 호출 하나만 허용해서 성공하면 closed, 실패하면 다시 open
+      (탐색 호출이 끝나기 전의 다른 호출은 open과 같이 즉시 실패,
+       쿨다운이 지나도록 결과가 기록되지 않은 탐색 호출은 잃어버린 것으로 보고 다시 허용)
+    """
+
+    def __init__(self, threshold=None, cooldown=None):
+        self.threshold = threshold or API_STRATEGY.get("circuit_failures", 5)
+        self.cooldown = cooldown or API_STRATEGY.get("circuit_cooldown", 300)
+        self.failures = 0
+        self.opened_at = None
+        self.probe_at = None  # 진행 중인 탐색 호출 시작 시각
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        """
+        호출 허용 여부
+
+        Returns:
+            허용하면 "closed" 또는 "half-open"(탐색 호출), 거부하면 None
+            탐색 호출은 재시도 없이 결과를 바로 record_success/record_failure로 기록해야 함
+        """
+        with self._lock:
+            state = self.state
+            if state == "open":
+                return None
+            if state == "half-open":
+                now = time.monotonic()
+                if self.probe_at is not None and now - self.probe_at < self.cooldown:
+                    return None
+                self.probe_at = now
+            return state
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probe_at = None
+
+    def record_failure(self, kind):
+        """
+        실패 기록
+
+        리포트 단위 오류(FATAL)는 Property 상태와 무관하므로 세지 않음
+        (탐색 호출이었으면 다음 호출이 다시 탐색)
+        """
+        with self._lock:
+            self.probe_at = None
+            if kind == FATAL:
+                return
+            self.failures += 1
+            if kind == PROPERTY_FATAL or self.failures >= self.threshold \
+                    or self.opened_at is not None:
+                self.opened_at = time.monotonic()
+
+
+class CircuitBreakerRegistry:
+    """property_id → CircuitBreaker"""
+
+    def __init__(self):
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, property_id):
+        with self._lock:
+            key = str(property_id)
+            if key not in self._breakers:
+                self._breakers[key] = CircuitBreaker()
+            return self._breakers[key]
+
+    def states(self):
+        with self._lock:
+            return {pid: b.state for pid, b in self._breakers.items()}
+
+
+# 전역 인스턴스
+circuit_breakers = CircuitBreakerRegistry()
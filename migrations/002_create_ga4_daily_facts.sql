@@ -0,0 +1,23 @@
+-- GA4 일자별 팩트 테이블 생성
+-- Property별로 날짜 × 섹션 단위 데이터를 저장 (지난 날짜는 GA4에서 바뀌지 않으므로 한 번만 수집)
+
+CREATE TABLE IF NOT EXISTS ga4_daily_facts (
+    id BIGSERIAL PRIMARY KEY,
+    property_id TEXT NOT NULL,
+    date DATE NOT NULL,
+    section TEXT NOT NULL,  -- summary / pages / traffic_sources
+    data JSONB NOT NULL,
+    created_at TIMESTAMP DEFAULT NOW(),
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+-- Property × 날짜 × 섹션당 한 행 (upsert 기준)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_ga4_daily_facts_key
+ON ga4_daily_facts(property_id, date, section);
+
+-- 코멘트 추가
+COMMENT ON TABLE ga4_daily_facts IS 'Property별 GA4 일자별 팩트 (롤업 원천 데이터)';
+COMMENT ON COLUMN ga4_daily_facts.property_id IS 'GA4 Property ID';
+COMMENT ON COLUMN ga4_daily_facts.date IS '데이터 날짜';
+COMMENT ON COLUMN ga4_daily_facts.section IS '섹션 이름 (summary, pages, traffic_sources)';
+COMMENT ON COLUMN ga4_daily_facts.data IS '해당 날짜의 섹션 데이터 (summary는 객체, 나머지는 행 배열)';
@@ -0,0 +1,39 @@
+-- GA4 동기화 작업 테이블 생성
+-- 동기화 API는 작업을 큐에 넣고 job ID를 바로 반환, 진행 상황은 이 테이블로 조회
+
+CREATE TABLE IF NOT EXISTS ga4_sync_jobs (
+    id BIGSERIAL PRIMARY KEY,
+    user_id BIGINT REFERENCES users(id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,                      -- full / incremental / backfill
+    status TEXT NOT NULL DEFAULT 'queued',   -- queued / running / succeeded / failed
+    params JSONB DEFAULT '{}'::jsonb,
+    dedup_key TEXT,                          -- 사용자·종류·정규화된 인자 (중복 작업 판별)
+    worker TEXT,                             -- 작업을 실행하는 프로세스 (호스트:PID)
+    progress JSONB DEFAULT '{}'::jsonb,
+    result JSONB,
+    error TEXT,
+    created_at TIMESTAMP DEFAULT NOW(),
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT NOW()       -- 하트비트 (임대 만료 판별)
+);
+
+-- 인덱스 생성 (사용자별 최근 작업 / 미완료 작업 조회)
+CREATE INDEX IF NOT EXISTS idx_ga4_sync_jobs_user_id ON ga4_sync_jobs(user_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_ga4_sync_jobs_status ON ga4_sync_jobs(status)
+WHERE status IN ('queued', 'running');
+
+-- 같은 작업은 동시에 하나만 대기/실행 (여러 프로세스가 동시에 등록해도 하나만 성공)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_ga4_sync_jobs_active_key ON ga4_sync_jobs(dedup_key)
+WHERE status IN ('queued', 'running');
+
+-- 코멘트 추가
+COMMENT ON TABLE ga4_sync_jobs IS '백그라운드 GA4 동기화 작업';
+COMMENT ON COLUMN ga4_sync_jobs.kind IS '작업 종류 (full: 전체 동기화, incremental: 증분 동기화, backfill: 과거 데이터 백필)';
+COMMENT ON COLUMN ga4_sync_jobs.dedup_key IS '중복 작업 판별 키 (user_id, kind, 기본값을 채운 days/compare/sections)';
+COMMENT ON COLUMN ga4_sync_jobs.worker IS '작업을 등록·실행하는 프로세스 (호스트:PID)';
+COMMENT ON COLUMN ga4_sync_jobs.updated_at IS '마지막 하트비트 - SYNC_JOB_LEASE초 넘게 갱신되지 않은 queued/running 작업은 failed로 처리';
+COMMENT ON COLUMN ga4_sync_jobs.status IS '상태 (queued, running, succeeded, failed)';
+COMMENT ON COLUMN ga4_sync_jobs.params IS '요청 인자 (days, compare 등)';
+COMMENT ON COLUMN ga4_sync_jobs.progress IS '진행 상황 (완료 섹션 수, 마지막 섹션)';
+COMMENT ON COLUMN ga4_sync_jobs.result IS '동기화 결과 (GA4Service 반환값)';
@@ -0,0 +1,24 @@
+-- GA4 요약 테이블 생성
+-- 사용자별 최신 스냅샷의 요약만 저장 (요약 API / 챗봇 컨텍스트가 raw_data 전체를 읽지 않도록)
+
+CREATE TABLE IF NOT EXISTS ga4_summaries (
+    user_id BIGINT PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    date DATE NOT NULL,                 -- 원본 ga4_data 날짜
+    date_range JSONB NOT NULL,
+    summary JSONB DEFAULT '{}'::jsonb,
+    comparison JSONB,                   -- {"date_range": ..., "summary": ...} (비교 기간 추출 시)
+    top_pages JSONB DEFAULT '[]'::jsonb,
+    traffic_sources JSONB DEFAULT '[]'::jsonb,
+    approximate JSONB DEFAULT '[]'::jsonb,  -- 근사치 지표 (일자별 롤업의 합산 사용자 수 등)
+    windows JSONB DEFAULT '{}'::jsonb,      -- 기간별 롤업 요약 {"7": {"date_range", "summary"}, ...}
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+-- 코멘트 추가
+COMMENT ON TABLE ga4_summaries IS '사용자별 최신 GA4 스냅샷 요약 (save_ga4_data 시 갱신)';
+COMMENT ON COLUMN ga4_summaries.date_range IS '분석 기간 (raw_data.info.date_range)';
+COMMENT ON COLUMN ga4_summaries.comparison IS '이전 기간 요약 (raw_data.comparison의 date_range, summary)';
+COMMENT ON COLUMN ga4_summaries.top_pages IS '인기 페이지 상위 5개';
+COMMENT ON COLUMN ga4_summaries.traffic_sources IS '주요 유입경로 상위 5개';
+COMMENT ON COLUMN ga4_summaries.windows IS '일자별 팩트의 기간별(7/30/90일) 요약 (증분 동기화 때 갱신, 챗봇이 팩트를 다시 읽지 않도록)';
+COMMENT ON COLUMN ga4_summaries.approximate IS '근사치 지표 이름 (raw_data.info.approximate, 롤업으로 갱신한 요약의 activeUsers 등)';
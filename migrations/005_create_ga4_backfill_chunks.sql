@@ -0,0 +1,23 @@
+-- GA4 과거 데이터 백필 체크포인트 테이블 생성
+-- 백필 기간을 날짜 구간(chunk)으로 나눠 구간별 완료 여부를 기록 (중단 시 완료 구간은 건너뛰고 재개)
+
+CREATE TABLE IF NOT EXISTS ga4_backfill_chunks (
+    id BIGSERIAL PRIMARY KEY,
+    property_id TEXT NOT NULL,
+    start_date DATE NOT NULL,
+    end_date DATE NOT NULL,
+    status TEXT NOT NULL DEFAULT 'running',  -- running / done / failed
+    days_added INTEGER DEFAULT 0,
+    api_calls INTEGER DEFAULT 0,
+    error TEXT,
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+-- Property × 구간당 한 행 (upsert 기준)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_ga4_backfill_chunks_key
+ON ga4_backfill_chunks(property_id, start_date, end_date);
+
+-- 코멘트 추가
+COMMENT ON TABLE ga4_backfill_chunks IS 'GA4 백필 구간별 진행 상황 (ga4_daily_facts 적재 체크포인트)';
+COMMENT ON COLUMN ga4_backfill_chunks.status IS '상태 (running, done, failed)';
+COMMENT ON COLUMN ga4_backfill_chunks.days_added IS '이 구간에서 저장한 날짜 수';
@@ -5,8 +5,10 @@ AI 챗봇 서비스
 import anthropic
 from typing import Dict, List, Optional
 from database.supabase_client import db
+from services.ga4_service import GA4Service
 from config.settings import get_config
 from utils.logger import app_logger, error_logger
+from utils.single_flight import single_flight
 
 config = get_config()
 
@@ -23,7 +25,14 @@ class ChatService:
         - 사용자의 비즈니스 정보
         - GA4 데이터 요약
         - KPI 및 목표
+
+        같은 사용자의 요청이 동시에 들어오면 한 번만 만들고 결과를 공유
         """
+        return single_flight.do(("chat_context", user_id), ChatService._build_context, user_id)
+
+    @staticmethod
+    def _build_context(user_id: int) -> Optional[str]:
+        """build_context 본체"""
         try:
             # 사용자 프로필 조회
             user = db.get_user_by_id(user_id)
@@ -32,13 +41,26 @@ class ChatService:
 
             user_context = user.get("user_context") or {}
 
-            # GA4 데이터 조회
-            ga4_data = db.get_latest_ga4_data(user_id)
-            if not ga4_data:
+            # GA4 데이터 조회 (요약 행만 읽음 - raw_data / 일자별 팩트는 읽지 않음)
+            # 증분 동기화 때 기간별 롤업 요약(windows)도 함께 갱신됨
+            record = GA4Service.get_summary_record(user_id)
+            if not record:
                 return "사용자의 GA4 데이터가 없습니다. 먼저 데이터 동기화를 진행하세요."
+            raw_data = {
+                "info": {
+                    "date_range": record["date_range"],
+                    "approximate": record.get("approximate") or []
+                },
+                "summary": record.get("summary") or {},
+                "comparison": record.get("comparison"),
+                "pages": record.get("top_pages") or [],
+                "traffic_sources": record.get("traffic_sources") or []
+            }
+            windows = {int(days): window for days, window in (record.get("windows") or {}).items()}
 
-            raw_data = ga4_data["raw_data"]
             summary = raw_data.get("summary", {})
+            # 롤업의 사용자 수는 일자별 합산 근사치
+            approx = "약 " if "activeUsers" in raw_data["info"].get("approximate", []) else ""
 
             # 컨텍스트 구성
             context = f"""
@@ -66,13 +88,13 @@ class ChatService:
 {raw_data['info']['date_range']['start']} ~ {raw_data['info']['date_range']['end']}
 
 [핵심 지표 요약]
-- 활성 사용자: {summary.get('activeUsers', 0):,}명
+- 활성 사용자: {approx}{summary.get('activeUsers', 0):,.0f}명
 - 세션: {summary.get('sessions', 0):,}개
 - 페이지뷰: {summary.get('screenPageViews', 0):,}회
 - 총 수익: ₩{summary.get('purchaseRevenue', 0):,.0f}
 - 거래 수: {summary.get('transactions', 0):,.0f}건
 - 이탈률: {summary.get('bounceRate', 0):.2%}
-
+{ChatService._format_windows(windows)}{ChatService._format_comparison(summary, raw_data.get('comparison'))}
 [인기 페이지 상위 5개]
 {ChatService._format_pages(raw_data.get('pages', [])[:5])}
 
@@ -89,6 +111,46 @@ class ChatService:
             error_logger.error(f"Error building context: {e}")
             return None
 
+    @staticmethod
+    def _format_windows(windows: Dict[int, Dict]) -> str:
+        """기간별(7/30/90일) 핵심 지표 포맷팅 (요약 행에 기간별 요약이 없으면 빈 문자열)"""
+        if not windows:
+            return ""
+
+        result = ["\n[기간별 추이]"]
+        for days, window in sorted(windows.items()):
+            summary = window.get("summary", {})
+            result.append(
+                f"- 최근 {days}일: 사용자 약 {summary.get('activeUsers', 0):,.0f}명, "
+                f"세션 {summary.get('sessions', 0):,.0f}개, "
+                f"페이지뷰 {summary.get('screenPageViews', 0):,.0f}회, "
+                f"수익 ₩{summary.get('purchaseRevenue', 0):,.0f}"
+            )
+        return "\n".join(result) + "\n"
+
+    @staticmethod
+    def _format_comparison(summary: Dict, comparison: Optional[Dict]) -> str:
+        """이전 기간 대비 증감 포맷팅 (비교 데이터가 없으면 빈 문자열)"""
+        if not comparison:
+            return ""
+
+        previous = comparison.get("summary", {})
+        date_range = comparison.get("date_range", {})
+        result = [f"\n[이전 기간 대비] ({date_range.get('start')} ~ {date_range.get('end')})"]
+
+        labels = [
+            ("activeUsers", "활성 사용자"),
+            ("sessions", "세션"),
+            ("screenPageViews", "페이지뷰"),
+            ("purchaseRevenue", "총 수익"),
+            ("transactions", "거래 수"),
+        ]
+        for metric, label in labels:
+            current, before = summary.get(metric, 0), previous.get(metric, 0)
+            change = f"{(current - before) / before:+.1%}" if before else "이전 데이터 없음"
+            result.append(f"- {label}: {before:,.0f} → {current:,.0f} ({change})")
+        return "\n".join(result) + "\n"
+
     @staticmethod
     def _format_pages(pages: List[Dict]) -> str:
         """페이지 데이터 포맷팅"""
@@ -2,12 +2,17 @@
 GA4 데이터 동기화 서비스
 사용자별 GA4 데이터 추출 및 증분 업데이트
 """
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+import time
+from typing import Dict, Iterator, List, Optional
 from database.supabase_client import db, supabase
 from ga4_extractor_template import GA4TemplateExtractor
+from ga4_config import DAILY_FACTS
+from services.rollup_service import RollupService
 from config.settings import get_config
 from utils.logger import app_logger, error_logger
+from utils.single_flight import single_flight
 
 config = get_config()
 
@@ -15,69 +20,220 @@ class GA4Service:
     """GA4 데이터 관리 서비스"""
 
     @staticmethod
-    def sync_user_data(user_id: int, days: int = None) -> Dict:
+    def sync_user_data(user_id: int, days: int = None, compare: bool = None,
+                       sections: List[str] = None) -> Dict:
         """
-        사용자의 GA4 데이터 동기화 (전체)
+        사용자의 GA4 데이터 동기화 (전체 또는 일부 섹션)
 
         Args:
             user_id: 사용자 ID
-            days: 조회할 일수 (기본값: 설정파일)
+            days: 조회할 일수 (기본값: 설정파일, 부분 갱신은 항상 저장된 스냅샷 기간)
+            compare: 이전 기간 비교 데이터 포함 여부 (추가 API 호출 없음, 기본값: 설정파일,
+                     부분 갱신은 항상 저장된 스냅샷 기준)
+            sections: 갱신할 섹션 결과 키 리스트 (예: ["traffic_sources"])
+                      지정하면 그 섹션만 추출해 최근 스냅샷에 합침
 
         Returns:
             {"success": bool, "data_id": int, "message": str}
+
+        같은 사용자·같은 인자로 동시에 호출되면 한 번만 추출하고 결과를 공유
+        (stream_user_data와 같은 실행을 공유)
+        """
+        result = {"success": False, "message": "동기화 결과 없음"}
+        for event in GA4Service.stream_user_data(user_id, days, compare, sections):
+            if event["event"] in ("done", "error"):
+                result = {k: v for k, v in event.items() if k != "event"}
+        return result
+
+    @staticmethod
+    def stream_user_data(user_id: int, days: int = None, compare: bool = None,
+                         sections: List[str] = None) -> Iterator[Dict]:
+        """
+        사용자의 GA4 데이터 동기화 (섹션이 끝나는 대로 진행 이벤트 반환)
+
+        끝난 섹션은 바로 ga4_data에 저장 (info.partial=True 인 부분 스냅샷)
+        저장 간격은 GA4_STREAM_SAVE_INTERVAL초 이상, 첫 섹션과 마지막은 항상 저장
+        같은 날짜의 완전한 스냅샷이 이미 있으면 덮어쓰지 않도록 중간 저장은 생략하고,
+        끝까지 저장하지 못하면(오류/중단) 중간 저장한 행은 삭제
+
+        sections를 지정하면 그 섹션만 추출해 최근 스냅샷 행에 합쳐 저장
+        (나머지 섹션은 그대로, 기간/비교 여부는 days/compare 인자와 상관없이 스냅샷 기준)
+
+        Yields:
+            {"event": "start", "property_id": str, "date_range": str}
+            {"event": "section", "section": str, "completed": int, "saved": bool}
+            {"event": "done", "success": True, ...sync_user_data 반환값}
+            {"event": "error", "success": False, "message": str}
+
+        같은 사용자·같은 인자의 동기화(sync_user_data, 작업 큐, 스트리밍 API)가 이미
+        진행 중이면 새로 추출하지 않고 그 동기화의 마지막 이벤트(done/error)만 반환
         """
+        if sections is None:
+            days = days or config.GA4_DEFAULT_DAYS
+        return single_flight.stream(
+            ("ga4_sync", user_id, days, compare, tuple(sorted(sections)) if sections else None),
+            GA4Service._stream_user_data, user_id, days, compare, sections
+        )
+
+    @staticmethod
+    def _stream_user_data(user_id: int, days: Optional[int], compare: Optional[bool],
+                          sections: Optional[List[str]]) -> Iterator[Dict]:
+        """stream_user_data 본체"""
+        partial_id = None  # 중간 저장한 행 ID (최종 저장 전에 끝나면 삭제)
         try:
             # 사용자의 GA4 계정 정보 조회
             ga4_account = db.get_ga4_account(user_id)
             if not ga4_account:
-                return {"success": False, "message": "GA4 계정 정보가 없습니다"}
+                yield {"event": "error", "success": False, "message": "GA4 계정 정보가 없습니다"}
+                return
 
             property_id = ga4_account["property_id"]
             credentials = ga4_account.get("credentials") or config.GA4_CREDENTIALS_PATH
-            days = days or config.GA4_DEFAULT_DAYS
 
-            # GA4 데이터 추출
-            extractor = GA4TemplateExtractor(property_id, credentials)
-            all_data = extractor.extract_data(days)
+            # 부분 갱신: 최근 스냅샷에 합침 (스냅샷이 없으면 새로 저장)
+            # 다른 기간/비교 여부의 섹션이 섞이지 않도록 인자와 상관없이 스냅샷 기준으로 추출
+            snapshot = db.get_latest_ga4_data(user_id) if sections else None
+            if snapshot:
+                stored_range = snapshot["raw_data"]["info"]["date_range"]
+                days = stored_range["days"]
+                compare = "compare" in stored_range
+            days = days or config.GA4_DEFAULT_DAYS
 
-            # Supabase에 저장 (날짜별)
             end_date = datetime.now().date()
             start_date = end_date - timedelta(days=days)
+            save_date = snapshot["date"] if snapshot else str(end_date)
+
+            # 중간 저장 여부 (부분 갱신은 스냅샷에 합친 뒤 마지막에 한 번만 저장,
+            # 오늘 날짜의 완전한 스냅샷이 있으면 끝날 때까지 그대로 둠)
+            existing = None if snapshot else db.get_ga4_data_by_date(user_id, save_date)
+            save_partial = not snapshot and (
+                existing is None or existing["raw_data"].get("info", {}).get("partial")
+            )
+            yield {
+                "event": "start",
+                "property_id": property_id,
+                "date_range": f"{start_date} ~ {end_date}"
+            }
 
-            # 전체 데이터를 최신 날짜로 저장
-            result = db.save_ga4_data(user_id, str(end_date), all_data)
+            # GA4 데이터 추출 (섹션 완료 순서)
+            extractor = GA4TemplateExtractor(property_id, credentials)
+            all_data = {}
+            completed = 0
+            last_saved = None
+
+            for key, data in extractor.extract_data_iter(days, compare, sections):
+                all_data[key] = data
+                if key == "info":
+                    continue
+
+                completed += 1
+                saved = False
+                now = time.monotonic()
+                if save_partial and (
+                    last_saved is None or now - last_saved >= config.GA4_STREAM_SAVE_INTERVAL
+                ):
+                    # 전체 데이터를 최신 날짜로 저장 (부분 스냅샷)
+                    partial = {**all_data, "info": {**all_data["info"], "partial": True}}
+                    row = db.save_ga4_data(user_id, save_date, partial)
+                    saved = row is not None
+                    if saved:
+                        partial_id = row.get("id")
+                    last_saved = now
+
+                yield {"event": "section", "section": key, "completed": completed, "saved": saved}
+
+            if snapshot:
+                all_data = GA4Service._merge_sections(snapshot["raw_data"], all_data)
+            result = db.save_ga4_data(user_id, save_date, all_data)
 
             if result:
+                partial_id = None
                 app_logger.info(
                     f"GA4 data synced: user_id={user_id}, property_id={property_id}, "
-                    f"days={days}, api_calls={all_data['info']['api_calls']}"
+                    f"days={days}, sections={sections or 'all'}, "
+                    f"api_calls={extractor.api_calls}"
                 )
 
-                return {
+                yield {
+                    "event": "done",
                     "success": True,
                     "data_id": result.get("id"),
                     "property_id": property_id,
                     "date_range": f"{start_date} ~ {end_date}",
                     "summary": all_data.get("summary", {}),
-                    "api_calls": all_data["info"]["api_calls"]
+                    "comparison_summary": all_data.get("comparison", {}).get("summary"),
+                    "sections": sections,
+                    "api_calls": extractor.api_calls
                 }
             else:
-                return {"success": False, "message": "데이터 저장 실패"}
+                yield {"event": "error", "success": False, "message": "데이터 저장 실패"}
 
         except Exception as e:
             error_logger.error(f"Error in sync_user_data: {e}")
-            return {"success": False, "message": str(e)}
+            yield {"event": "error", "success": False, "message": str(e)}
+
+        finally:
+            # 완료되지 못한 부분 스냅샷은 남기지 않음 (다음 동기화/부분 갱신의 기준이 되지 않도록)
+            if partial_id is not None:
+                db.delete_ga4_data([partial_id])
+                app_logger.warning(f"Discarded partial GA4 data: user_id={user_id}, id={partial_id}")
+
+    @staticmethod
+    def unknown_sections(sections: List[str]) -> List[str]:
+        """부분 갱신에 지정할 수 없는 섹션 키 (GA4TemplateExtractor.SECTIONS 결과 키 기준)"""
+        known = {key for key, _, _, _ in GA4TemplateExtractor.SECTIONS}
+        return [section for section in sections if section not in known]
+
+    @staticmethod
+    def _merge_sections(stored: Dict, refreshed: Dict) -> Dict:
+        """
+        부분 추출 결과를 저장된 스냅샷에 합침
+
+        - 다시 받은 섹션(과 퍼널)만 교체, 나머지 섹션은 그대로
+        - 비교 기간도 다시 받은 섹션만 교체
+        - info는 스냅샷 것을 유지하고 info["refreshed"][섹션]에 갱신 정보 기록
+        """
+        refreshed_info = refreshed["info"]
+        merged = {**stored}
+        for key, value in refreshed.items():
+            if key == "comparison":
+                merged[key] = {**stored.get(key, {}), **value}
+            elif key != "info":
+                merged[key] = value
+
+        update = {
+            "extracted_at": refreshed_info["extracted_at"],
+            "date_range": refreshed_info["date_range"],
+            "api_calls": refreshed_info["api_calls"],
+            "errors": refreshed_info["errors"],
+        }
+        merged["info"] = {
+            **stored["info"],
+            "refreshed": {
+                **stored["info"].get("refreshed", {}),
+                **{key: update for key in refreshed_info.get("sections", [])}
+            }
+        }
+        return merged
 
     @staticmethod
     def sync_incremental(user_id: int) -> Dict:
         """
-        증분 데이터 동기화 (이전 날짜만 추가)
-        - 기존 데이터의 마지막 날짜 이후 데이터만 가져옴
-        - API 호출 최소화
+        증분 데이터 동기화 (저장되지 않은 날짜만 추가)
+        - 일자별 팩트(ga4_daily_facts)에 없는 날짜만 GA4에서 가져옴
+        - 지난 날짜는 GA4에서 바뀌지 않으므로 매일 밤에는 어제 하루만 추가됨
+        - 오늘은 집계가 끝나지 않았으므로 저장하지 않음
 
         Returns:
             {"success": bool, "days_added": int, "message": str}
         """
+        return single_flight.do(
+            ("ga4_incremental", user_id), GA4Service._sync_incremental, user_id
+        )
+
+    @staticmethod
+    def _sync_incremental(user_id: int) -> Dict:
+        """sync_incremental 본체"""
         try:
             # 사용자의 GA4 계정 정보 조회
             ga4_account = db.get_ga4_account(user_id)
@@ -86,77 +242,352 @@ class GA4Service:
 
             property_id = ga4_account["property_id"]
             credentials = ga4_account.get("credentials") or config.GA4_CREDENTIALS_PATH
+            result = GA4Service.sync_property_incremental(property_id, credentials)
 
-            # 최근 데이터 조회
-            latest_data = db.get_latest_ga4_data(user_id)
+            if result.get("days_added"):
+                GA4Service.refresh_summaries(property_id, [user_id])
+                app_logger.info(
+                    f"Incremental sync completed: user_id={user_id}, property_id={property_id}, "
+                    f"days_added={result['days_added']}, api_calls={result['api_calls']}"
+                )
+            return result
 
-            if latest_data:
-                # 마지막 동기화 날짜 확인
-                last_sync_date = datetime.strptime(latest_data["date"], "%Y-%m-%d").date()
-                today = datetime.now().date()
+        except Exception as e:
+            error_logger.error(f"Error in sync_incremental: {e}")
+            return {"success": False, "message": str(e)}
 
-                # 동기화할 일수 계산
-                days_to_sync = (today - last_sync_date).days
+    @staticmethod
+    def sync_property_incremental(property_id: str, credentials: str = None) -> Dict:
+        """
+        Property 단위 증분 동기화 (sync_incremental 참고)
 
-                if days_to_sync <= 0:
-                    return {
-                        "success": True,
-                        "days_added": 0,
-                        "message": "이미 최신 데이터입니다"
-                    }
-            else:
-                # 최초 동기화
-                days_to_sync = config.GA4_DEFAULT_DAYS
+        일자별 팩트는 Property별로 저장되므로 같은 Property를 쓰는 사용자는
+        한 번의 추출 결과를 함께 사용 (동시 호출도 하나로 합침)
 
-            # 데이터 추출 (최소 일수만)
-            extractor = GA4TemplateExtractor(property_id, credentials)
-            all_data = extractor.extract_data(days_to_sync)
+        Returns:
+            {"success": bool, "days_added": int, "message": str}
+        """
+        credentials = credentials or config.GA4_CREDENTIALS_PATH
+        return single_flight.do(
+            ("ga4_property_incremental", property_id, credentials),
+            GA4Service._sync_property_incremental, property_id, credentials
+        )
 
-            # 저장
-            today = datetime.now().date()
-            result = db.save_ga4_data(user_id, str(today), all_data)
+    @staticmethod
+    def _sync_property_incremental(property_id: str, credentials: str) -> Dict:
+        """sync_property_incremental 본체"""
+        try:
 
-            if result:
-                app_logger.info(
-                    f"Incremental sync completed: user_id={user_id}, days_added={days_to_sync}"
-                )
+            # 롤업에 필요한 기간 중 비어 있는 날짜 확인
+            start_date, end_date = GA4Service._fact_window()
+            stored = db.get_daily_fact_dates(property_id, str(start_date), str(end_date))
+            missing = [
+                str(start_date + timedelta(days=i))
+                for i in range((end_date - start_date).days + 1)
+                if str(start_date + timedelta(days=i)) not in stored
+            ]
 
+            if not missing:
                 return {
                     "success": True,
-                    "days_added": days_to_sync,
-                    "data_id": result.get("id"),
-                    "message": f"{days_to_sync}일간의 데이터 추가됨"
+                    "days_added": 0,
+                    "message": "이미 최신 데이터입니다"
+                }
+
+            # 비어 있는 날짜 구간만 추출 (중간에 저장된 날짜는 다시 쓰지 않음)
+            extractor = GA4TemplateExtractor(property_id, credentials)
+            facts = extractor.extract_daily(missing[0], missing[-1])
+            if facts is None:
+                return {"success": False, "message": "일자별 데이터 추출 실패"}
+
+            facts = {date: facts[date] for date in missing if date in facts}
+            days_added = db.save_daily_facts(property_id, facts)
+
+            if days_added:
+                return {
+                    "success": True,
+                    "days_added": days_added,
+                    "date_range": f"{missing[0]} ~ {missing[-1]}",
+                    "api_calls": extractor.api_calls,
+                    "message": f"{days_added}일간의 데이터 추가됨"
                 }
             else:
                 return {"success": False, "message": "데이터 저장 실패"}
 
         except Exception as e:
-            error_logger.error(f"Error in sync_incremental: {e}")
+            error_logger.error(f"Error in sync_property_incremental: {e}")
+            return {"success": False, "message": str(e)}
+
+    @staticmethod
+    def backfill(user_id: int, days: int = 365, chunk_days: int = None, workers: int = None) -> Dict:
+        """
+        과거 데이터 백필 (일자별 팩트)
+
+        - 기간을 chunk_days일 구간으로 나눠 구간마다 extract_daily → save_daily_facts
+        - 구간은 workers개씩 동시에 추출 (GA4 쿼터는 공유 속도 제한기가 조절)
+        - 끝난 구간은 ga4_backfill_chunks에 기록해 중단 후 다시 호출하면 남은 구간만 추출
+        - 구간 경계는 날짜 기준으로 고정되어 다른 날 재개해도 같은 구간을 가리킴
+
+        Args:
+            user_id: 사용자 ID
+            days: 어제부터 거슬러 올라갈 일수
+            chunk_days: 구간 크기 (기본값: DAILY_FACTS["backfill_chunk_days"])
+            workers: 동시 추출 구간 수 (기본값: DAILY_FACTS["backfill_workers"])
+
+        Returns:
+            {"success": bool, "chunks": int, "skipped": int, "completed": int,
+             "failed": int, "days_added": int, "api_calls": int, "date_range": str}
+        """
+        ga4_account = db.get_ga4_account(user_id)
+        if not ga4_account:
+            return {"success": False, "message": "GA4 계정 정보가 없습니다"}
+
+        property_id = ga4_account["property_id"]
+        credentials = ga4_account.get("credentials") or config.GA4_CREDENTIALS_PATH
+        return single_flight.do(
+            ("ga4_backfill", property_id, credentials, days),
+            GA4Service._backfill, property_id, credentials, days,
+            chunk_days or DAILY_FACTS["backfill_chunk_days"],
+            workers or DAILY_FACTS["backfill_workers"]
+        )
+
+    @staticmethod
+    def _backfill(property_id: str, credentials: str, days: int,
+                  chunk_days: int, workers: int) -> Dict:
+        """backfill 본체 (Property 단위)"""
+        try:
+            end_date = datetime.now().date() - timedelta(days=1)
+            start_date = end_date - timedelta(days=days - 1)
+            chunks = GA4Service._backfill_chunks(start_date, end_date, chunk_days)
+
+            # 완료된 구간 건너뛰기 (체크포인트가 구간을 포함하면 완료)
+            done = [
+                (row["start_date"], row["end_date"])
+                for row in db.get_backfill_chunks(property_id, str(start_date), str(end_date))
+                if row["status"] == "done"
+            ]
+            pending = [
+                (chunk_start, chunk_end) for chunk_start, chunk_end in chunks
+                if not any(s <= chunk_start and chunk_end <= e for s, e in done)
+            ]
+
+            app_logger.info(
+                f"Backfill started: property_id={property_id}, {start_date} ~ {end_date}, "
+                f"chunks={len(chunks)}, pending={len(pending)}"
+            )
+
+            results = []
+            if pending:
+                with ThreadPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+                    results = list(pool.map(
+                        lambda chunk: GA4Service._backfill_chunk(property_id, credentials, *chunk),
+                        pending
+                    ))
+
+            failed = sum(1 for result in results if not result["success"])
+            days_added = sum(result["days_added"] for result in results)
+            api_calls = sum(result["api_calls"] for result in results)
+
+            app_logger.info(
+                f"Backfill finished: property_id={property_id}, completed={len(results) - failed}, "
+                f"failed={failed}, days_added={days_added}, api_calls={api_calls}"
+            )
+
+            return {
+                "success": failed == 0,
+                "chunks": len(chunks),
+                "skipped": len(chunks) - len(pending),
+                "completed": len(results) - failed,
+                "failed": failed,
+                "days_added": days_added,
+                "api_calls": api_calls,
+                "date_range": f"{start_date} ~ {end_date}",
+                "message": f"{failed}개 구간 실패 - 다시 호출하면 실패한 구간만 재시도"
+                           if failed else f"{days_added}일간의 데이터 추가됨"
+            }
+
+        except Exception as e:
+            error_logger.error(f"Error in backfill: {e}")
             return {"success": False, "message": str(e)}
 
+    @staticmethod
+    def _backfill_chunks(start_date, end_date, chunk_days: int) -> List[tuple]:
+        """
+        기간을 고정 경계 구간으로 분할 (최근 구간부터)
+
+        경계는 기준일(1970-01-01)부터 chunk_days 단위이며 기간 양 끝 구간은 잘라냄
+
+        Returns:
+            [("YYYY-MM-DD", "YYYY-MM-DD")]
+        """
+        epoch = datetime(1970, 1, 1).date()
+        chunks = []
+        chunk_end = end_date
+        while chunk_end >= start_date:
+            offset = (chunk_end - epoch).days % chunk_days
+            chunk_start = max(chunk_end - timedelta(days=offset), start_date)
+            chunks.append((str(chunk_start), str(chunk_end)))
+            chunk_end = chunk_start - timedelta(days=1)
+        return chunks
+
+    @staticmethod
+    def _backfill_chunk(property_id: str, credentials: str, start_date: str, end_date: str) -> Dict:
+        """백필 구간 하나 추출 + 저장 + 체크포인트 기록"""
+        db.save_backfill_chunk(property_id, start_date, end_date, {"status": "running", "error": None})
+
+        # 구간마다 별도 추출기 (호출/에러 카운터가 구간별로 분리됨)
+        extractor = GA4TemplateExtractor(property_id, credentials)
+        try:
+            facts = extractor.extract_daily(start_date, end_date)
+            if facts is None:
+                raise RuntimeError("; ".join(extractor.errors[:3]) or "일자별 데이터 추출 실패")
+
+            days_added = db.save_daily_facts(property_id, facts)
+            if facts and not days_added:
+                raise RuntimeError("데이터 저장 실패")
+
+            db.save_backfill_chunk(property_id, start_date, end_date, {
+                "status": "done",
+                "days_added": days_added,
+                "api_calls": extractor.api_calls
+            })
+            return {"success": True, "days_added": days_added, "api_calls": extractor.api_calls}
+
+        except Exception as e:
+            error_logger.error(f"Backfill chunk failed: property_id={property_id}, {start_date} ~ {end_date}: {e}")
+            db.save_backfill_chunk(property_id, start_date, end_date, {
+                "status": "failed",
+                "api_calls": extractor.api_calls,
+                "error": str(e)[:500]
+            })
+            return {"success": False, "days_added": 0, "api_calls": extractor.api_calls}
+
+    @staticmethod
+    def get_rollups(user_id: int) -> Dict[int, Dict]:
+        """
+        저장된 일자별 팩트로 기간별(7/30/90일) 집계 생성
+
+        Returns:
+            {기간(일): 집계} (저장된 팩트가 없으면 빈 dict)
+        """
+        try:
+            property_id = GA4Service.get_property_id(user_id)
+            if not property_id:
+                return {}
+
+            start_date, end_date = GA4Service._fact_window()
+            facts = db.get_daily_facts(property_id, str(start_date), str(end_date))
+            if not facts:
+                return {}
+
+            return RollupService.build_windows(property_id, facts, str(end_date))
+
+        except Exception as e:
+            error_logger.error(f"Error in get_rollups: {e}")
+            return {}
+
+    @staticmethod
+    def refresh_summaries(property_id: str, user_ids: List[int]) -> int:
+        """
+        일자별 팩트 롤업으로 사용자 요약 행(ga4_summaries) 갱신
+
+        증분 동기화는 ga4_data 스냅샷을 만들지 않으므로 팩트가 추가되면
+        요약 API / 챗봇 요약이 오래된 스냅샷에 머물지 않도록 기본 기간 롤업으로 교체
+        - 요약 행의 기간이 롤업 마지막 날짜 이후까지 포함하면 (더 최근 전체 동기화) 그대로 둠
+        - 롤업의 사용자 수는 합산 근사치이므로 approximate에 기록
+        - 기간별(DAILY_FACTS["windows"]) 요약은 항상 windows에 저장 (챗봇 컨텍스트용)
+
+        Returns:
+            갱신된 사용자 수
+        """
+        try:
+            start_date, end_date = GA4Service._fact_window()
+            facts = db.get_daily_facts(property_id, str(start_date), str(end_date))
+            if not facts:
+                return 0
+
+            views = RollupService.build_windows(
+                property_id, facts, str(end_date),
+                sorted(set(DAILY_FACTS["windows"]) | {config.GA4_DEFAULT_DAYS})
+            )
+            view = views[config.GA4_DEFAULT_DAYS]
+            windows = {
+                str(days): {"date_range": views[days]["info"]["date_range"],
+                            "summary": views[days]["summary"]}
+                for days in DAILY_FACTS["windows"]
+            }
+
+            refreshed = 0
+            for user_id in user_ids:
+                record = db.get_ga4_summary(user_id)
+                if record and record["date_range"]["end"] >= str(end_date):
+                    db.save_ga4_summary_windows(user_id, windows)
+                    continue
+                if db.save_ga4_summary(user_id, str(end_date), view, windows):
+                    refreshed += 1
+            return refreshed
+
+        except Exception as e:
+            error_logger.error(f"Error in refresh_summaries: {e}")
+            return 0
+
+    @staticmethod
+    def _fact_window():
+        """일자별 팩트 유지 기간 (가장 긴 롤업 기간, 어제까지)"""
+        end_date = datetime.now().date() - timedelta(days=1)
+        start_date = end_date - timedelta(days=max(DAILY_FACTS["windows"]) - 1)
+        return start_date, end_date
+
     @staticmethod
     def get_user_ga4_summary(user_id: int) -> Optional[Dict]:
-        """사용자의 GA4 데이터 요약 조회"""
+        """
+        사용자의 GA4 데이터 요약 조회
+
+        ga4_summaries 행만 읽음 (요약 행이 없는 기존 사용자는
+        최근 스냅샷에서 한 번 만들어 저장)
+        """
         try:
-            latest_data = db.get_latest_ga4_data(user_id)
+            record = GA4Service.get_summary_record(user_id)
 
-            if not latest_data:
+            if not record:
                 return None
 
-            raw_data = latest_data["raw_data"]
-
             return {
-                "date_range": raw_data["info"]["date_range"],
-                "summary": raw_data.get("summary", {}),
-                "top_pages": raw_data.get("pages", [])[:5],
-                "traffic_sources": raw_data.get("traffic_sources", [])[:5],
-                "last_updated": latest_data["created_at"]
+                "date_range": record["date_range"],
+                "summary": record.get("summary") or {},
+                "approximate": record.get("approximate") or [],
+                "top_pages": record.get("top_pages") or [],
+                "traffic_sources": record.get("traffic_sources") or [],
+                "last_updated": record["updated_at"]
             }
 
         except Exception as e:
             error_logger.error(f"Error in get_user_ga4_summary: {e}")
             return None
 
+    @staticmethod
+    def get_summary_record(user_id: int) -> Optional[Dict]:
+        """
+        사용자별 요약 행 (없으면 최근 ga4_data로 만들어 저장)
+
+        Returns:
+            {"date_range", "summary", "comparison", "top_pages", "traffic_sources",
+             "approximate", "windows", "updated_at"}
+        """
+        record = db.get_ga4_summary(user_id)
+        if record:
+            return record
+
+        latest_data = db.get_latest_ga4_data(user_id)
+        if not latest_data:
+            return None
+
+        db.save_ga4_summary(user_id, latest_data["date"], latest_data["raw_data"])
+        return {
+            **db.summary_record(latest_data["raw_data"]),
+            "updated_at": latest_data["created_at"]
+        }
+
     @staticmethod
     def get_property_id(user_id: int) -> Optional[str]:
         """사용자의 GA4 Property ID 조회"""
@@ -0,0 +1,203 @@
+"""
+동기화 작업 큐 서비스
+GA4 동기화를 백그라운드 스레드 풀에서 실행하고 상태를 ga4_sync_jobs에 기록
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+import json
+import os
+import socket
+import threading
+from database.supabase_client import db
+from services.ga4_service import GA4Service
+from config.settings import get_config
+from utils.logger import app_logger, error_logger
+
+config = get_config()
+
+# 작업 종류 (full: 전체 동기화, incremental: 증분 동기화, backfill: 과거 데이터 백필)
+JOB_KINDS = ("full", "incremental", "backfill")
+
+
+class SyncJobService:
+    """
+    동기화 작업 큐
+
+    - enqueue()는 작업을 DB에 기록하고 바로 반환 (실행은 워커 스레드)
+    - 같은 사용자·같은 종류·같은 인자(기간/비교/섹션)의 작업이 이미 대기/실행 중이면
+      새로 만들지 않고 그 작업을 반환 (다른 프로세스가 등록한 작업도 DB에서 확인)
+    - 작업 행에는 실행하는 프로세스("호스트:PID")를 worker로 기록
+    - 대기/실행 중인 작업은 SYNC_JOB_LEASE의 1/3 간격으로 updated_at을 갱신(하트비트)
+      SYNC_JOB_LEASE초 넘게 갱신되지 않은 작업은 프로세스가 사라진 것으로 보고 실패 처리
+      (호스트/PID와 관계없이 - 재배포된 컨테이너가 남긴 작업도 정리됨)
+    """
+
+    def __init__(self, workers: int = None, lease: int = None):
+        self.workers = workers or config.SYNC_JOB_WORKERS
+        self.lease = lease or config.SYNC_JOB_LEASE
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._pool = None
+        self._inflight = {}  # 중복 키 → job_id
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._heartbeat = None
+
+    def start(self):
+        """워커 풀과 하트비트 시작 (임대가 만료된 작업은 실패 처리)"""
+        if self._pool is not None:
+            return
+        stale = db.expire_sync_jobs(self.lease)
+        if stale:
+            app_logger.warning(f"Marked {stale} expired sync jobs as failed")
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="ga4-sync"
+        )
+        self._stopped.clear()
+        self._heartbeat = threading.Thread(
+            target=self._beat, name="ga4-sync-heartbeat", daemon=True
+        )
+        self._heartbeat.start()
+        app_logger.info(f"Sync job queue started - workers={self.workers}, lease={self.lease}s")
+
+    def stop(self):
+        """워커 풀 종료 (실행 중인 작업은 끝날 때까지 대기)"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        if self._heartbeat is not None:
+            self._stopped.set()
+            self._heartbeat.join()
+            self._heartbeat = None
+
+    def _beat(self):
+        """이 프로세스가 가진 작업의 updated_at 갱신 (stop() 전까지 반복)"""
+        while not self._stopped.wait(self.lease / 3):
+            with self._lock:
+                job_ids = list(self._inflight.values())
+            if job_ids:
+                db.touch_sync_jobs(job_ids)
+
+    @staticmethod
+    def dedup_key(user_id: int, kind: str, params: Dict = None) -> str:
+        """
+        중복 작업 판별 키 (기본값을 채운 인자 기준)
+
+        full: days(섹션 미지정 시 기본 기간), compare, 정렬된 sections
+        backfill: days (기본 365일) / incremental: 인자 없음
+        """
+        params = params or {}
+        normalized = {}
+        if kind == "full":
+            sections = params.get("sections")
+            days = params.get("days")
+            compare = params.get("compare")
+            normalized = {
+                "days": days or (None if sections else config.GA4_DEFAULT_DAYS),
+                "compare": None if compare is None else bool(compare),
+                "sections": sorted(sections) if sections else None,
+            }
+        elif kind == "backfill":
+            normalized = {"days": params.get("days") or 365}
+        return json.dumps({"user_id": user_id, "kind": kind, **normalized}, sort_keys=True)
+
+    def enqueue(self, user_id: int, kind: str, params: Dict = None) -> Tuple[Optional[Dict], bool]:
+        """
+        동기화 작업 등록
+
+        Args:
+            user_id: 사용자 ID
+            kind: "full" (sync_user_data) / "incremental" (sync_incremental) / "backfill" (backfill)
+            params: full 작업 인자 {"days": int, "compare": bool, "sections": [섹션 키]}
+                    backfill 작업 인자 {"days": int}
+
+        Returns:
+            (작업 정보, 기존 작업 재사용 여부) - 등록 실패 시 (None, False)
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"알 수 없는 작업 종류: {kind}")
+        self.start()
+
+        key = self.dedup_key(user_id, kind, params)
+        with self._lock:
+            job_id = self._inflight.get(key)
+            if job_id is not None:
+                return self.get_job(job_id), True
+
+            # 다른 프로세스가 등록한 같은 작업 (임대가 만료된 작업은 실패 처리 후 무시)
+            active = db.get_active_sync_job(key, self.lease)
+            if active:
+                return active, True
+
+            job = db.create_sync_job(user_id, kind, params, key, self.worker_id)
+            if not job:
+                # 동시에 등록된 같은 작업이 있으면 (dedup_key 유니크 인덱스) 그 작업 반환
+                active = db.get_active_sync_job(key, self.lease)
+                return (active, True) if active else (None, False)
+            self._inflight[key] = job["id"]
+
+        self._pool.submit(self._run, job["id"], user_id, kind, key, params or {})
+        app_logger.info(f"Sync job queued: job_id={job['id']}, user_id={user_id}, kind={kind}")
+        return job, False
+
+    def get_job(self, job_id: int) -> Optional[Dict]:
+        """작업 상태 조회"""
+        return db.get_sync_job(job_id)
+
+    def _run(self, job_id: int, user_id: int, kind: str, key: str, params: Dict):
+        """워커 스레드에서 작업 실행"""
+        db.update_sync_job(job_id, {
+            "status": "running",
+            "started_at": datetime.now().isoformat()
+        })
+
+        try:
+            if kind == "full":
+                result = self._run_full(job_id, user_id, params)
+            elif kind == "backfill":
+                result = GA4Service.backfill(user_id, params.get("days") or 365)
+            else:
+                result = GA4Service.sync_incremental(user_id)
+
+            db.update_sync_job(job_id, {
+                "status": "succeeded" if result.get("success") else "failed",
+                "result": result,
+                "error": None if result.get("success") else result.get("message"),
+                "finished_at": datetime.now().isoformat()
+            })
+
+        except Exception as e:
+            error_logger.error(f"Error in sync job {job_id}: {e}")
+            db.update_sync_job(job_id, {
+                "status": "failed",
+                "error": str(e),
+                "finished_at": datetime.now().isoformat()
+            })
+
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _run_full(self, job_id: int, user_id: int, params: Dict) -> Dict:
+        """
+        전체 동기화 (섹션이 끝날 때마다 progress 갱신)
+
+        같은 동기화가 이미 실행 중이면(스트리밍 API 등) 그 결과만 받아 기록
+        """
+        result = {"success": False, "message": "동기화 결과 없음"}
+        events = GA4Service.stream_user_data(
+            user_id, params.get("days"), params.get("compare"), params.get("sections")
+        )
+        for event in events:
+            if event["event"] == "section":
+                db.update_sync_job(job_id, {"progress": {
+                    "completed": event["completed"],
+                    "section": event["section"]
+                }})
+            elif event["event"] in ("done", "error"):
+                result = {k: v for k, v in event.items() if k != "event"}
+        return result
+
+
+# 전역 작업 큐 인스턴스
+sync_job_service = SyncJobService()
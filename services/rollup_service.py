@@ -0,0 +1,154 @@
+"""
+GA4 롤업 서비스
+저장된 일자별 팩트로 7/30/90일 등 기간별 집계 생성 (GA4 API 호출 없음)
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from ga4_config import ADDITIVE_METRICS, DAILY_FACTS, LIMITS
+
+# 세션 수로 가중 평균하는 비율/평균 지표
+WEIGHTED_METRICS = {
+    "averageSessionDuration": "sessions",
+    "bounceRate": "sessions",
+}
+
+# 날짜 간 중복 제거가 불가능해 일자별 값을 더한 근사치로 집계하는 지표
+# (실제 고유 사용자 수보다 클 수 있음 - info["approximate"]로 표시)
+APPROXIMATE_METRICS = ["activeUsers"]
+
+
+class RollupService:
+    """일자별 팩트 → 기간별 집계"""
+
+    @staticmethod
+    def build_windows(property_id: str, facts: Dict[str, Dict], end_date: str,
+                      windows: List[int] = None) -> Dict[int, Dict]:
+        """
+        end_date로 끝나는 기간별 집계
+
+        Args:
+            facts: {날짜: {섹션: 데이터}} (db.get_daily_facts 결과)
+            end_date: 마지막 날짜 (YYYY-MM-DD)
+            windows: 기간 리스트 (기본값: DAILY_FACTS["windows"])
+
+        Returns:
+            {기간(일): 집계} - 집계는 extract_data 결과와 같은 키 구조
+        """
+        end = datetime.strptime(end_date, "%Y-%m-%d").date()
+        views = {}
+        for days in windows or DAILY_FACTS["windows"]:
+            start = end - timedelta(days=days - 1)
+            views[days] = RollupService.build_view(property_id, facts, str(start), end_date)
+
+            # 직전 같은 길이 기간 (팩트가 모두 있을 때만 비교 데이터 포함)
+            comparison = RollupService.build_comparison(
+                facts, str(start - timedelta(days=days)), str(start - timedelta(days=1))
+            )
+            if comparison:
+                views[days]["comparison"] = comparison
+        return views
+
+    @staticmethod
+    def build_view(property_id: str, facts: Dict[str, Dict], start_date: str, end_date: str) -> Dict:
+        """start_date ~ end_date 기간의 팩트를 하나의 집계로 합침"""
+        days = sorted(d for d in facts if start_date <= d <= end_date)
+        period = (
+            datetime.strptime(end_date, "%Y-%m-%d") - datetime.strptime(start_date, "%Y-%m-%d")
+        ).days + 1
+
+        return {
+            "info": {
+                "property_id": property_id,
+                "date_range": {"start": start_date, "end": end_date, "days": period},
+                "days_stored": len(days),
+                "source": "daily_facts",
+                "approximate": APPROXIMATE_METRICS,
+            },
+            "summary": RollupService._rollup_summary([facts[d].get("summary", {}) for d in days]),
+            "pages": RollupService._rollup_pages([facts[d].get("pages", []) for d in days]),
+            "traffic_sources": RollupService._rollup_sources(
+                [facts[d].get("traffic_sources", []) for d in days]
+            ),
+            "daily_trend": [
+                {"date": d.replace("-", ""), **facts[d].get("summary", {})} for d in days
+            ],
+        }
+
+    @staticmethod
+    def build_comparison(facts: Dict[str, Dict], start_date: str, end_date: str) -> Optional[Dict]:
+        """
+        이전 기간 집계 (extract_data의 comparison 형식)
+
+        기간 중 하루라도 팩트가 없으면 증감이 왜곡되므로 None
+        """
+        days = sorted(d for d in facts if start_date <= d <= end_date)
+        period = (
+            datetime.strptime(end_date, "%Y-%m-%d") - datetime.strptime(start_date, "%Y-%m-%d")
+        ).days + 1
+        if len(days) < period:
+            return None
+
+        return {
+            "date_range": {"start": start_date, "end": end_date, "days": period},
+            "summary": RollupService._rollup_summary([facts[d].get("summary", {}) for d in days]),
+        }
+
+    @staticmethod
+    def _rollup_summary(summaries: List[Dict]) -> Dict:
+        """
+        합산 지표는 더하고 비율 지표는 세션 가중 평균
+
+        합산 지표는 일자별 요약에 있는 것만 포함, 사용자 수(APPROXIMATE_METRICS)는 합산 근사치
+        """
+        summed = [
+            metric for metric in ADDITIVE_METRICS + APPROXIMATE_METRICS
+            if any(metric in summary for summary in summaries)
+        ]
+        result = {metric: 0.0 for metric in summed}
+        weighted = {metric: 0.0 for metric in WEIGHTED_METRICS}
+        weights = {metric: 0.0 for metric in WEIGHTED_METRICS}
+
+        for summary in summaries:
+            for metric in summed:
+                result[metric] += summary.get(metric, 0)
+            for metric, weight_key in WEIGHTED_METRICS.items():
+                weight = summary.get(weight_key, 0)
+                weighted[metric] += summary.get(metric, 0) * weight
+                weights[metric] += weight
+
+        for metric in WEIGHTED_METRICS:
+            result[metric] = weighted[metric] / weights[metric] if weights[metric] else 0.0
+        return result
+
+    @staticmethod
+    def _rollup_pages(daily_pages: List[List[Dict]]) -> List[Dict]:
+        """
+        페이지별 합산 (extract_data의 pages 형식)
+
+        일자별로 상위 페이지만 저장하므로 하위 페이지 수치는 일부 누락될 수 있음
+        """
+        pages = {}
+        for rows in daily_pages:
+            for row in rows:
+                path = row.get("pagePath")
+                entry = pages.setdefault(path, {"pagePath": path, "metrics": {"pageViews": 0.0, "activeUsers": 0.0}})
+                entry["metrics"]["pageViews"] += row.get("screenPageViews", 0)
+                entry["metrics"]["activeUsers"] += row.get("activeUsers", 0)
+
+        result = sorted(pages.values(), key=lambda x: x["metrics"]["pageViews"], reverse=True)
+        return result[:LIMITS["pages"]]
+
+    @staticmethod
+    def _rollup_sources(daily_sources: List[List[Dict]]) -> List[Dict]:
+        """유입경로(source/medium)별 합산 (extract_data의 traffic_sources 형식)"""
+        sources = {}
+        for rows in daily_sources:
+            for row in rows:
+                key = (row.get("sessionSource"), row.get("sessionMedium"))
+                entry = sources.setdefault(key, {"sessionSource": key[0], "sessionMedium": key[1]})
+                for metric, value in row.items():
+                    if isinstance(value, (int, float)):
+                        entry[metric] = entry.get(metric, 0.0) + value
+
+        result = sorted(sources.values(), key=lambda x: x.get("activeUsers", 0), reverse=True)
+        return result[:LIMITS["sources"]]
@@ -5,7 +5,7 @@
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 from datetime import datetime
-from database.supabase_client import supabase
+from database.supabase_client import db, supabase
 from services.ga4_service import GA4Service
 from config.settings import get_config
 from utils.logger import scheduler_logger, error_logger
@@ -37,10 +37,21 @@ class SchedulerService:
             replace_existing=True
         )
 
+        # ga4_data 보존 정책 적용 작업 등록
+        retention_time = config.RETENTION_TIME.split(":")
+        self.scheduler.add_job(
+            self.compact_ga4_data,
+            CronTrigger(hour=int(retention_time[0]), minute=int(retention_time[1])),
+            id="ga4_data_retention",
+            name="GA4 Data Retention",
+            replace_existing=True
+        )
+
         # 스케줄러 시작
         self.scheduler.start()
         scheduler_logger.info(
-            f"Scheduler started - Daily sync at {config.DAILY_SYNC_TIME}"
+            f"Scheduler started - Daily sync at {config.DAILY_SYNC_TIME}, "
+            f"retention at {config.RETENTION_TIME}"
         )
 
     def stop(self):
@@ -52,6 +63,7 @@ class SchedulerService:
         """
         모든 활성 사용자의 GA4 데이터 증분 동기화
         - 이전 날짜 이후의 데이터만 추가
+        - 같은 Property(+인증)를 쓰는 사용자는 한 번만 추출
         - 실패 시 재시도 및 로깅
         """
         scheduler_logger.info("Starting daily GA4 sync job")
@@ -60,44 +72,49 @@ class SchedulerService:
         try:
             # 활성 GA4 계정이 있는 모든 사용자 조회
             result = supabase.table("ga4_accounts")\
-                .select("user_id, property_id")\
+                .select("user_id, property_id, credentials")\
                 .eq("is_active", True)\
                 .execute()
 
             users = result.data
-            scheduler_logger.info(f"Found {len(users)} users to sync")
+            groups = self._group_accounts(users)
+            scheduler_logger.info(
+                f"Found {len(users)} users to sync ({len(groups)} properties)"
+            )
 
             success_count = 0
             fail_count = 0
             total_days_added = 0
 
-            for user in users:
-                user_id = user["user_id"]
-                property_id = user["property_id"]
-
+            # 같은 Property(+인증)는 한 번만 추출하고 결과를 사용자 전원에게 반영
+            for (property_id, credentials), user_ids in groups.items():
                 try:
                     # 증분 동기화 실행
-                    sync_result = self.ga4_service.sync_incremental(user_id)
+                    sync_result = self.ga4_service.sync_property_incremental(
+                        property_id, credentials
+                    )
 
                     if sync_result.get("success"):
-                        success_count += 1
+                        success_count += len(user_ids)
                         days_added = sync_result.get("days_added", 0)
                         total_days_added += days_added
+                        if days_added:
+                            self.ga4_service.refresh_summaries(property_id, user_ids)
 
                         scheduler_logger.info(
-                            f"Synced user {user_id} (property: {property_id}): "
+                            f"Synced property {property_id} for users {user_ids}: "
                             f"+{days_added} days"
                         )
                     else:
-                        fail_count += 1
+                        fail_count += len(user_ids)
                         error_msg = sync_result.get("message", "Unknown error")
                         scheduler_logger.warning(
-                            f"Failed to sync user {user_id}: {error_msg}"
+                            f"Failed to sync property {property_id} (users {user_ids}): {error_msg}"
                         )
 
                 except Exception as e:
-                    fail_count += 1
-                    error_logger.error(f"Error syncing user {user_id}: {e}")
+                    fail_count += len(user_ids)
+                    error_logger.error(f"Error syncing property {property_id} (users {user_ids}): {e}")
 
             # 작업 완료 요약
             duration = (datetime.now() - start_time).total_seconds()
@@ -122,6 +139,95 @@ class SchedulerService:
             error_logger.error(f"Critical error in daily_ga4_sync: {e}")
             scheduler_logger.error(f"Daily sync failed: {e}")
 
+    def compact_ga4_data(self):
+        """
+        ga4_data 보존 정책 적용
+        - 사용자별 최신 스냅샷은 원본 유지 (get_latest_ga4_data가 읽는 행)
+        - GA4_RETENTION_FULL_DAYS 이내 행은 원본 유지
+        - GA4_RETENTION_WEEKLY_DAYS 이내 행은 주당 최신 1개만 요약본으로 남김
+          (원본으로 남는 행이 있는 주는 더 남기지 않음)
+        - 그보다 오래된 행은 삭제 (공간 회수는 Postgres autovacuum)
+        """
+        scheduler_logger.info("Starting GA4 data retention job")
+        start_time = datetime.now()
+
+        try:
+            rows = db.get_ga4_data_index()
+            compact_ids, delete_ids = self._retention_plan(rows, datetime.now().date())
+
+            compacted = sum(1 for data_id in compact_ids if db.compact_ga4_data(data_id))
+            deleted = db.delete_ga4_data(delete_ids)
+
+            duration = (datetime.now() - start_time).total_seconds()
+            scheduler_logger.info(
+                f"GA4 data retention completed: rows={len(rows)}, "
+                f"compacted={compacted}/{len(compact_ids)}, deleted={deleted}/{len(delete_ids)}, "
+                f"Duration={duration:.2f}s"
+            )
+
+        except Exception as e:
+            error_logger.error(f"Critical error in compact_ga4_data: {e}")
+            scheduler_logger.error(f"GA4 data retention failed: {e}")
+
+    def _retention_plan(self, rows, today):
+        """
+        보존 정책에 따라 요약할 행과 삭제할 행 결정
+
+        Args:
+            rows: get_ga4_data_index() 결과
+            today: 기준 날짜
+
+        Returns:
+            (요약할 id 리스트 - 아직 요약되지 않은 행만, 삭제할 id 리스트)
+        """
+        full_days = config.GA4_RETENTION_FULL_DAYS
+        weekly_days = config.GA4_RETENTION_WEEKLY_DAYS
+
+        # date가 없는 행 (scripts/save_ga4_to_supabase.py로 넣은 행)은 생성일 기준
+        by_user = {}
+        for row in rows:
+            row["day"] = (row.get("date") or row.get("created_at") or "")[:10]
+            if row["day"]:
+                by_user.setdefault(row["user_id"], []).append(row)
+
+        compact_ids, delete_ids = [], []
+        for user_rows in by_user.values():
+            # 최신순 (같은 날짜는 나중에 만든 행 우선)
+            user_rows.sort(key=lambda row: (row["day"], row["created_at"] or ""), reverse=True)
+            kept_weeks = set()
+
+            for index, row in enumerate(user_rows):
+                day = datetime.strptime(row["day"], "%Y-%m-%d").date()
+                age = (today - day).days
+                week = day.isocalendar()[:2]
+                # 원본으로 남는 행(최신 스냅샷, 보존 기간 이내)도 그 주의 1개로 셈
+                if index == 0 or age <= full_days:
+                    kept_weeks.add(week)
+                    continue
+
+                if age <= weekly_days and week not in kept_weeks:
+                    kept_weeks.add(week)
+                    if not row.get("compacted"):
+                        compact_ids.append(row["id"])
+                else:
+                    delete_ids.append(row["id"])
+
+        return compact_ids, delete_ids
+
+    def _group_accounts(self, accounts):
+        """
+        활성 GA4 계정을 (property_id, 인증 정보)별로 묶음
+
+        Returns:
+            {(property_id, credentials): [user_id, ...]}
+        """
+        groups = {}
+        for account in accounts:
+            credentials = account.get("credentials") or config.GA4_CREDENTIALS_PATH
+            key = (account["property_id"], credentials)
+            groups.setdefault(key, []).append(account["user_id"])
+        return groups
+
     def _send_telegram_notification(self, message: str):
         """텔레그램 알림 전송"""
         try:
@@ -0,0 +1,13 @@
+"""
+테스트 공통 설정
+
+services/* 모듈은 import 시점에 Supabase 클라이언트를 만들므로
+실제 접속 정보가 없으면 형식만 맞는 값으로 채움 (테스트는 DB를 호출하지 않음)
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("SUPABASE_URL", "https://test.supabase.co")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "test.test.test")
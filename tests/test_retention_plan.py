@@ -0,0 +1,81 @@
+"""SchedulerService._retention_plan 보존 정책 테스트"""
+from datetime import date, timedelta
+
+import pytest
+
+from services import scheduler_service
+from services.scheduler_service import SchedulerService
+
+TODAY = date(2026, 10, 15)  # 목요일
+
+
+@pytest.fixture
+def plan(monkeypatch):
+    monkeypatch.setattr(scheduler_service.config, "GA4_RETENTION_FULL_DAYS", 7)
+    monkeypatch.setattr(scheduler_service.config, "GA4_RETENTION_WEEKLY_DAYS", 90)
+    scheduler = SchedulerService.__new__(SchedulerService)  # 스케줄러/서비스 생성 생략
+    return lambda rows: scheduler._retention_plan(rows, TODAY)
+
+
+def row(data_id, days_ago, user_id=1, compacted=None, created_at=None):
+    day = str(TODAY - timedelta(days=days_ago))
+    return {
+        "id": data_id,
+        "user_id": user_id,
+        "date": day,
+        "created_at": created_at or f"{day}T00:00:00",
+        "compacted": compacted,
+    }
+
+
+def test_daily_rows_within_full_days_are_kept(plan):
+    rows = [row(1, 0), row(2, 1), row(3, 6), row(4, 7)]
+    assert plan(rows) == ([], [])
+
+
+def test_latest_snapshot_is_kept_even_if_expired(plan):
+    assert plan([row(1, 200)]) == ([], [])
+
+
+def test_weekly_rows_keep_newest_per_week(plan):
+    # 15일 전과 16일 전은 같은 ISO 주, 22일 전은 그 전 주
+    rows = [row(1, 0), row(2, 15), row(3, 16), row(4, 22)]
+    weeks = {r["id"]: date.fromisoformat(r["date"]).isocalendar()[:2] for r in rows}
+    assert weeks[2] == weeks[3] != weeks[4]
+
+    compact_ids, delete_ids = plan(rows)
+    assert compact_ids == [2, 4]
+    assert delete_ids == [3]
+
+
+def test_already_compacted_rows_are_not_compacted_again(plan):
+    rows = [row(1, 0), row(2, 15, compacted=True)]
+    assert plan(rows) == ([], [])
+
+
+def test_full_row_counts_toward_its_week(plan):
+    # 7일 전(원본 유지)과 8일 전(주간 구간)이 같은 주면 8일 전 행은 남기지 않음
+    rows = [row(1, 0), row(2, 7), row(3, 8)]
+    weeks = {r["id"]: date.fromisoformat(r["date"]).isocalendar()[:2] for r in rows}
+    assert weeks[2] == weeks[3]
+
+    assert plan(rows) == ([], [3])
+
+
+def test_expired_rows_are_deleted(plan):
+    rows = [row(1, 0), row(2, 91), row(3, 300, compacted=True)]
+    assert plan(rows) == ([], [2, 3])
+
+
+def test_users_are_planned_separately(plan):
+    # 사용자마다 최신 스냅샷과 주간 요약본을 따로 남김
+    rows = [row(1, 0, user_id=1), row(2, 15, user_id=1), row(3, 0, user_id=2), row(4, 15, user_id=2)]
+    compact_ids, delete_ids = plan(rows)
+    assert sorted(compact_ids) == [2, 4]
+    assert delete_ids == []
+
+
+def test_rows_without_date_use_created_at(plan):
+    undated = row(2, 100)
+    undated["date"] = None
+    assert plan([row(1, 0), undated]) == ([], [2])
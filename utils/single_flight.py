@@ -0,0 +1,109 @@
+"""
+키 단위 단일 실행 (single-flight)
+같은 키로 동시에 들어온 호출은 먼저 시작한 한 번의 실행 결과를 함께 사용합니다.
+"""
+import threading
+
+# SingleFlight.stream에서 리더가 마지막 항목 없이 끝났음을 나타내는 값
+_NO_RESULT = object()
+
+
+class _Call:
+    """진행 중인 실행 하나 (완료 이벤트 + 결과/예외)"""
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    키별 진행 중 실행 공유
+
+    결과는 캐시하지 않음 - 실행이 끝난 뒤 들어온 호출은 다시 실행
+
+    사용:
+        flight = SingleFlight()
+        result = flight.do(("ga4_sync", user_id), sync, user_id)
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func, *args, **kwargs):
+        """
+        key로 진행 중인 실행이 있으면 그 결과를 기다려 반환, 없으면 func 실행
+
+        func가 예외를 던지면 기다리던 호출에도 같은 예외를 던짐
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stream(self, key, func, *args, **kwargs):
+        """
+        제너레이터 func의 single-flight (제너레이터)
+
+        key로 진행 중인 실행이 없으면 func의 항목을 그대로 반환하고 마지막 항목을 공유,
+        있으면 그 실행이 끝날 때까지 기다렸다가 마지막 항목 하나만 반환
+        리더가 끝까지 순회되지 않고 닫히면 기다리던 호출은 다시 실행
+        """
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if leader:
+                    call = self._calls[key] = _Call()
+                    call.result = _NO_RESULT
+
+            if not leader:
+                call.done.wait()
+                if call.error is not None:
+                    raise call.error
+                if call.result is _NO_RESULT:
+                    continue
+                yield call.result
+                return
+
+            try:
+                last = _NO_RESULT
+                for item in func(*args, **kwargs):
+                    last = item
+                    yield item
+                call.result = last
+                return
+            except GeneratorExit:
+                raise
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+
+# GA4Service / ChatService가 함께 쓰는 전역 인스턴스
+single_flight = SingleFlight()